@@ -0,0 +1,82 @@
+# airbnb-clone-project/accounts/tasks.py
+"""Email delivery on the ``emails`` Celery queue.
+
+Views enqueue a template name, subject, recipient user ids and a JSON-safe
+context (see accounts.utils.send_email). The worker loads the users, renders
+one message each and sends them over a single connection from
+``get_connection()``. SMTP failures are retried with exponential backoff,
+resuming after the last delivered message so nobody gets a duplicate.
+"""
+
+import logging
+import smtplib
+
+from celery import shared_task
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.template.loader import render_to_string
+from django.utils.html import strip_tags
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+MAX_RETRIES = 5
+RETRY_BACKOFF = 30  # seconds, doubled on every retry
+RETRY_BACKOFF_MAX = 30 * 60
+
+
+def render_email(template_name, subject, user, context=None):
+    """Render an HTML template into a message with a plain-text fallback."""
+    html_message = render_to_string(
+        template_name,
+        {
+            "user": user,
+            "site_name": "Airbnb Clone",
+            "frontend_url": settings.FRONTEND_BASE_URL.rstrip("/"),
+            **(context or {}),
+        },
+    )
+    message = EmailMultiAlternatives(
+        subject=subject,
+        body=strip_tags(html_message),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[user.email],
+    )
+    message.attach_alternative(html_message, "text/html")
+    return message
+
+
+@shared_task(bind=True, max_retries=MAX_RETRIES)
+def send_templated_email(self, template_name, subject, user_ids, context=None):
+    """Render ``template_name`` for each user and send over one connection.
+
+    Users deleted since the email was queued are skipped. Returns the number
+    of messages sent by this attempt.
+    """
+    users = list(User.objects.filter(pk__in=user_ids).order_by("pk"))
+    sent = 0
+    try:
+        with get_connection() as connection:
+            for user in users:
+                connection.send_messages(
+                    [render_email(template_name, subject, user, context)]
+                )
+                sent += 1
+    except (smtplib.SMTPException, OSError) as exc:
+        remaining = [user.pk for user in users[sent:]]
+        countdown = min(RETRY_BACKOFF * 2**self.request.retries, RETRY_BACKOFF_MAX)
+        logger.warning(
+            "Sending %s failed for %d recipient(s); retrying in %ds: %s",
+            template_name,
+            len(remaining),
+            countdown,
+            exc,
+        )
+        raise self.retry(
+            exc=exc,
+            countdown=countdown,
+            args=(template_name, subject, remaining, context),
+        ) from exc
+    return sent
@@ -0,0 +1,110 @@
+import smtplib
+from unittest import mock
+
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from accounts.tasks import send_templated_email
+from tests.factories import UserFactory
+
+
+class FlakyBackend(EmailBackend):
+    """locmem backend whose second delivery fails once per test."""
+
+    calls = 0
+
+    def send_messages(self, messages):
+        FlakyBackend.calls += 1
+        if FlakyBackend.calls == 2:
+            raise smtplib.SMTPServerDisconnected("connection dropped")
+        return super().send_messages(messages)
+
+
+class EmailTaskTestCase(TestCase):
+    """Test the emails queue tasks with the locmem backend."""
+
+    def test_renders_one_message_per_user(self):
+        users = [UserFactory(first_name="Ama"), UserFactory(first_name="Kojo")]
+
+        sent = send_templated_email.apply(
+            args=(
+                "emails/welcome_email.html",
+                "Welcome to Airbnb Clone!",
+                [user.pk for user in users],
+            )
+        ).get()
+
+        self.assertEqual(sent, 2)
+        self.assertEqual([m.to for m in mail.outbox], [[u.email] for u in users])
+        self.assertIn("Ama", mail.outbox[0].body)
+        self.assertEqual(mail.outbox[0].alternatives[0][1], "text/html")
+
+    @override_settings(EMAIL_BACKEND="accounts.tests.test_email_tasks.FlakyBackend")
+    def test_retry_resumes_after_last_delivered_message(self):
+        FlakyBackend.calls = 0
+        users = [UserFactory() for _ in range(3)]
+
+        with mock.patch("accounts.tasks.RETRY_BACKOFF", 0):
+            result = send_templated_email.apply(
+                args=(
+                    "emails/welcome_email.html",
+                    "Welcome to Airbnb Clone!",
+                    [user.pk for user in users],
+                )
+            )
+
+        self.assertTrue(result.successful())
+        self.assertEqual(
+            sorted(m.to[0] for m in mail.outbox), sorted(u.email for u in users)
+        )
+
+    def test_registration_queues_verification_email_after_commit(self):
+        client = APIClient()
+        with mock.patch("accounts.utils.send_templated_email.delay") as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = client.post(
+                    reverse("accounts:register"),
+                    {
+                        "email": "queued@example.com",
+                        "password": "TestPass123",
+                        "password2": "TestPass123",
+                        "first_name": "Test",
+                        "last_name": "User",
+                        "phone_number": "0244123456",
+                        "user_type": "guest",
+                    },
+                    format="json",
+                )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(mail.outbox), 0)
+        template_name, subject, user_ids, context = delay.call_args.args
+        self.assertEqual(template_name, "emails/email_verification.html")
+        self.assertEqual(user_ids, [response.data["user"]["id"]])
+        self.assertIn("verification_url", context)
+
+    def test_registration_succeeds_when_the_broker_is_down(self):
+        client = APIClient()
+        with mock.patch(
+            "accounts.utils.send_templated_email.delay",
+            side_effect=OSError("broker unreachable"),
+        ):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = client.post(
+                    reverse("accounts:register"),
+                    {
+                        "email": "offline@example.com",
+                        "password": "TestPass123",
+                        "password2": "TestPass123",
+                        "first_name": "Test",
+                        "last_name": "User",
+                        "phone_number": "0244123457",
+                        "user_type": "guest",
+                    },
+                    format="json",
+                )
+
+        self.assertEqual(response.status_code, 201)
@@ -3,26 +3,27 @@
 from django.conf import settings
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
 from django.contrib.sites.shortcuts import get_current_site
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
+from django.db import transaction
 from django.urls import reverse
 from django.utils.encoding import force_bytes, smart_bytes
-from django.utils.html import strip_tags
 from django.utils.http import urlsafe_base64_encode
 
+from accounts.tasks import send_templated_email
 
-def send_email(subject, recipient_list, template_name, context):
-    """Send an email using the specified template."""
-    html_message = render_to_string(template_name, context)
-    plain_message = strip_tags(html_message)
 
-    send_mail(
-        subject=subject,
-        message=plain_message,
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        recipient_list=recipient_list,
-        html_message=html_message,
-        fail_silently=False,
+def send_email(subject, users, template_name, context=None):
+    """Queue a templated email to ``users`` on the emails worker.
+
+    The template is rendered in the worker with ``user`` set per recipient,
+    so ``context`` must be JSON serializable. Queued after commit so the
+    worker sees the users the request just created or changed.
+    """
+    user_ids = [user.pk for user in users]
+    # Robust: a broker outage is logged instead of failing the request that
+    # already committed its changes
+    transaction.on_commit(
+        lambda: send_templated_email.delay(template_name, subject, user_ids, context),
+        robust=True,
     )
 
 
@@ -42,26 +43,11 @@ def send_verification_email(request, user):
     # Construct the full verification URL
     verification_url = f"{frontend_url}/{verification_path}"
 
-    # Email subject and message
-    subject = "Verify your email address"
-
-    # Load and render the email template
-    html_message = render_to_string(
-        "emails/email_verification.html",
-        {
-            "user": user,
-            "verification_url": verification_url,
-            "site_name": "Airbnb Clone",
-        },
-    )
-
-    # Send the email
-    send_mail(
-        subject=subject,
-        message=strip_tags(html_message),  # Fallback text version
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        recipient_list=[user.email],
-        html_message=html_message,
+    send_email(
+        subject="Verify your email address",
+        users=[user],
+        template_name="emails/email_verification.html",
+        context={"verification_url": verification_url},
     )
 
 
@@ -73,19 +59,18 @@ def send_password_reset_email(request, user):
 
     current_site = get_current_site(request).domain
     relative_link = reverse(
-        "password-reset-confirm", kwargs={"uidb64": uidb64, "token": token}
+        "accounts:password-reset-confirm", kwargs={"uidb64": uidb64, "token": token}
     )
     abs_url = f"{settings.FRONTEND_BASE_URL.rstrip('/')}{relative_link}"
 
     context = {
-        "user": user,
         "reset_url": abs_url,
         "site_name": current_site,
     }
 
     send_email(
         subject="Password Reset Request",
-        recipient_list=[user.email],
+        users=[user],
         template_name="emails/password_reset_email.html",
         context=context,
     )
@@ -2,13 +2,9 @@
 
 import logging
 
-from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
 from django.utils.encoding import force_str
-from django.utils.html import strip_tags
 from django.utils.http import urlsafe_base64_decode
 from rest_framework import generics, status
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -24,7 +20,11 @@ from accounts.serializers import (
     UserProfileSerializer,
     UserRegistrationSerializer,
 )
-from accounts.utils import send_password_reset_email, send_verification_email
+from accounts.utils import (
+    send_email,
+    send_password_reset_email,
+    send_verification_email,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -108,24 +108,10 @@ def send_welcome_email(user):
     """
     Send a welcome email to the user after successful verification.
     """
-    subject = "Welcome to Airbnb Clone!"
-
-    # Load and render the email template
-    html_message = render_to_string(
-        "emails/welcome_email.html",
-        {
-            "user": user,
-            "site_name": "Airbnb Clone",
-        },
-    )
-
-    # Send the email
-    send_mail(
-        subject=subject,
-        message=strip_tags(html_message),  # Fallback text version
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        recipient_list=[user.email],
-        html_message=html_message,
+    send_email(
+        subject="Welcome to Airbnb Clone!",
+        users=[user],
+        template_name="emails/welcome_email.html",
     )
 
 
@@ -22,6 +22,7 @@ app.conf.task_routes = {
     "payments.tasks.*": {"queue": "payments"},
     "bookings.tasks.*": {"queue": "bookings"},
     "emails.tasks.*": {"queue": "emails"},
+    "accounts.tasks.*": {"queue": "emails"},
 }
 
 # Configure task time limits
@@ -49,6 +50,10 @@ app.conf.beat_schedule = {
         "task": "bookings.tasks.send_booking_reminders",
         "schedule": 86400.0,  # Run daily
     },
+    "purge-idempotency-records": {
+        "task": "common.tasks.purge_idempotency_records",
+        "schedule": 3600.0,  # Run every hour
+    },
 }
 
 # Add this to ensure the Celery app is properly configured
@@ -306,12 +306,14 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    # Page numbers by default; ?cursor= switches to keyset pagination
+    "DEFAULT_PAGINATION_CLASS": "common.pagination.HybridPagination",
     "PAGE_SIZE": 20,
     "DEFAULT_FILTER_BACKENDS": [
         "django_filters.rest_framework.DjangoFilterBackend",
-        "rest_framework.filters.SearchFilter",
-        "rest_framework.filters.OrderingFilter",
+        # PostgreSQL full-text search; falls back to SearchFilter on SQLite
+        "common.filters.FullTextSearchFilter",
+        "common.filters.OrderingFilter",
     ],
     "DEFAULT_RENDERER_CLASSES": [
         "rest_framework.renderers.JSONRenderer",
@@ -333,6 +335,48 @@ REST_FRAMEWORK = {
     },
 }
 
+# common.pagination.EstimatedCountPagination: unfiltered lists over tables
+# larger than this report the planner's row estimate instead of COUNT(*)
+PAGINATION_ESTIMATE_THRESHOLD = int(
+    os.environ.get("PAGINATION_ESTIMATE_THRESHOLD", 100_000)
+)
+# Seconds an exact count of a filtered list is reused for
+PAGINATION_COUNT_CACHE_TIMEOUT = int(
+    os.environ.get("PAGINATION_COUNT_CACHE_TIMEOUT", 30)
+)
+
+# properties.search_index: serve plain property list pages from an in-memory
+# columnar copy of the filter/sort columns, refreshed from a Redis change log.
+# Every worker process holds its own copy of the whole table's columns.
+PROPERTY_INDEX_ENABLED = env.bool("PROPERTY_INDEX_ENABLED", default=False)
+
+# bookings.locks: waits for a property's booking lock longer than this many
+# seconds are logged as warnings
+BOOKING_LOCK_SLOW_WAIT = float(os.environ.get("BOOKING_LOCK_SLOW_WAIT", 0.5))
+# bookings.holds: seconds a guest's checkout hold keeps the dates
+BOOKING_HOLD_TTL = int(os.environ.get("BOOKING_HOLD_TTL", 10 * 60))
+
+# common.idempotency: seconds a response is replayed for its Idempotency-Key,
+# how long a duplicate waits for the first request, and how long a crashed
+# request can keep its key locked
+IDEMPOTENCY_KEY_TTL = int(os.environ.get("IDEMPOTENCY_KEY_TTL", 24 * 60 * 60))
+IDEMPOTENCY_WAIT = float(os.environ.get("IDEMPOTENCY_WAIT", 10))
+IDEMPOTENCY_LOCK_TIMEOUT = int(os.environ.get("IDEMPOTENCY_LOCK_TIMEOUT", 60))
+
+# payments.gateway: dotted path of the client charging payments, and its
+# keyword arguments. FakeGateway simulates a provider in-process and is only
+# the default under DEBUG: elsewhere payments stay pending until a gateway is
+# configured. Set payments.http_gateway.HTTPGateway and the PAYMENT_GATEWAY_*
+# below to charge a real one over a pooled HTTP session.
+PAYMENT_GATEWAY = os.environ.get(
+    "PAYMENT_GATEWAY", "payments.gateway.FakeGateway" if DEBUG else ""
+)
+PAYMENT_GATEWAY_OPTIONS = {}
+PAYMENT_GATEWAY_URL = os.environ.get("PAYMENT_GATEWAY_URL", "")
+PAYMENT_GATEWAY_API_KEY = os.environ.get("PAYMENT_GATEWAY_API_KEY", "")
+PAYMENT_GATEWAY_TIMEOUT = float(os.environ.get("PAYMENT_GATEWAY_TIMEOUT", 10))
+PAYMENT_GATEWAY_POOL_SIZE = int(os.environ.get("PAYMENT_GATEWAY_POOL_SIZE", 10))
+
 # Enable Browsable API in development
 if DEBUG:
     REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] += [
@@ -373,8 +417,12 @@ def get_cache_config():
                         "CLIENT_CLASS": "django_redis.client.DefaultClient",
                         "SOCKET_CONNECT_TIMEOUT": 5,
                         "SOCKET_TIMEOUT": 5,
+                        # Threads wait up to "timeout" seconds for a free connection
+                        # instead of failing with MaxConnectionsError under bursts
+                        "CONNECTION_POOL_CLASS": "redis.BlockingConnectionPool",
                         "CONNECTION_POOL_KWARGS": {
                             "max_connections": 20,
+                            "timeout": 5,
                             "retry_on_timeout": True,
                         },
                     },
@@ -399,8 +447,12 @@ def get_cache_config():
                     "CLIENT_CLASS": "django_redis.client.DefaultClient",
                     "SOCKET_CONNECT_TIMEOUT": 5,
                     "SOCKET_TIMEOUT": 5,
+                    # Threads wait up to "timeout" seconds for a free connection
+                    # instead of failing with MaxConnectionsError under bursts
+                    "CONNECTION_POOL_CLASS": "redis.BlockingConnectionPool",
                     "CONNECTION_POOL_KWARGS": {
                         "max_connections": 20,
+                        "timeout": 5,
                         "retry_on_timeout": True,
                     },
                 },
@@ -87,6 +87,7 @@ urlpatterns = [
                 path("", include("bookings.urls")),
                 path("", include("payments.urls")),
                 path("", include("reviews.urls")),
+                path("", include("common.urls")),
             ]
         ),
     ),
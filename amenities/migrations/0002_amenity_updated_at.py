@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 04:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("amenities", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="amenity",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+    ]
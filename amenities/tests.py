@@ -4,7 +4,8 @@
 import pytest
 from rest_framework.test import APIClient
 
-from tests.factories import UserFactory
+from amenities.models import Amenity
+from tests.factories import AmenityFactory, UserFactory
 
 
 @pytest.mark.django_db
@@ -32,3 +33,24 @@ def test_create_and_list_amenities():
         else resp.data
     )
     assert any(a["id"] == amenity_id for a in data)
+
+
+@pytest.mark.django_db
+def test_amenity_list_conditional_get():
+    user = UserFactory(user_type="host")
+    client = APIClient()
+    client.force_authenticate(user)
+    wifi, _ = AmenityFactory(name="WiFi"), AmenityFactory(name="Pool")
+
+    etag = client.get("/api/v1/amenities/")["ETag"]
+    assert client.get("/api/v1/amenities/", HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    wifi.description = "Fibre"
+    wifi.save()
+    resp = client.get("/api/v1/amenities/", HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == 200 and resp["ETag"] != etag
+
+    # Deleting an older row leaves Max(updated_at) alone; the count changes
+    etag = resp["ETag"]
+    Amenity.objects.filter(name="Pool").delete()
+    assert client.get("/api/v1/amenities/", HTTP_IF_NONE_MATCH=etag).status_code == 200
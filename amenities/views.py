@@ -1,12 +1,14 @@
 # airbnb-clone-project/amenities/views.py
 
+from django.db.models import Count, Max
 from rest_framework import permissions, viewsets
 
 from amenities.models import Amenity
 from amenities.serializers import AmenitySerializer
+from common.cache import ConditionalGetMixin
 
 
-class AmenityViewSet(viewsets.ModelViewSet):
+class AmenityViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """CRUD for amenities."""
 
     queryset = Amenity.objects.all()
@@ -17,3 +19,11 @@ class AmenityViewSet(viewsets.ModelViewSet):
     search_fields = ["name", "description"]
     ordering_fields = ["name", "created_at"]
     ordering = ["name"]
+    conditional_actions = ("list",)
+
+    def get_conditional_validators(self, request):
+        """Newest ``updated_at`` plus the row count, which catches deletes."""
+        stats = Amenity.objects.aggregate(
+            last_modified=Max("updated_at"), count=Count("pk")
+        )
+        return (stats["count"], stats["last_modified"]), stats["last_modified"]
@@ -2,7 +2,7 @@
 
 from django.contrib import admin
 
-from bookings.models import Booking
+from bookings.models import Booking, PricingRule
 
 
 @admin.register(Booking)
@@ -18,3 +18,11 @@ class BookingAdmin(admin.ModelAdmin):
     list_filter = ("status", "check_in_date")
     search_fields = ("property__title", "guest__email")
     ordering = ("-check_in_date",)
+
+
+@admin.register(PricingRule)
+class PricingRuleAdmin(admin.ModelAdmin):
+    list_display = ("property", "kind", "multiplier", "start_date", "end_date")
+    list_filter = ("kind",)
+    search_fields = ("property__title",)
+    ordering = ("property", "kind", "start_date")
@@ -0,0 +1,213 @@
+# airbnb-clone-project/bookings/holds.py
+"""Short-lived holds on a property's dates while a guest checks out.
+
+A hold lives in Redis only, so the contention of many guests eyeing the
+same dates never reaches the database, and abandoned checkouts simply
+expire after ``BOOKING_HOLD_TTL`` seconds instead of leaving ``pending``
+bookings behind for the cleanup task.
+
+Each property has a sorted set of its holds scored by expiry time, and
+every hold is also kept under its own key (for lookups by id) and in one
+global sorted set (for availability searches over all properties). Placing
+a hold prunes the expired ones and checks the rest for overlap in one Lua
+script, so two guests can never hold intersecting stays. Stays are
+half-open ``[check_in, check_out)`` ranges, stored as date ordinals.
+
+Holds don't see bookings, and bookings only honour holds when they are
+created: the hold endpoint checks existing bookings first, and converting
+a hold into a booking is still validated by the database.
+"""
+
+import datetime
+import uuid
+from typing import NamedTuple
+
+from django.conf import settings
+from django_redis import get_redis_connection
+
+HOLD_KEY = "booking-hold:{hold_id}"
+PROPERTY_HOLDS_KEY = "booking-holds:{property_id}"
+ALL_HOLDS_KEY = "booking-holds"
+
+# Members are "hold_id|check_in|check_out|guest_id" in the property's set;
+# the hold key and the global set prefix them with "property_id|"
+_PRUNE = """
+local now = redis.call('TIME')
+local now_ms = now[1] * 1000 + math.floor(now[2] / 1000)
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now_ms)
+redis.call('ZREMRANGEBYSCORE', KEYS[3], '-inf', now_ms)
+"""
+
+
+def _pruned(body):
+    return _PRUNE + body
+
+
+_PLACE = _pruned("""
+local check_in, check_out = tonumber(ARGV[2]), tonumber(ARGV[3])
+for _, member in ipairs(redis.call('ZRANGE', KEYS[1], 0, -1)) do
+  local held_in, held_out = string.match(member, '^[^|]+|(%d+)|(%d+)|')
+  if tonumber(held_in) < check_out and tonumber(held_out) > check_in then
+    return false
+  end
+end
+local ttl = tonumber(ARGV[6])
+local expires = now_ms + ttl
+local member = table.concat({ARGV[1], ARGV[2], ARGV[3], ARGV[4]}, '|')
+redis.call('ZADD', KEYS[1], expires, member)
+redis.call('ZADD', KEYS[3], expires, ARGV[5] .. '|' .. member)
+redis.call('SET', KEYS[2], ARGV[5] .. '|' .. member, 'PX', ttl)
+-- Sets of properties nobody is checking out expire with their last hold
+if redis.call('PTTL', KEYS[1]) < ttl then
+  redis.call('PEXPIRE', KEYS[1], ttl)
+end
+return expires
+""")
+# Compare-and-delete, so a hold that expired and was replaced stays put
+_RELEASE = """
+if redis.call('GET', KEYS[2]) ~= ARGV[1] then
+  return 0
+end
+redis.call('DEL', KEYS[2])
+redis.call('ZREM', KEYS[1], string.match(ARGV[1], '^[^|]+|(.*)$'))
+redis.call('ZREM', KEYS[3], ARGV[1])
+return 1
+"""
+
+
+class Hold(NamedTuple):
+    id: str
+    property_id: int
+    guest_id: int
+    check_in: datetime.date
+    check_out: datetime.date
+    expires_at: datetime.datetime
+
+    def overlaps(self, check_in, check_out):
+        return self.check_in < check_out and self.check_out > check_in
+
+    @property
+    def value(self):
+        """The hold's entry in Redis."""
+        return "|".join(
+            str(part)
+            for part in (
+                self.property_id,
+                self.id,
+                self.check_in.toordinal(),
+                self.check_out.toordinal(),
+                self.guest_id,
+            )
+        )
+
+    @classmethod
+    def parse(cls, value, expires_ms):
+        property_id, hold_id, check_in, check_out, guest_id = value.split("|")
+        return cls(
+            hold_id,
+            int(property_id),
+            int(guest_id),
+            datetime.date.fromordinal(int(check_in)),
+            datetime.date.fromordinal(int(check_out)),
+            datetime.datetime.fromtimestamp(
+                int(expires_ms) / 1000, tz=datetime.timezone.utc
+            ),
+        )
+
+
+def _redis():
+    return get_redis_connection("default")
+
+
+def _keys(property_id, hold_id=""):
+    return [
+        PROPERTY_HOLDS_KEY.format(property_id=property_id),
+        HOLD_KEY.format(hold_id=hold_id),
+        ALL_HOLDS_KEY,
+    ]
+
+
+def _now_ms(client):
+    seconds, microseconds = client.time()
+    return seconds * 1000 + microseconds // 1000
+
+
+def place_hold(property_id, guest_id, check_in, check_out):
+    """Hold ``[check_in, check_out)`` of a property for a guest.
+
+    Returns the ``Hold``, or None if another hold overlaps the stay.
+    """
+    hold_id = uuid.uuid4().hex
+    client = _redis()
+    expires_ms = client.register_script(_PLACE)(
+        keys=_keys(property_id, hold_id),
+        args=[
+            hold_id,
+            check_in.toordinal(),
+            check_out.toordinal(),
+            guest_id,
+            property_id,
+            settings.BOOKING_HOLD_TTL * 1000,
+        ],
+    )
+    if expires_ms is None:
+        return None
+    return Hold.parse(
+        f"{property_id}|{hold_id}|{check_in.toordinal()}|{check_out.toordinal()}|"
+        f"{guest_id}",
+        expires_ms,
+    )
+
+
+def get_hold(hold_id):
+    """The unexpired hold with this id, or None."""
+    client = _redis()
+    with client.pipeline(transaction=False) as pipe:
+        pipe.get(HOLD_KEY.format(hold_id=hold_id))
+        pipe.pttl(HOLD_KEY.format(hold_id=hold_id))
+        value, ttl = pipe.execute()
+    if value is None or ttl < 0:
+        return None
+    return Hold.parse(value.decode(), _now_ms(client) + ttl)
+
+
+def release_hold(hold):
+    """Drop a hold; False if it had already expired or been released."""
+    return bool(
+        _redis().register_script(_RELEASE)(
+            keys=_keys(hold.property_id, hold.id), args=[hold.value]
+        )
+    )
+
+
+def get_holds(property_id, start, end, exclude_guest=None):
+    """Unexpired holds of a property intersecting ``[start, end)``."""
+    client = _redis()
+    members = client.zrangebyscore(
+        PROPERTY_HOLDS_KEY.format(property_id=property_id),
+        f"({_now_ms(client)}",
+        "+inf",
+        withscores=True,
+    )
+    holds = [
+        Hold.parse(f"{property_id}|{member.decode()}", expires_ms)
+        for member, expires_ms in members
+    ]
+    return [
+        hold
+        for hold in holds
+        if hold.overlaps(start, end) and hold.guest_id != exclude_guest
+    ]
+
+
+def get_held_property_ids(check_in, check_out):
+    """Properties with an unexpired hold intersecting ``[check_in, check_out)``."""
+    client = _redis()
+    members = client.zrangebyscore(
+        ALL_HOLDS_KEY, f"({_now_ms(client)}", "+inf", withscores=True
+    )
+    return {
+        hold.property_id
+        for hold in (Hold.parse(value.decode(), score) for value, score in members)
+        if hold.overlaps(check_in, check_out)
+    }
@@ -0,0 +1,52 @@
+# airbnb-clone-project/bookings/locks.py
+"""Serialize booking writes per property.
+
+Creating, changing or cancelling a booking reads the property's other
+bookings (the overlap check, pricing) and then writes. ``lock_properties``
+makes that read-then-write run one request at a time per property: it takes
+a ``FOR NO KEY UPDATE`` row lock on the ``Property`` rows, held until the
+surrounding transaction ends. Bookings of other properties proceed in
+parallel, and the lock does not conflict with the key-share locks that
+inserting a booking takes on its property.
+
+SQLite ignores ``select_for_update``; it serializes all writes anyway.
+"""
+
+import logging
+import time
+
+from django.conf import settings
+
+from common.cache import record_lock_wait
+from properties.models import Property
+
+LOCK_NAME = "booking-property"
+
+logger = logging.getLogger(__name__)
+
+
+def lock_properties(*property_ids):
+    """Lock the given properties for the rest of the current transaction.
+
+    Rows are locked in primary key order, so writers locking several
+    properties cannot deadlock. Returns the seconds spent waiting.
+    """
+    property_ids = sorted(set(property_ids))
+    if not property_ids:
+        return 0.0
+    start = time.perf_counter()
+    list(
+        Property.objects.select_for_update(no_key=True)
+        .filter(pk__in=property_ids)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    waited = time.perf_counter() - start
+
+    slow = waited > settings.BOOKING_LOCK_SLOW_WAIT
+    if slow:
+        logger.warning(
+            "Waited %.3fs for the booking lock of properties %s", waited, property_ids
+        )
+    record_lock_wait(LOCK_NAME, waited, slow)
+    return waited
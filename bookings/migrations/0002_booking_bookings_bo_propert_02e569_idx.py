@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-18 03:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0001_initial"),
+        ("properties", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                fields=["property", "status", "check_in_date", "check_out_date"],
+                name="bookings_bo_propert_02e569_idx",
+            ),
+        ),
+    ]
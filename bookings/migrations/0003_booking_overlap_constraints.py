@@ -0,0 +1,42 @@
+# Generated by Django 5.2.6 on 2026-10-18 03:17
+
+from django.conf import settings
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations, models
+
+from common.operations import RunPostgresSQL
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0002_booking_bookings_bo_propert_02e569_idx"),
+        ("properties", "0002_search_vector"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="booking",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("check_out_date__gt", models.F("check_in_date"))),
+                name="bookings_booking_check_out_after_check_in",
+            ),
+        ),
+        # btree_gist lets the GiST index compare property_id with =
+        BtreeGistExtension(),
+        RunPostgresSQL(
+            sql=(
+                "ALTER TABLE bookings_booking "
+                "ADD CONSTRAINT bookings_booking_no_overlap "
+                "EXCLUDE USING gist ("
+                "property_id WITH =, "
+                "daterange(check_in_date, check_out_date, '[)') WITH &&"
+                ") WHERE (status IN ('pending', 'confirmed'));"
+            ),
+            reverse_sql=(
+                "ALTER TABLE bookings_booking "
+                "DROP CONSTRAINT IF EXISTS bookings_booking_no_overlap;"
+            ),
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.2.6 on 2026-10-18 03:25
+
+from decimal import Decimal
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0003_booking_overlap_constraints"),
+        ("properties", "0002_search_vector"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PricingRule",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("weekend", "Weekend"), ("seasonal", "Seasonal")],
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "multiplier",
+                    models.DecimalField(
+                        decimal_places=3,
+                        help_text="e.g. 1.200 for +20%, 0.900 for -10%",
+                        max_digits=5,
+                        validators=[
+                            django.core.validators.MinValueValidator(Decimal("0.01"))
+                        ],
+                    ),
+                ),
+                ("start_date", models.DateField(blank=True, null=True)),
+                ("end_date", models.DateField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "property",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="pricing_rules",
+                        to="properties.property",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["property", "kind", "start_date"],
+                "constraints": [
+                    models.CheckConstraint(
+                        condition=models.Q(
+                            ("kind", "weekend"),
+                            models.Q(
+                                ("end_date__gte", models.F("start_date")),
+                                ("end_date__isnull", False),
+                                ("start_date__isnull", False),
+                            ),
+                            _connector="OR",
+                        ),
+                        name="bookings_pricingrule_season_dates",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0005_booking_reminders_and_expiry"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                fields=["guest", "-created_at", "-id"],
+                name="bookings_guest_created_idx",
+            ),
+        ),
+    ]
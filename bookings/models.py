@@ -1,7 +1,34 @@
 # airbnb-clone-project/bookings/models.py
 
+from decimal import Decimal
+
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.core.validators import MinValueValidator
+from django.db import connections, models, router
+
+
+class BookingQuerySet(models.QuerySet):
+    """Reusable filters for booking lookups."""
+
+    def active(self):
+        """Bookings that still hold their dates (pending or confirmed)."""
+        return self.filter(status__in=Booking.ACTIVE_STATUSES)
+
+    def overlapping(self, check_in, check_out):
+        """Bookings whose stay intersects the half-open range [check_in, check_out)."""
+        return self.filter(check_in_date__lt=check_out, check_out_date__gt=check_in)
+
+    def for_guest(self, user):
+        """The trips ``user`` booked."""
+        return self.filter(guest=user)
+
+    def for_host(self, user):
+        """Reservations of the properties ``user`` hosts."""
+        return self.filter(property__host=user)
+
+    def visible_to(self, user):
+        """Bookings ``user`` made or hosts."""
+        return self.filter(models.Q(guest=user) | models.Q(property__host=user))
 
 
 class Booking(models.Model):
@@ -12,6 +39,14 @@ class Booking(models.Model):
         ("confirmed", "Confirmed"),
         ("cancelled", "Cancelled"),
     )
+    ACTIVE_STATUSES = ("pending", "confirmed")
+
+    # Enforced in PostgreSQL by an EXCLUDE USING gist constraint (see migration
+    # 0003); on other databases clean() performs the equivalent check.
+    OVERLAP_CONSTRAINT = "bookings_booking_no_overlap"
+    OVERLAP_MESSAGE = "This property is already booked for the selected dates."
+    DATE_ORDER_CONSTRAINT = "bookings_booking_check_out_after_check_in"
+    DATE_ORDER_MESSAGE = "Check-out date must be after check-in date."
 
     property = models.ForeignKey(
         "properties.Property", on_delete=models.CASCADE, related_name="bookings"
@@ -24,34 +59,120 @@ class Booking(models.Model):
     total_price = models.DecimalField(max_digits=10, decimal_places=2)
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
     created_at = models.DateTimeField(auto_now_add=True)
+    # Set by bookings.tasks.send_booking_reminders so reruns don't resend
+    reminder_sent_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = BookingQuerySet.as_manager()
 
     class Meta:
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["check_in_date", "check_out_date"]),
+            # A guest's trips, newest first (id is the pagination tiebreaker);
+            # also joins a guest's payments without reading bookings rows
+            models.Index(
+                fields=["guest", "-created_at", "-id"],
+                name="bookings_guest_created_idx",
+            ),
+            # Backs the availability anti-join on the property list endpoint,
+            # and a host's reservations per property
+            models.Index(
+                fields=["property", "status", "check_in_date", "check_out_date"]
+            ),
+            # Lets bookings.tasks.cleanup_expired_bookings find stale holds
+            models.Index(
+                fields=["created_at"],
+                condition=models.Q(status="pending"),
+                name="bookings_pending_created_idx",
+            ),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(check_out_date__gt=models.F("check_in_date")),
+                name="bookings_booking_check_out_after_check_in",
+            ),
         ]
 
     def clean(self):
         if self.check_in_date >= self.check_out_date:
-            raise ValidationError("Check-out date must be after check-in date.")
+            raise ValidationError(self.DATE_ORDER_MESSAGE)
         # Overlap detection for the same property (exclude self on update)
-        qs = Booking.objects.filter(
-            property=self.property, status__in=["pending", "confirmed"]
-        )  # active bookings
+        qs = Booking.objects.filter(property=self.property).active()
         if self.pk:
             qs = qs.exclude(pk=self.pk)
-        overlap = qs.filter(
-            check_in_date__lt=self.check_out_date,
-            check_out_date__gt=self.check_in_date,
-        ).exists()
+        overlap = qs.overlapping(self.check_in_date, self.check_out_date).exists()
         if overlap:
-            raise ValidationError(
-                "This property is already booked for the selected dates."
-            )
+            raise ValidationError(self.OVERLAP_MESSAGE)
 
     def save(self, *args, **kwargs):
-        self.full_clean()
+        # PostgreSQL enforces both rules atomically through constraints, which
+        # also closes the check-then-insert race. SQLite has no exclusion
+        # constraints, so validate in Python there; clean() already reports
+        # the date-order CheckConstraint with a friendlier message.
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+        if connections[using].vendor != "postgresql":
+            self.full_clean(validate_constraints=False)
         return super().save(*args, **kwargs)
 
     def __str__(self) -> str:
         return f"Booking #{self.id} - {self.property} by {self.guest}"
+
+
+class PricingRule(models.Model):
+    """Multiplier applied to the nightly rate of matching nights of a property.
+
+    Weekend rules match Friday and Saturday nights; seasonal rules match the
+    nights from ``start_date`` through ``end_date`` inclusive. When several
+    rules match a night their multipliers stack. See bookings.pricing.
+    """
+
+    KIND_CHOICES = (
+        ("weekend", "Weekend"),
+        ("seasonal", "Seasonal"),
+    )
+
+    property = models.ForeignKey(
+        "properties.Property", on_delete=models.CASCADE, related_name="pricing_rules"
+    )
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    multiplier = models.DecimalField(
+        max_digits=5,
+        decimal_places=3,
+        validators=[MinValueValidator(Decimal("0.01"))],
+        help_text="e.g. 1.200 for +20%, 0.900 for -10%",
+    )
+    start_date = models.DateField(null=True, blank=True)
+    end_date = models.DateField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["property", "kind", "start_date"]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(kind="weekend")
+                | models.Q(
+                    start_date__isnull=False,
+                    end_date__isnull=False,
+                    end_date__gte=models.F("start_date"),
+                ),
+                name="bookings_pricingrule_season_dates",
+            ),
+        ]
+
+    def clean(self):
+        if self.kind == "seasonal" and (
+            self.start_date is None
+            or self.end_date is None
+            or self.end_date < self.start_date
+        ):
+            raise ValidationError(
+                "Seasonal rules need a start date on or before their end date."
+            )
+
+    def __str__(self) -> str:
+        if self.kind == "seasonal":
+            return (
+                f"{self.property} x{self.multiplier} "
+                f"({self.start_date} to {self.end_date})"
+            )
+        return f"{self.property} x{self.multiplier} (weekends)"
@@ -1,13 +1,44 @@
 # airbnb-clone-project/bookings/serializers.py
 
+from django.core.exceptions import NON_FIELD_ERRORS
 from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
 
+from bookings.holds import get_holds
 from bookings.models import Booking
+from bookings.pricing import quote_stay
+from common.serializers import FieldsetMixin, ValuesSerializer
+from properties.models import Property
+from properties.serializers import PropertySummarySerializer
+from users.serializers import UserSummarySerializer
 
+# Database constraints that back Booking.clean() on PostgreSQL
+CONSTRAINT_MESSAGES = {
+    Booking.OVERLAP_CONSTRAINT: Booking.OVERLAP_MESSAGE,
+    Booking.DATE_ORDER_CONSTRAINT: Booking.DATE_ORDER_MESSAGE,
+}
 
-class BookingSerializer(serializers.ModelSerializer):
-    """Serialize Booking fields with validation."""
+
+def constraint_violation_detail(error):
+    """Translate a known constraint violation into the model-validation error shape."""
+    diag = getattr(error.__cause__, "diag", None)
+    message = CONSTRAINT_MESSAGES.get(getattr(diag, "constraint_name", None))
+    if message is None:
+        return None
+    return {NON_FIELD_ERRORS: [message]}
+
+
+class BookingSerializer(FieldsetMixin, serializers.ModelSerializer):
+    """Serialize Booking fields with validation.
+
+    Supports ``?fields=`` and ``?include=property,guest`` (see FieldsetMixin).
+    """
+
+    expandable_fields = {
+        "property": PropertySummarySerializer,
+        "guest": UserSummarySerializer,
+    }
 
     class Meta:
         model = Booking
@@ -21,24 +52,142 @@ class BookingSerializer(serializers.ModelSerializer):
             "status",
             "created_at",
         ]
-        read_only_fields = ["id", "created_at", "guest"]
+        # total_price is computed by bookings.pricing, never taken from clients
+        read_only_fields = ["id", "created_at", "guest", "total_price"]
+
+    PRICED_FIELDS = ("property", "check_in_date", "check_out_date")
+    STATUS_MESSAGE = (
+        "Bookings are confirmed by their payment; they can only be cancelled."
+    )
+
+    def validate_status(self, status):
+        """New bookings start pending until payments.tasks confirms them; the
+        only change clients may make is cancelling."""
+        if self.instance is None:
+            return "pending"
+        if status != self.instance.status and status != "cancelled":
+            raise serializers.ValidationError(self.STATUS_MESSAGE)
+        return status
+
+    def validate(self, attrs):
+        """Price the stay when it is created or its property or dates change,
+        unless another guest holds those dates (see bookings.holds)."""
+        stay = {
+            field: attrs.get(field, getattr(self.instance, field, None))
+            for field in self.PRICED_FIELDS
+        }
+        if self.instance is not None and all(
+            stay[field] == getattr(self.instance, field) for field in self.PRICED_FIELDS
+        ):
+            return attrs
+        request = self.context.get("request")
+        if self.instance is not None:
+            guest_id = self.instance.guest_id
+        else:
+            guest_id = request.user.id if request is not None else None
+        if get_holds(
+            stay["property"].pk,
+            stay["check_in_date"],
+            stay["check_out_date"],
+            exclude_guest=guest_id,
+        ):
+            raise serializers.ValidationError(
+                {NON_FIELD_ERRORS: [BookingHoldSerializer.HELD_MESSAGE]}
+            )
+        attrs["total_price"] = quote_stay(
+            stay["property"].pk, stay["check_in_date"], stay["check_out_date"]
+        )
+        return attrs
 
     def create(self, validated_data):
         """Create a booking and surface model validation errors as 400 responses."""
         try:
-            return super().create(validated_data)
+            # Savepoint so a constraint violation leaves the transaction usable
+            with transaction.atomic():
+                return super().create(validated_data)
         except DjangoValidationError as e:
             detail = getattr(e, "message_dict", None) or {
                 "non_field_errors": e.messages
             }
             raise serializers.ValidationError(detail)
+        except IntegrityError as e:
+            detail = constraint_violation_detail(e)
+            if detail is None:
+                raise
+            raise serializers.ValidationError(detail) from e
 
     def update(self, instance, validated_data):
         """Update a booking and surface model validation errors as 400 responses."""
         try:
-            return super().update(instance, validated_data)
+            # Savepoint so a constraint violation leaves the transaction usable
+            with transaction.atomic():
+                return super().update(instance, validated_data)
         except DjangoValidationError as e:
             detail = getattr(e, "message_dict", None) or {
                 "non_field_errors": e.messages
             }
             raise serializers.ValidationError(detail)
+        except IntegrityError as e:
+            detail = constraint_violation_detail(e)
+            if detail is None:
+                raise
+            raise serializers.ValidationError(detail) from e
+
+
+class BookingHoldSerializer(serializers.Serializer):
+    """A checkout hold on a property's dates (see bookings.holds)."""
+
+    HELD_MESSAGE = "These dates are being held by another guest."
+
+    id = serializers.CharField(read_only=True)
+    property = serializers.PrimaryKeyRelatedField(queryset=Property.objects.all())
+    check_in_date = serializers.DateField()
+    check_out_date = serializers.DateField()
+    expires_at = serializers.DateTimeField(read_only=True)
+
+    def validate(self, attrs):
+        if attrs["check_in_date"] >= attrs["check_out_date"]:
+            raise serializers.ValidationError(
+                {NON_FIELD_ERRORS: [Booking.DATE_ORDER_MESSAGE]}
+            )
+        return attrs
+
+    def to_representation(self, hold):
+        return {
+            "id": hold.id,
+            "property": hold.property_id,
+            "check_in_date": hold.check_in.isoformat(),
+            "check_out_date": hold.check_out.isoformat(),
+            "expires_at": self.fields["expires_at"].to_representation(hold.expires_at),
+        }
+
+
+class BookingValuesSerializer(ValuesSerializer):
+    """``BookingSerializer`` output for list pages, built from ``values()`` rows."""
+
+    serializer_class = BookingSerializer
+
+
+class QuoteRequestSerializer(serializers.Serializer):
+    """Validate a bulk quote: many properties, one date range."""
+
+    MAX_PROPERTIES = 100
+    MAX_NIGHTS = 366
+
+    property_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=MAX_PROPERTIES,
+    )
+    check_in = serializers.DateField()
+    check_out = serializers.DateField()
+
+    def validate(self, attrs):
+        nights = (attrs["check_out"] - attrs["check_in"]).days
+        if nights <= 0:
+            raise serializers.ValidationError({"check_out": "Must be after check_in."})
+        if nights > self.MAX_NIGHTS:
+            raise serializers.ValidationError(
+                {"check_out": f"Stays may span at most {self.MAX_NIGHTS} nights."}
+            )
+        return attrs
@@ -0,0 +1,50 @@
+# airbnb-clone-project/bookings/signals.py
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from bookings.models import Booking, PricingRule
+from bookings.pricing import invalidate_rules
+from common.cache import bump_generation
+from properties.availability import invalidate_stays
+from properties.models import Property
+
+
+@receiver(pre_save, sender=Booking, dispatch_uid="bookings.booking_pre_save")
+def remember_previous_stay(sender, instance, **kwargs):
+    """Keep the stored stay so moving a booking also frees its old months."""
+    instance._previous_stay = None
+    if instance.pk:
+        instance._previous_stay = (
+            Booking.objects.filter(pk=instance.pk)
+            .values_list("property_id", "check_in_date", "check_out_date")
+            .first()
+        )
+
+
+@receiver(post_save, sender=Booking, dispatch_uid="bookings.booking_saved")
+@receiver(post_delete, sender=Booking, dispatch_uid="bookings.booking_deleted")
+def invalidate_availability_cache(sender, instance, **kwargs):
+    """Cached availability searches and calendars depend on bookings."""
+    stays = {(instance.property_id, instance.check_in_date, instance.check_out_date)}
+    previous = getattr(instance, "_previous_stay", None)
+    if previous:
+        stays.add(previous)
+
+    def invalidate():
+        bump_generation("bookings")
+        invalidate_stays(stays)
+
+    # After commit, so a concurrent reader can't re-cache the old rows
+    transaction.on_commit(invalidate)
+
+
+@receiver(post_save, sender=PricingRule, dispatch_uid="bookings.pricing_rule_saved")
+@receiver(post_delete, sender=PricingRule, dispatch_uid="bookings.pricing_rule_deleted")
+@receiver(post_save, sender=Property, dispatch_uid="bookings.property_price_saved")
+@receiver(post_delete, sender=Property, dispatch_uid="bookings.property_price_deleted")
+def invalidate_pricing_cache(sender, instance, **kwargs):
+    """Compiled rule sets depend on the nightly rate and the property's rules."""
+    property_id = instance.pk if sender is Property else instance.property_id
+    transaction.on_commit(lambda: invalidate_rules(property_id))
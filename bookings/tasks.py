@@ -0,0 +1,129 @@
+# airbnb-clone-project/bookings/tasks.py
+"""Periodic booking jobs scheduled by airbnb_clone.celery's beat schedule.
+
+Each job holds a Redis lock for its whole run, so a beat tick that fires
+while the previous run is still going (or a duplicate beat) exits at once
+instead of repeating the work.
+"""
+
+import datetime
+import logging
+
+from celery import shared_task
+from django.core.mail import get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.tasks import render_email
+from bookings.models import Booking
+from common.cache import bump_generation, redis_lock
+from properties.availability import invalidate_stays
+
+logger = logging.getLogger(__name__)
+
+# Longer than the worker's task_time_limit, so a live run never loses it
+LOCK_TIMEOUT = 35 * 60
+# Pending bookings hold their dates; release them if nobody confirms in time
+PENDING_BOOKING_TTL = datetime.timedelta(hours=24)
+CLEANUP_BATCH_SIZE = 1000
+REMINDER_DAYS_AHEAD = 2
+REMINDER_CHUNK_SIZE = 500
+
+
+@shared_task
+def cleanup_expired_bookings(batch_size=CLEANUP_BATCH_SIZE):
+    """Cancel pending bookings older than ``PENDING_BOOKING_TTL``.
+
+    Works through the backlog in batches, each a short transaction with one
+    ``UPDATE``. ``update()`` bypasses the model signals, so the availability
+    and listing caches are invalidated here. Returns the number cancelled.
+    """
+    with redis_lock("bookings:cleanup_expired_bookings", LOCK_TIMEOUT) as acquired:
+        if not acquired:
+            logger.info("cleanup_expired_bookings already running; skipping")
+            return 0
+
+        cutoff = timezone.now() - PENDING_BOOKING_TTL
+        expired = Booking.objects.filter(status="pending", created_at__lt=cutoff)
+        cancelled = 0
+        while True:
+            with transaction.atomic():
+                batch = list(
+                    expired.order_by("pk").values_list(
+                        "pk", "property_id", "check_in_date", "check_out_date"
+                    )[:batch_size]
+                )
+                if not batch:
+                    break
+                # Re-check the filter so a booking confirmed since the select
+                # is left alone
+                cancelled += expired.filter(pk__in=[row[0] for row in batch]).update(
+                    status="cancelled"
+                )
+                stays = [row[1:] for row in batch]
+                transaction.on_commit(lambda stays=stays: _invalidate(stays))
+
+        logger.info("Cancelled %d expired pending bookings", cancelled)
+        return cancelled
+
+
+def _invalidate(stays):
+    bump_generation("bookings")
+    invalidate_stays(stays)
+
+
+@shared_task
+def send_booking_reminders(chunk_size=REMINDER_CHUNK_SIZE):
+    """Email guests whose confirmed stay starts within ``REMINDER_DAYS_AHEAD``.
+
+    Candidates are streamed with ``iterator()`` and sent over one SMTP
+    connection; each chunk is marked with ``reminder_sent_at`` as soon as it
+    is sent, so reruns skip guests already reminded. Returns the number sent.
+    """
+    with redis_lock("bookings:send_booking_reminders", LOCK_TIMEOUT) as acquired:
+        if not acquired:
+            logger.info("send_booking_reminders already running; skipping")
+            return 0
+
+        today = timezone.localdate()
+        candidates = (
+            Booking.objects.filter(
+                status="confirmed",
+                reminder_sent_at__isnull=True,
+                check_in_date__gte=today,
+                check_in_date__lte=today + datetime.timedelta(days=REMINDER_DAYS_AHEAD),
+            )
+            .select_related("guest", "property")
+            .order_by("pk")
+        )
+
+        sent = 0
+        chunk = []
+        with get_connection() as connection:
+            for booking in candidates.iterator(chunk_size=chunk_size):
+                chunk.append(booking)
+                if len(chunk) >= chunk_size:
+                    sent += _send_reminders(chunk, connection)
+                    chunk = []
+            if chunk:
+                sent += _send_reminders(chunk, connection)
+
+        logger.info("Sent %d booking reminders", sent)
+        return sent
+
+
+def _send_reminders(bookings, connection):
+    messages = [_reminder_message(booking) for booking in bookings]
+    connection.send_messages(messages)
+    return Booking.objects.filter(pk__in=[booking.pk for booking in bookings]).update(
+        reminder_sent_at=timezone.now()
+    )
+
+
+def _reminder_message(booking):
+    return render_email(
+        "emails/booking_reminder.html",
+        f"Your stay at {booking.property.title} is coming up",
+        booking.guest,
+        {"booking": booking, "property": booking.property},
+    )
@@ -2,11 +2,35 @@
 
 
 import datetime as dt
+import json
+import threading
+import time
+from decimal import Decimal
 
 import pytest
+from django.core import mail
+from django.core.exceptions import NON_FIELD_ERRORS
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from redis.exceptions import ConnectionError as RedisConnectionError
 from rest_framework.test import APIClient
 
-from tests.factories import AmenityFactory, PropertyFactory, UserFactory
+from bookings import holds
+from bookings.locks import LOCK_NAME, lock_properties
+from bookings.models import Booking, PricingRule
+from bookings.pricing import quote
+from bookings.serializers import BookingHoldSerializer, BookingSerializer
+from bookings.tasks import cleanup_expired_bookings, send_booking_reminders
+from common import cache as cache_module
+from common.cache import get_lock_stats, redis_lock
+from properties.availability import get_busy_ranges
+from tests.factories import (
+    AmenityFactory,
+    BookingFactory,
+    PropertyFactory,
+    UserFactory,
+)
 
 
 @pytest.mark.django_db
@@ -31,6 +55,8 @@ def test_booking_conflict_validation():
     }
     r1 = client.post("/api/v1/bookings/", payload, format="json")
     assert r1.status_code == 201, r1.data
+    # Only a payment confirms a booking
+    assert r1.data["status"] == "pending"
 
     # Overlapping booking should fail
     payload2 = {
@@ -42,3 +68,639 @@ def test_booking_conflict_validation():
     }
     r2 = client.post("/api/v1/bookings/", payload2, format="json")
     assert r2.status_code in (400, 422)
+    # Same error whether clean() (SQLite) or the exclusion constraint caught it
+    assert r2.data == {NON_FIELD_ERRORS: [Booking.OVERLAP_MESSAGE]}
+
+    url = f"/api/v1/bookings/{r1.data['id']}/"
+    resp = client.patch(url, {"status": "confirmed"}, format="json")
+    assert resp.data == {"status": [BookingSerializer.STATUS_MESSAGE]}
+
+    # Cancelled bookings release their dates
+    resp = client.patch(url, {"status": "cancelled"}, format="json")
+    assert resp.status_code == 200, resp.data
+    r3 = client.post("/api/v1/bookings/", payload2, format="json")
+    assert r3.status_code == 201, r3.data
+
+
+@pytest.mark.django_db
+def test_booking_dates_must_be_ordered():
+    guest = UserFactory(user_type="guest")
+    prop = PropertyFactory(amenities=[AmenityFactory(name="WiFi")])
+    client = APIClient()
+    client.force_authenticate(guest)
+
+    resp = client.post(
+        "/api/v1/bookings/",
+        {
+            "property": prop.id,
+            "check_in_date": "2025-10-15",
+            "check_out_date": "2025-10-15",
+            "total_price": "0.00",
+        },
+        format="json",
+    )
+    assert resp.status_code == 400
+    assert resp.data == {NON_FIELD_ERRORS: [Booking.DATE_ORDER_MESSAGE]}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_parallel_bookings_cannot_double_book():
+    if connection.vendor != "postgresql":
+        pytest.skip("Race-free overlap enforcement relies on PostgreSQL")
+
+    prop = PropertyFactory(amenities=[AmenityFactory(name="WiFi")])
+    guests = [UserFactory(user_type="guest") for _ in range(8)]
+    barrier = threading.Barrier(len(guests))
+    responses = []
+
+    def book(guest, offset):
+        client = APIClient()
+        client.force_authenticate(guest)
+        barrier.wait()
+        try:
+            responses.append(
+                client.post(
+                    "/api/v1/bookings/",
+                    {
+                        "property": prop.id,
+                        # Staggered but pairwise-overlapping stays
+                        "check_in_date": str(dt.date(2026, 3, 1 + offset)),
+                        "check_out_date": str(dt.date(2026, 3, 10 + offset)),
+                        "total_price": "900.00",
+                        "status": "confirmed",
+                    },
+                    format="json",
+                )
+            )
+        finally:
+            connection.close()
+
+    threads = [
+        threading.Thread(target=book, args=(guest, i)) for i, guest in enumerate(guests)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    statuses = sorted(r.status_code for r in responses)
+    assert statuses == [201] + [400] * (len(guests) - 1)
+    assert all(
+        r.data == {NON_FIELD_ERRORS: [Booking.OVERLAP_MESSAGE]}
+        for r in responses
+        if r.status_code == 400
+    )
+    assert Booking.objects.filter(property=prop).count() == 1
+
+
+@pytest.mark.django_db
+def test_pricing_applies_weekend_and_seasonal_rules(django_capture_on_commit_callbacks):
+    prop = PropertyFactory(price_per_night="100.00")
+    PricingRule.objects.create(property=prop, kind="weekend", multiplier="1.5")
+    PricingRule.objects.create(
+        property=prop,
+        kind="seasonal",
+        multiplier="2",
+        start_date=dt.date(2026, 12, 20),
+        end_date=dt.date(2026, 12, 31),
+    )
+
+    # Fri and Sat nights at 150, then Sun and Mon inside the season at 200
+    stay = (dt.date(2026, 12, 18), dt.date(2026, 12, 22))
+    assert quote([prop.id], *stay) == {prop.id: Decimal("700.00")}
+
+    # Compiled rules are cached until the property or its rules change
+    with django_capture_on_commit_callbacks(execute=True):
+        PricingRule.objects.filter(property=prop, kind="seasonal").delete()
+    assert quote([prop.id], *stay) == {prop.id: Decimal("500.00")}
+
+    with django_capture_on_commit_callbacks(execute=True):
+        prop.price_per_night = Decimal("80.00")
+        prop.save()
+    assert quote([prop.id], *stay) == {prop.id: Decimal("400.00")}
+
+
+@pytest.mark.django_db
+def test_pricing_rounds_half_cents_up():
+    prop = PropertyFactory(price_per_night="1.00")
+    PricingRule.objects.create(property=prop, kind="weekend", multiplier="1.105")
+    PricingRule.objects.create(
+        property=prop,
+        kind="seasonal",
+        multiplier="1.115",
+        start_date=dt.date(2026, 12, 19),
+        end_date=dt.date(2026, 12, 20),
+    )
+
+    # Fri at 1.105 (110.5 cents), Sat at 1.105 * 1.115 (123.2075 cents),
+    # Sun at 1.115 (111.5 cents), Mon at the plain rate
+    stay = (dt.date(2026, 12, 18), dt.date(2026, 12, 22))
+    assert quote([prop.id], *stay) == {prop.id: Decimal("4.46")}
+
+
+@pytest.mark.django_db
+def test_bulk_quote_endpoint():
+    wifi = AmenityFactory(name="WiFi")
+    cheap = PropertyFactory(price_per_night="50.00", amenities=[wifi])
+    pricey = PropertyFactory(price_per_night="120.25", amenities=[wifi])
+    PricingRule.objects.create(property=pricey, kind="weekend", multiplier="1.1")
+
+    client = APIClient()
+    resp = client.post(
+        "/api/v1/bookings/quote/",
+        {
+            "property_ids": [pricey.id, cheap.id, 999999],
+            "check_in": "2026-12-18",
+            "check_out": "2026-12-21",
+        },
+        format="json",
+    )
+    assert resp.status_code == 200, resp.data
+    assert resp.data["nights"] == 3
+    # Fri and Sat at 132.28 (120.25 * 1.1, rounded per night), Sun at 120.25
+    assert resp.data["quotes"] == [
+        {"property": pricey.id, "total_price": "384.81"},
+        {"property": cheap.id, "total_price": "150.00"},
+    ]
+    assert resp.data["missing"] == [999999]
+
+    resp = client.post(
+        "/api/v1/bookings/quote/",
+        {
+            "property_ids": [cheap.id],
+            "check_in": "2026-12-18",
+            "check_out": "2026-12-18",
+        },
+        format="json",
+    )
+    assert resp.status_code == 400
+    assert "check_out" in resp.data
+
+
+@pytest.mark.django_db
+def test_booking_total_price_is_computed_server_side():
+    guest = UserFactory(user_type="guest")
+    prop = PropertyFactory(price_per_night="200.00", amenities=[AmenityFactory()])
+    client = APIClient()
+    client.force_authenticate(guest)
+
+    resp = client.post(
+        "/api/v1/bookings/",
+        {
+            "property": prop.id,
+            "check_in_date": "2026-11-02",
+            "check_out_date": "2026-11-05",
+            "total_price": "1.00",
+        },
+        format="json",
+    )
+    assert resp.status_code == 201, resp.data
+    assert resp.data["total_price"] == "600.00"
+
+    # Changing the dates reprices the stay; other updates keep the price
+    url = f"/api/v1/bookings/{resp.data['id']}/"
+    resp = client.patch(url, {"check_out_date": "2026-11-06"}, format="json")
+    assert resp.data["total_price"] == "800.00"
+    PricingRule.objects.create(property=prop, kind="weekend", multiplier="3")
+    resp = client.patch(url, {"status": "cancelled"}, format="json")
+    assert resp.data["total_price"] == "800.00"
+
+
+@pytest.mark.django_db
+def test_cleanup_expired_bookings_cancels_stale_pending_in_batches(
+    django_capture_on_commit_callbacks,
+):
+    prop = PropertyFactory(amenities=[AmenityFactory(name="WiFi")])
+    start = dt.date.today() + dt.timedelta(days=30)
+    stale = [
+        BookingFactory(
+            property=prop,
+            status="pending",
+            check_in_date=start + dt.timedelta(days=4 * i),
+        )
+        for i in range(3)
+    ]
+    fresh = BookingFactory(
+        property=prop, status="pending", check_in_date=start + dt.timedelta(days=15)
+    )
+    confirmed = BookingFactory(
+        property=prop, status="confirmed", check_in_date=start + dt.timedelta(days=20)
+    )
+    old = timezone.now() - dt.timedelta(days=2)
+    Booking.objects.filter(pk__in=[b.pk for b in stale + [confirmed]]).update(
+        created_at=old
+    )
+    window = (start, start + dt.timedelta(days=30))
+    assert len(get_busy_ranges(prop.id, *window)) == 5  # now cached
+
+    with redis_lock("bookings:cleanup_expired_bookings", 60):
+        assert cleanup_expired_bookings() == 0
+
+    with django_capture_on_commit_callbacks(execute=True):
+        assert cleanup_expired_bookings(batch_size=2) == 3
+
+    statuses = dict(Booking.objects.values_list("pk", "status"))
+    assert [statuses[b.pk] for b in stale] == ["cancelled"] * 3
+    assert statuses[fresh.pk] == "pending"
+    assert statuses[confirmed.pk] == "confirmed"
+    # update() skips signals, so the task itself must drop cached calendars
+    assert get_busy_ranges(prop.id, *window) == [
+        (fresh.check_in_date, fresh.check_out_date),
+        (confirmed.check_in_date, confirmed.check_out_date),
+    ]
+
+
+@pytest.mark.django_db
+def test_send_booking_reminders_emails_each_guest_once():
+    prop = PropertyFactory(amenities=[AmenityFactory(name="WiFi")])
+    tomorrow = dt.date.today() + dt.timedelta(days=1)
+    due = BookingFactory(property=prop, status="confirmed", check_in_date=tomorrow)
+    BookingFactory(
+        property=prop,
+        status="confirmed",
+        check_in_date=tomorrow + dt.timedelta(days=10),
+    )
+    BookingFactory(
+        property=prop, status="pending", check_in_date=tomorrow + dt.timedelta(days=5)
+    )
+
+    assert send_booking_reminders(chunk_size=1) == 1
+    assert len(mail.outbox) == 1
+    assert mail.outbox[0].to == [due.guest.email]
+    assert prop.title in mail.outbox[0].subject
+
+    assert send_booking_reminders() == 0
+    assert len(mail.outbox) == 1
+
+
+@pytest.mark.django_db
+def test_list_values_path_matches_booking_serializer():
+    wifi = AmenityFactory(name="WiFi")
+    prop = PropertyFactory(amenities=[wifi])
+    guest = UserFactory(user_type="guest")
+    for week, status in enumerate(["pending", "confirmed", "cancelled"]):
+        BookingFactory(
+            property=prop,
+            guest=guest,
+            check_in_date=dt.date(2025, 7, 1) + dt.timedelta(weeks=week),
+            check_out_date=dt.date(2025, 7, 4) + dt.timedelta(weeks=week),
+            status=status,
+        )
+
+    client = APIClient()
+    client.force_authenticate(guest)
+    for params in ({}, {"ordering": "check_in_date"}, {"cursor": ""}):
+        resp = client.get("/api/v1/bookings/", params)
+        assert resp.status_code == 200
+        ordering = params.get("ordering", "-created_at")
+        expected = BookingSerializer(
+            Booking.objects.order_by(ordering, "id" if ordering[0] != "-" else "-id"),
+            many=True,
+        ).data
+        assert json.dumps(resp.json()["results"]) == json.dumps(expected)
+
+
+@pytest.mark.django_db
+def test_bookings_embed_property_and_guest():
+    wifi = AmenityFactory(name="WiFi")
+    guest = UserFactory(user_type="guest", first_name="Ama")
+    client = APIClient()
+    client.force_authenticate(guest)
+
+    def fetch():
+        with CaptureQueriesContext(connection) as queries:
+            resp = client.get(
+                "/api/v1/bookings/",
+                # Cursor mode: no (cached) COUNT(*) to skew the query count
+                {"include": "property,guest", "fields": "id,status", "cursor": ""},
+            )
+        assert resp.status_code == 200
+        return resp.json()["results"], len(queries)
+
+    for week in range(2):
+        BookingFactory(
+            property=PropertyFactory(title=f"Villa {week}", amenities=[wifi]),
+            guest=guest,
+            check_in_date=dt.date(2025, 8, 1) + dt.timedelta(weeks=week),
+            check_out_date=dt.date(2025, 8, 3) + dt.timedelta(weeks=week),
+        )
+    results, count = fetch()
+    assert {r["property"]["title"] for r in results} == {"Villa 0", "Villa 1"}
+    assert results[0]["guest"] == {
+        "id": guest.id,
+        "first_name": "Ama",
+        "last_name": guest.last_name,
+        "user_type": "guest",
+    }
+    assert set(results[0]) == {"id", "status", "property", "guest"}
+
+    BookingFactory(
+        property=PropertyFactory(amenities=[wifi]),
+        guest=guest,
+        check_in_date=dt.date(2025, 9, 1),
+        check_out_date=dt.date(2025, 9, 3),
+    )
+    results, more = fetch()
+    assert len(results) == 3 and more == count
+
+
+@pytest.mark.django_db
+def test_bookings_are_scoped_to_guest_or_host():
+    wifi = AmenityFactory(name="WiFi")
+    host = UserFactory(user_type="host")
+    guest, other = UserFactory(user_type="guest"), UserFactory(user_type="guest")
+    trip = BookingFactory(
+        property=PropertyFactory(host=host, amenities=[wifi]), guest=guest
+    )
+    elsewhere = BookingFactory(property=PropertyFactory(amenities=[wifi]), guest=other)
+
+    client = APIClient()
+
+    def ids(user, **query):
+        client.force_authenticate(user)
+        resp = client.get("/api/v1/bookings/", query)
+        assert resp.status_code == 200, resp.data
+        return [booking["id"] for booking in resp.json()["results"]]
+
+    assert ids(guest) == [trip.id]
+    assert ids(other) == [elsewhere.id]
+    # Hosts see reservations of their properties, or their own trips
+    assert ids(host) == [trip.id]
+    assert ids(host, role="guest") == []
+    assert ids(guest, role="host") == []
+
+    client.force_authenticate(host)
+    assert client.get(f"/api/v1/bookings/{trip.id}/").status_code == 200
+    assert client.get(f"/api/v1/bookings/{elsewhere.id}/").status_code == 404
+    assert client.get("/api/v1/bookings/", {"role": "admin"}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_scoped_booking_lists_are_served_by_indexes(query_plans):
+    if connection.vendor != "postgresql":
+        pytest.skip("Inspects PostgreSQL query plans")
+
+    wifi = AmenityFactory(name="WiFi")
+    host = UserFactory(user_type="host")
+    guest = UserFactory(user_type="guest")
+    BookingFactory(property=PropertyFactory(host=host, amenities=[wifi]), guest=guest)
+    client = APIClient()
+
+    def page_plan(user):
+        client.force_authenticate(user)
+        plans = query_plans(lambda: client.get("/api/v1/bookings/", {"cursor": ""}))
+        [plan] = [plan for plan in plans if "bookings_booking" in plan]
+        return plan
+
+    # Newest trips first straight from the index, no sort
+    plan = page_plan(guest)
+    assert "Index Scan using bookings_guest_created_idx" in plan
+    assert "Sort" not in plan
+    # A host's properties, then their bookings by (property, status, ...)
+    plan = page_plan(host)
+    assert "Index Scan using bookings_bo_propert_02e569_idx" in plan
+    assert "Seq Scan" not in plan
+
+
+@pytest.mark.django_db(transaction=True)
+def test_booking_lock_serializes_writes_per_property():
+    if connection.vendor != "postgresql":
+        pytest.skip("SQLite has no row locks")
+
+    wifi = AmenityFactory(name="WiFi")
+    locked, other = PropertyFactory(amenities=[wifi]), PropertyFactory(amenities=[wifi])
+    held = threading.Event()
+    waits = {}
+
+    def hold():
+        try:
+            with transaction.atomic():
+                lock_properties(locked.pk)
+                held.set()
+                time.sleep(0.3)
+        finally:
+            connection.close()
+
+    def wait_for(name, prop):
+        held.wait()
+        try:
+            with transaction.atomic():
+                waits[name] = lock_properties(prop.pk)
+        finally:
+            connection.close()
+
+    threads = [
+        threading.Thread(target=hold),
+        threading.Thread(target=wait_for, args=("same", locked)),
+        threading.Thread(target=wait_for, args=("other", other)),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert waits["same"] >= 0.2
+    assert waits["other"] < 0.2
+
+    client = APIClient()
+    client.force_authenticate(UserFactory(is_staff=True))
+    stats = client.get("/api/v1/locks/stats/").data[LOCK_NAME]
+    assert stats["acquired"] == 3 and stats["wait_seconds"] >= waits["same"] * 0.99
+
+
+@pytest.mark.django_db
+def test_booking_lock_survives_lock_stats_failures(monkeypatch, caplog):
+    def unavailable(*args, **kwargs):
+        raise RedisConnectionError("Too many connections")
+
+    prop = PropertyFactory(amenities=[AmenityFactory(name="WiFi")])
+    monkeypatch.setattr(cache_module, "_incr", unavailable)
+    with transaction.atomic():
+        assert lock_properties(prop.pk) >= 0
+    assert "Could not record a wait for lock" in caplog.text
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_booking_writes_never_double_book():
+    if connection.vendor != "postgresql":
+        pytest.skip("Concurrent writers need PostgreSQL")
+
+    wifi = AmenityFactory(name="WiFi")
+    props = [PropertyFactory(amenities=[wifi]) for _ in range(3)]
+    start = dt.date(2026, 6, 1)
+    guests = [UserFactory(user_type="guest") for _ in range(24)]
+    # Half the writers move or cancel an existing stay, half book a new one
+    existing = [
+        BookingFactory(
+            property=props[i % len(props)],
+            guest=guest,
+            check_in_date=start + dt.timedelta(days=4 * i),
+            check_out_date=start + dt.timedelta(days=4 * i + 3),
+            status="confirmed",
+        )
+        for i, guest in enumerate(guests[::2])
+    ]
+    barrier = threading.Barrier(len(guests))
+    responses = []
+
+    def write(i, guest):
+        client = APIClient()
+        client.force_authenticate(guest)
+        check_in = start + dt.timedelta(days=(5 * i) % 40)
+        stay = {
+            "check_in_date": str(check_in),
+            "check_out_date": str(check_in + dt.timedelta(days=6)),
+        }
+        barrier.wait()
+        try:
+            if i % 2:
+                resp = client.post(
+                    "/api/v1/bookings/",
+                    {"property": props[i % len(props)].pk, **stay},
+                    format="json",
+                )
+            elif i % 4:
+                resp = client.patch(
+                    f"/api/v1/bookings/{existing[i // 2].pk}/", stay, format="json"
+                )
+            else:
+                resp = client.patch(
+                    f"/api/v1/bookings/{existing[i // 2].pk}/",
+                    {"status": "cancelled"},
+                    format="json",
+                )
+            responses.append(resp)
+        finally:
+            connection.close()
+
+    threads = [
+        threading.Thread(target=write, args=(i, guest))
+        for i, guest in enumerate(guests)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(responses) == len(guests)
+    assert all(
+        r.status_code in (200, 201)
+        or r.data == {NON_FIELD_ERRORS: [Booking.OVERLAP_MESSAGE]}
+        for r in responses
+    ), [r.data for r in responses if r.status_code >= 400]
+    assert any(r.status_code == 400 for r in responses)
+    for prop in props:
+        stays = sorted(
+            Booking.objects.filter(property=prop)
+            .active()
+            .values_list("check_in_date", "check_out_date")
+        )
+        assert all(a[1] <= b[0] for a, b in zip(stays, stays[1:]))
+    assert get_lock_stats(LOCK_NAME)[LOCK_NAME]["acquired"] == len(guests)
+
+
+@pytest.mark.django_db
+def test_booking_holds_block_dates_until_confirmed(
+    settings, django_capture_on_commit_callbacks
+):
+    prop = PropertyFactory(amenities=[AmenityFactory(name="WiFi")])
+    guest, other = UserFactory(user_type="guest"), UserFactory(user_type="guest")
+    client, rival = APIClient(), APIClient()
+    client.force_authenticate(guest)
+    rival.force_authenticate(other)
+    stay = {
+        "property": prop.id,
+        "check_in_date": "2026-05-10",
+        "check_out_date": "2026-05-14",
+    }
+    held = {NON_FIELD_ERRORS: [BookingHoldSerializer.HELD_MESSAGE]}
+
+    resp = client.post("/api/v1/bookings/holds/", stay, format="json")
+    assert resp.status_code == 201, resp.data
+    hold_id = resp.data["id"]
+    assert resp.data["check_in_date"] == "2026-05-10" and resp.data["expires_at"]
+
+    # Other guests can neither hold nor book the held nights
+    overlap = {**stay, "check_in_date": "2026-05-12", "check_out_date": "2026-05-16"}
+    resp = rival.post("/api/v1/bookings/holds/", overlap, format="json")
+    assert (resp.status_code, resp.data) == (400, held)
+    resp = rival.post("/api/v1/bookings/", overlap, format="json")
+    assert (resp.status_code, resp.data) == (400, held)
+    assert rival.get(f"/api/v1/bookings/holds/{hold_id}/").status_code == 404
+    resp = rival.post(
+        "/api/v1/bookings/holds/",
+        {**stay, "check_in_date": "2026-05-14", "check_out_date": "2026-05-16"},
+        format="json",
+    )
+    assert resp.status_code == 201
+    rival_hold = resp.data["id"]
+
+    # Availability searches and the calendar count holds as busy
+    resp = client.get(
+        "/api/v1/properties/", {"check_in": "2026-05-13", "check_out": "2026-05-15"}
+    )
+    assert resp.data["results"] == []
+    resp = client.get(
+        f"/api/v1/properties/{prop.id}/availability/",
+        {"from": "2026-05-01", "to": "2026-06-01"},
+    )
+    assert resp.json()["busy"] == [{"start": "2026-05-10", "end": "2026-05-16"}]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        # Only a payment confirms a booking, whatever the client asks
+        resp = client.post(
+            f"/api/v1/bookings/holds/{hold_id}/confirm/",
+            {"status": "confirmed"},
+            format="json",
+        )
+    assert resp.status_code == 201, resp.data
+    booking = Booking.objects.get(pk=resp.data["id"])
+    assert (booking.guest, booking.status) == (guest, "pending")
+    assert (booking.check_in_date, booking.check_out_date) == (
+        dt.date(2026, 5, 10),
+        dt.date(2026, 5, 14),
+    )
+    assert client.get(f"/api/v1/bookings/holds/{hold_id}/").status_code == 404
+    resp = rival.post("/api/v1/bookings/holds/", overlap, format="json")
+    assert (resp.status_code, resp.data) == (
+        400,
+        {NON_FIELD_ERRORS: [Booking.OVERLAP_MESSAGE]},
+    )
+
+    assert rival.delete(f"/api/v1/bookings/holds/{rival_hold}/").status_code == 204
+    assert holds.get_holds(prop.id, dt.date(2026, 5, 1), dt.date(2026, 6, 1)) == []
+
+    # Abandoned holds expire on their own
+    settings.BOOKING_HOLD_TTL = 1
+    later = {**stay, "check_in_date": "2026-07-01", "check_out_date": "2026-07-03"}
+    assert (
+        rival.post("/api/v1/bookings/holds/", later, format="json").status_code == 201
+    )
+    time.sleep(1.1)
+    assert (
+        client.post("/api/v1/bookings/holds/", later, format="json").status_code == 201
+    )
+
+
+def test_overlapping_holds_are_placed_atomically():
+    start = dt.date(2026, 8, 1)
+    barrier = threading.Barrier(10)
+    placed = []
+
+    def place(guest_id):
+        barrier.wait()
+        placed.append(
+            holds.place_hold(
+                999,
+                guest_id,
+                start + dt.timedelta(days=guest_id % 3),
+                start + dt.timedelta(days=5),
+            )
+        )
+
+    threads = [threading.Thread(target=place, args=(i,)) for i in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len([hold for hold in placed if hold is not None]) == 1
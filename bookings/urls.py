@@ -2,9 +2,11 @@
 
 from rest_framework.routers import DefaultRouter
 
-from bookings.views import BookingViewSet
+from bookings.views import BookingHoldViewSet, BookingViewSet
 
 router = DefaultRouter()
+# Before bookings, whose detail route would otherwise take "holds" as an id
+router.register(r"bookings/holds", BookingHoldViewSet, basename="booking-hold")
 router.register(r"bookings", BookingViewSet, basename="booking")
 
 urlpatterns = router.urls
@@ -1,9 +1,25 @@
 # airbnb-clone-project/bookings/views.py
 
-from rest_framework import permissions, viewsets
+from django.core.exceptions import NON_FIELD_ERRORS
+from django.db import transaction
+from rest_framework import permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.response import Response
 
+from bookings import holds, pricing
+from bookings.locks import lock_properties
 from bookings.models import Booking
-from bookings.serializers import BookingSerializer
+from bookings.serializers import (
+    BookingHoldSerializer,
+    BookingSerializer,
+    BookingValuesSerializer,
+    QuoteRequestSerializer,
+)
+from common.cache import bump_generation
+from common.idempotency import idempotent
+from common.pagination import EstimatedCountPagination
+from common.views import FieldsetQuerysetMixin, UserScopedMixin, ValuesListMixin
 
 
 class IsGuestOrReadOnly(permissions.BasePermission):
@@ -13,9 +29,19 @@ class IsGuestOrReadOnly(permissions.BasePermission):
         return obj.guest_id == getattr(request.user, "id", None)
 
 
-class BookingViewSet(viewsets.ModelViewSet):
+class BookingViewSet(
+    ValuesListMixin,
+    FieldsetQuerysetMixin,
+    UserScopedMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Booking.objects.select_related("property", "guest").all()
     serializer_class = BookingSerializer
+    # Lists are always scoped to one user, so counts are exact; they are
+    # still cached briefly between pages
+    pagination_class = EstimatedCountPagination
+    # list pages skip model instances and DRF field machinery
+    values_serializer_class = BookingValuesSerializer
     permission_classes = [permissions.IsAuthenticated, IsGuestOrReadOnly]
 
     filterset_fields = ["property", "guest", "status", "check_in_date"]
@@ -23,5 +49,147 @@ class BookingViewSet(viewsets.ModelViewSet):
     ordering_fields = ["check_in_date", "created_at", "status"]
     ordering = ["-created_at"]
 
+    # Writes run in one transaction holding their properties' booking locks
+    # (see bookings.locks), so the overlap check and the write can't race
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        with transaction.atomic():
+            lock_properties(*self.requested_property_ids(request))
+            return super().create(request, *args, **kwargs)
+
+    def update(self, request, *args, **kwargs):
+        with transaction.atomic():
+            lock_properties(
+                *self.current_property_ids(), *self.requested_property_ids(request)
+            )
+            return super().update(request, *args, **kwargs)
+
+    def destroy(self, request, *args, **kwargs):
+        with transaction.atomic():
+            lock_properties(*self.current_property_ids())
+            return super().destroy(request, *args, **kwargs)
+
+    def current_property_ids(self):
+        """The property of the booking being changed, read before locking it."""
+        lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        try:
+            return Booking.objects.filter(pk=lookup).values_list(
+                "property_id", flat=True
+            )
+        except (TypeError, ValueError):
+            # Not a valid id: get_object() responds 404
+            return []
+
+    @staticmethod
+    def requested_property_ids(request):
+        """The property a write asks for, if it names a valid id."""
+        try:
+            return [int(request.data["property"])]
+        except (KeyError, TypeError, ValueError):
+            return []
+
     def perform_create(self, serializer):
         serializer.save(guest=self.request.user)
+
+    @action(detail=False, methods=["post"], permission_classes=[permissions.AllowAny])
+    def quote(self, request):
+        """Stay totals for many properties over one date range.
+
+        Unknown property ids are listed under ``missing`` instead of failing
+        the whole quote, since search results can go stale.
+        """
+        query = QuoteRequestSerializer(data=request.data)
+        query.is_valid(raise_exception=True)
+        property_ids = query.validated_data["property_ids"]
+        check_in = query.validated_data["check_in"]
+        check_out = query.validated_data["check_out"]
+
+        totals = pricing.quote(property_ids, check_in, check_out)
+        return Response(
+            {
+                "check_in": check_in,
+                "check_out": check_out,
+                "nights": (check_out - check_in).days,
+                "quotes": [
+                    {"property": pk, "total_price": str(total)}
+                    for pk, total in totals.items()
+                ],
+                "missing": [
+                    pk for pk in dict.fromkeys(property_ids) if pk not in totals
+                ],
+            }
+        )
+
+
+class BookingHoldViewSet(viewsets.ViewSet):
+    """Hold a property's dates in Redis while the guest checks out.
+
+    ``POST /bookings/holds/`` holds a stay for ``BOOKING_HOLD_TTL`` seconds;
+    ``POST /bookings/holds/{id}/confirm/`` turns it into a pending booking,
+    confirmed once paid (payments.tasks), and
+    ``DELETE`` gives the dates back early. See bookings.holds.
+    """
+
+    serializer_class = BookingHoldSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def create(self, request):
+        serializer = BookingHoldSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        prop = serializer.validated_data["property"]
+        check_in = serializer.validated_data["check_in_date"]
+        check_out = serializer.validated_data["check_out_date"]
+
+        # A read on the bookings index; holds themselves never touch the database
+        if (
+            Booking.objects.filter(property=prop)
+            .active()
+            .overlapping(check_in, check_out)
+            .exists()
+        ):
+            raise ValidationError({NON_FIELD_ERRORS: [Booking.OVERLAP_MESSAGE]})
+        hold = holds.place_hold(prop.pk, request.user.pk, check_in, check_out)
+        if hold is None:
+            raise ValidationError(
+                {NON_FIELD_ERRORS: [BookingHoldSerializer.HELD_MESSAGE]}
+            )
+        # Cached availability searches now miss this property
+        bump_generation("bookings")
+        return Response(
+            BookingHoldSerializer(hold).data, status=status.HTTP_201_CREATED
+        )
+
+    def retrieve(self, request, pk=None):
+        return Response(BookingHoldSerializer(self.get_hold(request, pk)).data)
+
+    def destroy(self, request, pk=None):
+        if holds.release_hold(self.get_hold(request, pk)):
+            bump_generation("bookings")
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=True, methods=["post"])
+    def confirm(self, request, pk=None):
+        """Book the held stay, pending until its payment confirms it."""
+        hold = self.get_hold(request, pk)
+        serializer = BookingSerializer(
+            data={
+                "property": hold.property_id,
+                "check_in_date": hold.check_in,
+                "check_out_date": hold.check_out,
+            },
+            context={"request": request},
+        )
+        with transaction.atomic():
+            lock_properties(hold.property_id)
+            serializer.is_valid(raise_exception=True)
+            serializer.save(guest=request.user)
+            transaction.on_commit(lambda: holds.release_hold(hold))
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @staticmethod
+    def get_hold(request, hold_id):
+        """The requesting guest's unexpired hold, or 404."""
+        hold = holds.get_hold(hold_id)
+        if hold is None or hold.guest_id != request.user.pk:
+            raise NotFound()
+        return hold
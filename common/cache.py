@@ -0,0 +1,284 @@
+# airbnb-clone-project/common/cache.py
+
+import hashlib
+import logging
+import time
+from contextlib import contextmanager
+
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from redis.exceptions import LockError, RedisError
+from rest_framework.response import Response
+
+GENERATION_KEY = "generation:{namespace}"
+STATS_KEY = "cache-stats:{namespace}:{outcome}"
+RESPONSE_KEY = "response:{namespace}:{digest}"
+LOCK_KEY = "lock:{name}"
+LOCK_STATS_KEY = "lock-stats:{name}:{stat}"
+
+logger = logging.getLogger(__name__)
+
+
+def _generation_key(namespace):
+    return GENERATION_KEY.format(namespace=namespace)
+
+
+def _incr(key, initial, delta=1):
+    """Atomically add ``delta`` to ``key``, creating it with ``initial`` if missing."""
+    try:
+        return cache.incr(key, delta)
+    except ValueError:
+        if cache.add(key, initial, timeout=None):
+            return initial
+        return cache.incr(key, delta)
+
+
+def get_generations(*namespaces):
+    """Return the current generation of each namespace in one round trip.
+
+    Missing generations are seeded from the clock rather than zero, so a
+    counter evicted from Redis can never roll back to a value that older,
+    now-stale entries were stored under.
+    """
+    keys = [_generation_key(namespace) for namespace in namespaces]
+    found = cache.get_many(keys)
+    generations = []
+    for key in keys:
+        if key not in found:
+            cache.add(key, time.time_ns(), timeout=None)
+            found[key] = cache.get(key)
+        generations.append(found[key])
+    return generations
+
+
+def bump_generation(*namespaces):
+    """Invalidate every cached entry built from the given namespaces."""
+    for namespace in namespaces:
+        _incr(_generation_key(namespace), time.time_ns())
+
+
+def record_cache_outcome(namespace, hit):
+    _incr(STATS_KEY.format(namespace=namespace, outcome="hits" if hit else "misses"), 1)
+
+
+def get_cache_stats(*namespaces):
+    """Hit/miss counters per namespace, for monitoring."""
+    keys = {
+        (namespace, outcome): STATS_KEY.format(namespace=namespace, outcome=outcome)
+        for namespace in namespaces
+        for outcome in ("hits", "misses")
+    }
+    found = cache.get_many(list(keys.values()))
+    stats = {}
+    for namespace in namespaces:
+        hits = found.get(keys[(namespace, "hits")], 0)
+        misses = found.get(keys[(namespace, "misses")], 0)
+        total = hits + misses
+        stats[namespace] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / total, 4) if total else None,
+        }
+    return stats
+
+
+def record_lock_wait(name, seconds, slow):
+    """Count an acquisition of lock ``name`` after waiting ``seconds``.
+
+    Best effort: the caller holds the lock, so a Redis failure is logged
+    rather than failing the guarded write.
+    """
+    microseconds = round(seconds * 1_000_000)
+    try:
+        _incr(LOCK_STATS_KEY.format(name=name, stat="acquired"), 1)
+        _incr(
+            LOCK_STATS_KEY.format(name=name, stat="wait_us"), microseconds, microseconds
+        )
+        if slow:
+            _incr(LOCK_STATS_KEY.format(name=name, stat="slow"), 1)
+    except RedisError:
+        logger.warning("Could not record a wait for lock %s", name, exc_info=True)
+
+
+def get_lock_stats(*names):
+    """Acquisitions, total and mean wait, and slow waits per lock, for monitoring."""
+    keys = {
+        (name, stat): LOCK_STATS_KEY.format(name=name, stat=stat)
+        for name in names
+        for stat in ("acquired", "wait_us", "slow")
+    }
+    found = cache.get_many(list(keys.values()))
+    stats = {}
+    for name in names:
+        acquired = found.get(keys[(name, "acquired")], 0)
+        wait = found.get(keys[(name, "wait_us")], 0) / 1_000_000
+        stats[name] = {
+            "acquired": acquired,
+            "wait_seconds": round(wait, 6),
+            "mean_wait_seconds": round(wait / acquired, 6) if acquired else None,
+            "slow": found.get(keys[(name, "slow")], 0),
+        }
+    return stats
+
+
+@contextmanager
+def redis_lock(name, timeout):
+    """Try to take a Redis lock without waiting; yields whether it was taken.
+
+    ``timeout`` bounds how long a crashed holder can keep the lock, so it
+    should exceed the longest run of the guarded work.
+    """
+    lock = cache.lock(LOCK_KEY.format(name=name), timeout=timeout)
+    acquired = lock.acquire(blocking=False)
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            try:
+                lock.release()
+            except LockError:
+                # Expired mid-run; another holder may own it by now
+                pass
+
+
+class CachedResponseMixin:
+    """Cache anonymous ``list``/``retrieve`` responses of a viewset.
+
+    Entries are keyed by the action, lookup kwargs and the normalized query
+    string (which includes any pagination cursor), plus the generation of
+    every namespace the response depends on. Writers never delete entries;
+    they bump a generation (see ``bump_generation``) so all keys built from
+    the old value simply stop being read and age out.
+    """
+
+    cache_namespace = None
+    cache_actions = ("list", "retrieve")
+    cache_timeout = DEFAULT_TIMEOUT
+
+    def list(self, request, *args, **kwargs):
+        return self._cached(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._cached(super().retrieve, request, *args, **kwargs)
+
+    def should_cache_response(self, request):
+        return (
+            self.action in self.cache_actions
+            and request.method == "GET"
+            and not request.user.is_authenticated
+        )
+
+    def get_cache_dependencies(self, request):
+        """Generation namespaces this response must be invalidated by."""
+        if self.action == "retrieve":
+            lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+            return [f"{self.cache_namespace}:{lookup}"]
+        return [self.cache_namespace]
+
+    def get_response_cache_key(self, request):
+        dependencies = self.get_cache_dependencies(request)
+        generations = get_generations(*dependencies)
+        query = sorted(
+            (key, sorted(values)) for key, values in request.query_params.lists()
+        )
+        raw = repr(
+            (
+                self.action,
+                sorted(self.kwargs.items()),
+                query,
+                request.get_host(),
+                list(zip(dependencies, generations)),
+            )
+        )
+        digest = hashlib.sha256(raw.encode("utf-8")).hexdigest()
+        return RESPONSE_KEY.format(namespace=self.cache_namespace, digest=digest)
+
+    def _cached(self, handler, request, *args, **kwargs):
+        if not self.should_cache_response(request):
+            return handler(request, *args, **kwargs)
+
+        key = self.get_response_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            record_cache_outcome(self.cache_namespace, hit=True)
+            response = Response(data)
+            response["X-Cache"] = "HIT"
+            return response
+
+        record_cache_outcome(self.cache_namespace, hit=False)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, self.cache_timeout)
+        response["X-Cache"] = "MISS"
+        return response
+
+
+class ConditionalGetMixin:
+    """``ETag``/``Last-Modified`` validation for a viewset's read actions.
+
+    Views implement ``get_conditional_validators``, which must be cheap (one
+    indexed query at most) and must change whenever the rendered body could.
+    Requests whose ``If-None-Match``/``If-Modified-Since`` still match get a
+    304 before anything is serialized, or even looked up in the response
+    cache. The ETag is weak: it is derived from the validators, the query
+    string and the negotiated format rather than from the body.
+    """
+
+    conditional_actions = ("list", "retrieve")
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional(super().retrieve, request, *args, **kwargs)
+
+    def get_conditional_validators(self, request):
+        """``(version, last_modified)`` of the current response, or None.
+
+        ``version`` is any repr()-able value that changes with the body;
+        ``last_modified`` is an aware datetime or None. Returning None (e.g.
+        for a missing object) skips validation.
+        """
+        raise NotImplementedError
+
+    def _conditional(self, handler, request, *args, **kwargs):
+        validators = None
+        if self.action in self.conditional_actions and request.method in (
+            "GET",
+            "HEAD",
+        ):
+            validators = self.get_conditional_validators(request)
+        if validators is None:
+            return handler(request, *args, **kwargs)
+
+        version, last_modified = validators
+        query = sorted(
+            (key, sorted(values)) for key, values in request.query_params.lists()
+        )
+        raw = repr(
+            (
+                version,
+                self.action,
+                sorted(self.kwargs.items()),
+                query,
+                request.accepted_renderer.format,
+            )
+        )
+        headers = {"ETag": f'W/"{hashlib.sha256(raw.encode("utf-8")).hexdigest()}"'}
+        if last_modified is not None:
+            headers["Last-Modified"] = http_date(last_modified.timestamp())
+
+        response = get_conditional_response(
+            request,
+            etag=headers["ETag"],
+            last_modified=last_modified and int(last_modified.timestamp()),
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        for header, value in headers.items():
+            response[header] = value
+        return response
@@ -0,0 +1,99 @@
+# airbnb-clone-project/common/fields.py
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
+
+# Serializer context key holding {field_name: {pk: object or None}}, filled by
+# common.serializers.BulkCreateListSerializer so list items share one lookup
+RELATED_OBJECTS_CONTEXT_KEY = "related_objects"
+
+
+class BulkManyRelatedField(serializers.ManyRelatedField):
+    """``ManyRelatedField`` that resolves every submitted pk in one query.
+
+    DRF validates each item with its own ``queryset.get(pk=...)``; this does
+    a single ``pk__in`` lookup instead, reusing objects already resolved for
+    the same field in the serializer context (see
+    ``RELATED_OBJECTS_CONTEXT_KEY``). Errors keep DRF's shape: a list of
+    messages, with one ``does_not_exist`` message per missing pk.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, "__iter__"):
+            self.fail("not_a_list", input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail("empty")
+
+        child = self.child_relation
+        queryset = child.get_queryset()
+        pk_field = queryset.model._meta.pk
+        pks = []
+        for item in data:
+            if child.pk_field is not None:
+                item = child.pk_field.to_internal_value(item)
+            try:
+                if isinstance(item, bool):
+                    raise TypeError
+                pks.append(pk_field.to_python(item))
+            except (TypeError, ValueError, DjangoValidationError):
+                child.fail("incorrect_type", data_type=type(item).__name__)
+
+        found = self.resolve(queryset, pks)
+        missing = [pk for pk in dict.fromkeys(pks) if pk not in found]
+        if missing:
+            raise serializers.ValidationError(
+                [
+                    child.error_messages["does_not_exist"].format(pk_value=pk)
+                    for pk in missing
+                ],
+                code="does_not_exist",
+            )
+        return [found[pk] for pk in pks]
+
+    def preload(self, values):
+        """Resolve the pks in many payloads' ``values`` with one query.
+
+        Later ``to_internal_value`` calls for this field in the same
+        serializer context are then served without querying. Malformed
+        values are skipped here and reported by ``to_internal_value``.
+        """
+        queryset = self.child_relation.get_queryset()
+        pk_field = queryset.model._meta.pk
+        pks = set()
+        for value in values:
+            if isinstance(value, str) or not hasattr(value, "__iter__"):
+                continue
+            for item in value:
+                try:
+                    if not isinstance(item, bool):
+                        pks.add(pk_field.to_python(item))
+                except (TypeError, ValueError, DjangoValidationError):
+                    continue
+        self.context.setdefault(RELATED_OBJECTS_CONTEXT_KEY, {}).setdefault(
+            self.field_name, {}
+        )
+        self.resolve(queryset, pks)
+
+    def resolve(self, queryset, pks):
+        """``{pk: object}`` for the ``pks`` that exist."""
+        known = self.context.get(RELATED_OBJECTS_CONTEXT_KEY, {}).get(self.field_name)
+        if known is None:
+            return queryset.in_bulk(set(pks))
+        unknown = set(pks).difference(known)
+        if unknown:
+            known.update(dict.fromkeys(unknown))
+            known.update(queryset.in_bulk(unknown))
+        return {pk: known[pk] for pk in pks if known[pk] is not None}
+
+
+class BulkPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """``PrimaryKeyRelatedField`` whose ``many=True`` form validates in bulk."""
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {"child_relation": cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BulkManyRelatedField(**list_kwargs)
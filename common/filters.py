@@ -0,0 +1,71 @@
+# airbnb-clone-project/common/filters.py
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import F
+from rest_framework import filters
+
+# Text search configuration shared with the search_vector triggers
+SEARCH_CONFIG = "english"
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """Drop-in replacement for SearchFilter backed by PostgreSQL full-text search.
+
+    Views opt in by declaring ``search_vector_field``, the name of a stored
+    ``SearchVectorField`` kept up to date by a database trigger and covered by
+    a GIN index. Matches are annotated with ``search_rank`` for ordering.
+    On other databases, or views without a vector field, this behaves exactly
+    like DRF's ``SearchFilter`` (``icontains`` over ``search_fields``).
+    """
+
+    rank_annotation = "search_rank"
+
+    def filter_queryset(self, request, queryset, view):
+        vector_field = getattr(view, "search_vector_field", None)
+        if vector_field is None or connection.vendor != "postgresql":
+            return super().filter_queryset(request, queryset, view)
+
+        search_terms = self.get_search_terms(request)
+        if not search_terms:
+            return queryset
+
+        query = SearchQuery(
+            " ".join(search_terms), config=SEARCH_CONFIG, search_type="websearch"
+        )
+        return queryset.filter(**{vector_field: query}).annotate(
+            **{self.rank_annotation: SearchRank(F(vector_field), query)}
+        )
+
+
+class OrderingFilter(filters.OrderingFilter):
+    """OrderingFilter that ranks full-text matches first by default.
+
+    An explicit ``?ordering=`` still wins; otherwise results annotated by
+    ``FullTextSearchFilter`` are ordered by relevance, then the view default.
+    ``ordering_fields`` may name annotations added by other filters (such
+    as a distance); they are ignored when the queryset lacks them.
+    """
+
+    def remove_invalid_fields(self, queryset, fields, view, request):
+        fields = super().remove_invalid_fields(queryset, fields, view, request)
+        model_fields = {field.name for field in queryset.model._meta.get_fields()}
+        return [
+            term
+            for term in fields
+            if term.lstrip("-").split("__")[0] in model_fields
+            or term.lstrip("-") in queryset.query.annotations
+        ]
+
+    def get_ordering(self, request, queryset, view):
+        params = request.query_params.get(self.ordering_param)
+        if params:
+            fields = [param.strip() for param in params.split(",")]
+            ordering = self.remove_invalid_fields(queryset, fields, view, request)
+            if ordering:
+                return ordering
+
+        ordering = self.get_default_ordering(view)
+        if FullTextSearchFilter.rank_annotation in queryset.query.annotations:
+            return [f"-{FullTextSearchFilter.rank_annotation}", *(ordering or [])]
+        return ordering
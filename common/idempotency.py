@@ -0,0 +1,156 @@
+# airbnb-clone-project/common/idempotency.py
+"""``Idempotency-Key`` support for POST endpoints clients may retry.
+
+Decorate a viewset action with ``@idempotent``. A request carrying an
+``Idempotency-Key`` header then runs at most once per user, path and key:
+
+* The first request runs the action. A successful response is stored in
+  an ``IdempotencyRecord`` row, in the same transaction as the action's
+  writes, and then cached in Redis.
+* Retries get the stored response back, marked with an
+  ``Idempotent-Replayed: true`` header, without running the action again.
+  Redis answers them, falling back to the table when the entry is gone.
+* A duplicate that arrives while the first request is still running waits
+  on a Redis lock for up to ``IDEMPOTENCY_WAIT`` seconds and then replays
+  the result. If the wait times out it gets a 409.
+
+Reusing a key with a different body is a client bug and gets a 422. Error
+responses are not stored, since the request made no changes, so a retry
+simply runs again. Records are kept for ``IDEMPOTENCY_KEY_TTL`` seconds
+(see common.tasks.purge_idempotency_records); after that the key can be
+used for a new request.
+"""
+
+import datetime
+import functools
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from redis.exceptions import LockError
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from common.cache import LOCK_KEY
+from common.models import IdempotencyRecord
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+RECORD_KEY = "idempotency:{key}"
+MAX_KEY_LENGTH = 255
+
+
+class IdempotencyKeyInProgress(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "A request with this Idempotency-Key is still in progress."
+    default_code = "idempotency_key_in_progress"
+
+
+class IdempotencyKeyReused(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = "This Idempotency-Key was already used for a different request."
+    default_code = "idempotency_key_reused"
+
+
+def _sha256(*parts):
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def _fingerprint(request):
+    data = request.data
+    if hasattr(data, "lists"):
+        # Form and multipart bodies
+        data = dict(data.lists())
+    body = json.dumps(data, cls=JSONEncoder, sort_keys=True)
+    return _sha256(request.method, request.path, body)
+
+
+def _load(key):
+    """The stored ``(fingerprint, status_code, body)`` for ``key``, or None."""
+    stored = cache.get(RECORD_KEY.format(key=key))
+    if stored is not None:
+        return stored
+    cutoff = timezone.now() - datetime.timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL)
+    record = (
+        IdempotencyRecord.objects.filter(key=key, created_at__gte=cutoff)
+        .values_list("fingerprint", "status_code", "body")
+        .first()
+    )
+    if record is not None:
+        # Lost from Redis (evicted or flushed): cache it again
+        _cache(key, record)
+    return record
+
+
+def _cache(key, record):
+    cache.set(RECORD_KEY.format(key=key), tuple(record), settings.IDEMPOTENCY_KEY_TTL)
+
+
+def _replay(record, fingerprint):
+    stored_fingerprint, status_code, body = record
+    if stored_fingerprint != fingerprint:
+        raise IdempotencyKeyReused()
+    return Response(body, status=status_code, headers={REPLAYED_HEADER: "true"})
+
+
+def idempotent(action):
+    """Run ``action`` at most once per ``Idempotency-Key`` (see module docs)."""
+
+    @functools.wraps(action)
+    def wrapper(self, request, *args, **kwargs):
+        client_key = request.headers.get(IDEMPOTENCY_HEADER)
+        if client_key is None:
+            return action(self, request, *args, **kwargs)
+        if not client_key or len(client_key) > MAX_KEY_LENGTH:
+            raise ValidationError(
+                {IDEMPOTENCY_HEADER: f"Must be 1 to {MAX_KEY_LENGTH} characters."}
+            )
+
+        key = _sha256(str(request.user.pk), request.path, client_key)
+        fingerprint = _fingerprint(request)
+        record = _load(key)
+        if record is not None:
+            return _replay(record, fingerprint)
+
+        lock = cache.lock(
+            LOCK_KEY.format(name=f"idempotency:{key}"),
+            timeout=settings.IDEMPOTENCY_LOCK_TIMEOUT,
+        )
+        if not lock.acquire(blocking_timeout=settings.IDEMPOTENCY_WAIT):
+            raise IdempotencyKeyInProgress()
+        try:
+            # The request we waited for may have finished meanwhile
+            record = _load(key)
+            if record is not None:
+                return _replay(record, fingerprint)
+
+            with transaction.atomic():
+                response = action(self, request, *args, **kwargs)
+                if not status.is_success(response.status_code):
+                    return response
+                # Round-trip through JSON so replays render identically
+                body = json.loads(json.dumps(response.data, cls=JSONEncoder))
+                record = (fingerprint, response.status_code, body)
+                # An expired record the hourly purge hasn't reached yet
+                IdempotencyRecord.objects.filter(key=key).delete()
+                IdempotencyRecord.objects.create(
+                    key=key,
+                    fingerprint=fingerprint,
+                    status_code=response.status_code,
+                    body=body,
+                )
+            _cache(key, record)
+            return response
+        finally:
+            try:
+                lock.release()
+            except LockError:
+                # Held past IDEMPOTENCY_LOCK_TIMEOUT; a duplicate may own it now
+                pass
+
+    return wrapper
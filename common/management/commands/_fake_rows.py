@@ -0,0 +1,33 @@
+# airbnb-clone-project/common/management/commands/_fake_rows.py
+"""Faker work for ``seed --scale``, run in worker processes.
+
+Kept free of Django imports so spawned workers can unpickle these functions
+without setting Django up. Each call seeds its own Faker instance, so the
+output depends only on the arguments, not on which worker ran it.
+"""
+
+from faker import Faker
+
+_fakers = {}
+
+
+def _faker(locale, seed):
+    fake = _fakers.get(locale)
+    if fake is None:
+        fake = _fakers[locale] = Faker(locale)
+    fake.seed_instance(seed)
+    return fake
+
+
+def fake_names(args):
+    """``(locale, seed, count)`` -> list of ``(first_name, last_name)``."""
+    locale, seed, count = args
+    fake = _faker(locale, seed)
+    return [(fake.first_name(), fake.last_name()) for _ in range(count)]
+
+
+def fake_paragraphs(args):
+    """``(locale, seed, count)`` -> list of property descriptions."""
+    locale, seed, count = args
+    fake = _faker(locale, seed)
+    return [fake.paragraph(nb_sentences=5) for _ in range(count)]
@@ -1,22 +1,67 @@
 from __future__ import annotations
 
 import random
+import secrets
 import string
 from datetime import date, timedelta
+from multiprocessing import Pool
 from typing import Iterable
 
+from django.contrib.auth.hashers import make_password
 from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
 from django.utils import timezone
 from faker import Faker
 
 from accounts.models import User
 from amenities.models import Amenity
 from bookings.models import Booking
+from common.cache import bump_generation
+from common.management.commands._fake_rows import fake_names, fake_paragraphs
 from payments.models import Payment
+from properties import search_index
 from properties.models import Property
+from properties.ratings import rebuild_rating_stats
 from reviews.models import Review
 
+CITIES = [
+    "Accra",
+    "Kumasi",
+    "Takoradi",
+    "Tamale",
+    "Cape Coast",
+    "Tema",
+    "Koforidua",
+    "Ho",
+    "Sunyani",
+    "Bolgatanga",
+]
+
+REVIEW_PHRASES = [
+    "Chale, place be nice paa!",
+    "Cool breeze and serene environment.",
+    "Very close to waakye joint, I loved it!",
+    "Host was very responsive, medaase.",
+    "Small small issues with water pressure, but overall fine.",
+    "Top top place, will come again.",
+    "Great location near the market.",
+]
+
+
+def _payment_status(booking: Booking) -> str | None:
+    """Status of the seeded payment for ``booking``, or None for no payment.
+
+    Mirrors payments.tasks.settle_payment: a succeeded charge is what
+    confirms a booking, and a pending one may have a declined attempt.
+    """
+    if booking.status == "confirmed":
+        return "succeeded"
+    if booking.status == "pending" and random.random() < 0.5:
+        return "failed"
+    return None
+
 
 class Command(BaseCommand):
     """Seed the database with Ghanaian-flavored demo data.
@@ -31,6 +76,11 @@ class Command(BaseCommand):
 
     It is safe to run multiple times; it attempts to avoid duplicates where reasonable.
     Use --wipe to clear all related data before seeding.
+
+    --scale N multiplies the user, property and booking counts by N for load
+    testing. Rows are inserted in batches (COPY on PostgreSQL, bulk_create
+    elsewhere) with primary keys allocated up front. Bookings are laid out
+    back to back per property, so they never overlap and need no validation.
     """
 
     help = "Seed the database with Ghanaian-flavored demo data."
@@ -69,6 +119,29 @@ class Command(BaseCommand):
             action="store_true",
             help="Also create reviews for completed bookings.",
         )
+        parser.add_argument(
+            "--scale",
+            type=int,
+            default=0,
+            help="Bulk mode: multiply --hosts/--guests/--properties/--bookings by N.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Rows per insert batch in --scale mode.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Processes generating Faker data in --scale mode.",
+        )
+        parser.add_argument(
+            "--no-copy",
+            action="store_true",
+            help="Use bulk_create instead of COPY on PostgreSQL in --scale mode.",
+        )
 
     @transaction.atomic
     def handle(self, *args, **options):
@@ -92,6 +165,11 @@ class Command(BaseCommand):
             self._wipe()
 
         amenities = self._seed_amenities(options["amenities"])
+        if options["scale"]:
+            self._seed_scale(options, amenities, locale=fake.locales[0])
+            self.stdout.write(self.style.SUCCESS("Seeding complete."))
+            return
+
         hosts = self._seed_users(role="host", count=options["hosts"], fake=fake)
         guests = self._seed_users(role="guest", count=options["guests"], fake=fake)
         properties = self._seed_properties(
@@ -124,6 +202,7 @@ class Command(BaseCommand):
         Amenity.objects.all().delete()
         # Keep superusers and staff accounts; wipe demo non-staff we likely created
         User.objects.filter(is_staff=False, is_superuser=False).delete()
+        search_index.mark_all_changed()
         self.stdout.write(self.style.SUCCESS("Wipe complete."))
 
     def _seed_amenities(self, target_count: int) -> list[Amenity]:
@@ -223,31 +302,19 @@ class Command(BaseCommand):
     def _seed_properties(
         self, count: int, hosts: Iterable[User], amenities: list[Amenity], fake: Faker
     ) -> list[Property]:
-        cities = [
-            "Accra",
-            "Kumasi",
-            "Takoradi",
-            "Tamale",
-            "Cape Coast",
-            "Tema",
-            "Koforidua",
-            "Ho",
-            "Sunyani",
-            "Bolgatanga",
-        ]
         props: list[Property] = []
         hosts = list(hosts) or [self._create_placeholder_host()]
 
         for _ in range(count):
             host = random.choice(hosts)
-            title = f"{random.choice(['Chic', 'Cozy', 'Modern', 'Spacious', 'Serene'])} Apartment in {random.choice(cities)}"
+            title = f"{random.choice(['Chic', 'Cozy', 'Modern', 'Spacious', 'Serene'])} Apartment in {random.choice(CITIES)}"
             prop = Property.objects.create(
                 host=host,
                 title=title,
                 description=fake.paragraph(nb_sentences=5),
                 price_per_night=round(random.uniform(150, 1500), 2),
                 bedrooms=random.randint(1, 5),
-                city=random.choice(cities),
+                city=random.choice(CITIES),
                 country="Ghana",
             )
             # Add some random amenities
@@ -335,9 +402,8 @@ class Command(BaseCommand):
     def _seed_payments(self, bookings: Iterable[Booking]):
         created = 0
         for b in bookings:
-            if b.status != "confirmed":
-                continue
-            if hasattr(b, "payment"):
+            status = _payment_status(b)
+            if status is None or b.payments.exists():
                 continue
             txn = f"TXN-{timezone.now().strftime('%Y%m%d%H%M%S')}-{random.randint(1000, 9999)}"
             Payment.objects.create(
@@ -345,7 +411,7 @@ class Command(BaseCommand):
                 amount=b.total_price,
                 payment_method=random.choice(["momo", "card"]),
                 transaction_id=txn,
-                status=random.choice(["succeeded", "failed"]),
+                status=status,
             )
             created += 1
         self.stdout.write(self.style.SUCCESS(f"Payments created: {created}"))
@@ -353,15 +419,6 @@ class Command(BaseCommand):
     def _seed_reviews(self, bookings: Iterable[Booking], fake: Faker):
         created = 0
         today = date.today()
-        gh_phrases = [
-            "Chale, place be nice paa!",
-            "Cool breeze and serene environment.",
-            "Very close to waakye joint, I loved it!",
-            "Host was very responsive, medaase.",
-            "Small small issues with water pressure, but overall fine.",
-            "Top top place, will come again.",
-            "Great location near the market.",
-        ]
         for b in bookings:
             # Only for completed stays, ensure author is the guest
             if b.check_out_date >= today:
@@ -373,7 +430,241 @@ class Command(BaseCommand):
                 booking=b,
                 author=b.guest,
                 rating=rating,
-                comment=random.choice(gh_phrases),
+                comment=random.choice(REVIEW_PHRASES),
             )
             created += 1
         self.stdout.write(self.style.SUCCESS(f"Reviews created: {created}"))
+
+    # ---- bulk (--scale) helpers ----
+
+    def _seed_scale(self, options, amenities: list[Amenity], locale: str):
+        scale = options["scale"]
+        self.batch_size = options["batch_size"]
+        self.use_copy = connection.vendor == "postgresql" and not options["no_copy"]
+        # Keeps emails and transaction ids unique across runs
+        self.run_tag = secrets.token_hex(3)
+        self.locale = locale
+        workers = options["workers"]
+
+        pool = Pool(workers) if workers > 1 else None
+        self.imap = pool.imap if pool else map
+        try:
+            hosts = self._bulk_users("host", options["hosts"] * scale)
+            guests = self._bulk_users("guest", options["guests"] * scale)
+            self._bulk_properties(
+                count=options["properties"] * scale,
+                bookings=options["bookings"] * scale,
+                hosts=hosts,
+                guests=guests,
+                amenity_ids=[a.pk for a in amenities],
+                payments=options["payments"],
+                reviews=options["reviews"],
+            )
+        finally:
+            if pool:
+                pool.close()
+                pool.join()
+
+        # Explicit primary keys leave the PostgreSQL sequences behind
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(
+                no_style(), [User, Property, Booking, Payment, Review]
+            ):
+                cursor.execute(sql)
+        # Bulk inserts skip the signals that maintain rating aggregates and
+        # invalidate cached responses
+        if options["reviews"]:
+            rebuild_rating_stats(batch_size=self.batch_size)
+        bump_generation("properties", "amenities", "bookings")
+        # Nor record index changes: built indexes would miss the new rows
+        search_index.mark_all_changed()
+
+    def _allocate_ids(self, model, count: int) -> range:
+        start = (model.objects.aggregate(last=Max("pk"))["last"] or 0) + 1
+        return range(start, start + count)
+
+    def _batches(self, ids: range):
+        for offset in range(0, len(ids), self.batch_size):
+            yield ids[offset : offset + self.batch_size]
+
+    def _fake(self, func, batches):
+        """Run a _fake_rows generator per batch, in worker processes if enabled."""
+        return self.imap(
+            func, [(self.locale, batch.start, len(batch)) for batch in batches]
+        )
+
+    def _insert(self, model, objs: list):
+        if not objs:
+            return
+        if not self.use_copy:
+            model.objects.bulk_create(objs, batch_size=self.batch_size)
+            return
+        # Let the database number rows that carry no primary key (m2m links)
+        fields = [
+            f
+            for f in model._meta.concrete_fields
+            if not (f.primary_key and objs[0].pk is None)
+        ]
+        quote = connection.ops.quote_name
+        sql = "COPY {} ({}) FROM STDIN".format(
+            quote(model._meta.db_table), ", ".join(quote(f.column) for f in fields)
+        )
+        # psycopg adapts the Python values itself; only the auto_now(_add)
+        # timestamps that Field.pre_save() would fill in need computing
+        now = timezone.now()
+        stamped = {
+            f.attname
+            for f in fields
+            if getattr(f, "auto_now", False) or getattr(f, "auto_now_add", False)
+        }
+        attnames = [f.attname for f in fields]
+        with connection.cursor() as cursor, cursor.copy(sql) as copy:
+            for obj in objs:
+                copy.write_row(
+                    [
+                        now if name in stamped else getattr(obj, name)
+                        for name in attnames
+                    ]
+                )
+
+    def _bulk_users(self, role: str, count: int) -> range:
+        ids = self._allocate_ids(User, count)
+        # Hashing per user would dominate the run; all share the dev password
+        password = make_password("Password123!")
+        batches = list(self._batches(ids))
+        for batch, names in zip(batches, self._fake(fake_names, batches)):
+            self._insert(
+                User,
+                [
+                    User(
+                        pk=pk,
+                        email=f"{role}.{pk}.{self.run_tag}@example.com",
+                        first_name=first,
+                        last_name=last,
+                        user_type=role,
+                        phone_number=self._random_ghana_phone(),
+                        is_active=True,
+                        password=password,
+                    )
+                    for pk, (first, last) in zip(batch, names)
+                ],
+            )
+        self.stdout.write(self.style.SUCCESS(f"Users created for role={role}: {count}"))
+        return ids
+
+    def _bulk_properties(
+        self,
+        count: int,
+        bookings: int,
+        hosts: range | list[int],
+        guests: range,
+        amenity_ids: list[int],
+        payments: bool,
+        reviews: bool,
+    ):
+        if not hosts:
+            hosts = [self._create_placeholder_host().pk]
+        ids = self._allocate_ids(Property, count)
+        booking_ids = iter(self._allocate_ids(Booking, bookings if guests else 0))
+        per_property, extra = divmod(bookings, count) if count and guests else (0, 0)
+        Link = Property.amenities.through
+        created = {"bookings": 0, "payments": 0, "reviews": 0}
+
+        batches = list(self._batches(ids))
+        for batch, descriptions in zip(batches, self._fake(fake_paragraphs, batches)):
+            props, links, stays = [], [], []
+            for pk, description in zip(batch, descriptions):
+                props.append(
+                    Property(
+                        pk=pk,
+                        host_id=random.choice(hosts),
+                        title=f"{random.choice(['Chic', 'Cozy', 'Modern', 'Spacious', 'Serene'])} Apartment in {random.choice(CITIES)}",
+                        description=description,
+                        price_per_night=round(random.uniform(150, 1500), 2),
+                        bedrooms=random.randint(1, 5),
+                        city=random.choice(CITIES),
+                        country="Ghana",
+                    )
+                )
+                if amenity_ids:
+                    links.extend(
+                        Link(property_id=pk, amenity_id=amenity_id)
+                        for amenity_id in random.sample(
+                            amenity_ids, k=random.randint(2, min(7, len(amenity_ids)))
+                        )
+                    )
+                # Spread the remainder over the first properties
+                stay_count = per_property + (1 if pk - ids.start < extra else 0)
+                stays.extend(
+                    self._bulk_stays(props[-1], stay_count, booking_ids, guests)
+                )
+
+            self._insert(Property, props)
+            self._insert(Link, links)
+            self._insert(Booking, stays)
+            created["bookings"] += len(stays)
+            if payments:
+                rows = self._bulk_payments(stays)
+                self._insert(Payment, rows)
+                created["payments"] += len(rows)
+            if reviews:
+                rows = self._bulk_reviews(stays)
+                self._insert(Review, rows)
+                created["reviews"] += len(rows)
+
+        self.stdout.write(self.style.SUCCESS(f"Properties created: {count}"))
+        for label, total in created.items():
+            self.stdout.write(
+                self.style.SUCCESS(f"{label.capitalize()} created: {total}")
+            )
+
+    def _bulk_stays(self, prop: Property, count: int, booking_ids, guests: range):
+        """Back-to-back stays at one property; overlap-free by construction."""
+        stays = []
+        cursor = date.today() - timedelta(days=random.randint(0, 365))
+        for _ in range(count):
+            check_in = cursor + timedelta(days=random.randint(0, 14))
+            nights = random.randint(1, 10)
+            cursor = check_in + timedelta(days=nights)
+            stays.append(
+                Booking(
+                    pk=next(booking_ids),
+                    property_id=prop.pk,
+                    guest_id=random.choice(guests),
+                    check_in_date=check_in,
+                    check_out_date=cursor,
+                    # New properties have no pricing rules, so this matches
+                    # bookings.pricing
+                    total_price=prop.price_per_night * nights,
+                    status=random.choices(
+                        ["pending", "confirmed", "cancelled"], weights=[0.2, 0.7, 0.1]
+                    )[0],
+                )
+            )
+        return stays
+
+    def _bulk_payments(self, stays: list[Booking]) -> list[Payment]:
+        return [
+            Payment(
+                booking_id=b.pk,
+                amount=b.total_price,
+                payment_method=random.choice(["momo", "card"]),
+                transaction_id=f"SEED-{self.run_tag}-{b.pk}",
+                status=status,
+            )
+            for b in stays
+            if (status := _payment_status(b)) is not None
+        ]
+
+    def _bulk_reviews(self, stays: list[Booking]) -> list[Review]:
+        today = date.today()
+        return [
+            Review(
+                booking_id=b.pk,
+                author_id=b.guest_id,
+                rating=random.randint(3, 5),
+                comment=random.choice(REVIEW_PHRASES),
+            )
+            for b in stays
+            if b.status == "confirmed" and b.check_out_date < today
+        ]
@@ -1,3 +1,22 @@
+# airbnb-clone-project/common/models.py
+
 from django.db import models
 
-# Create your models here.
+
+class IdempotencyRecord(models.Model):
+    """A response kept for replay under its ``Idempotency-Key``.
+
+    The durable copy of what common.idempotency caches in Redis; written in
+    the same transaction as the request's own changes.
+    """
+
+    # sha256 of the user, the path and the client's key
+    key = models.CharField(max_length=64, unique=True)
+    # sha256 of the method, path and body the key was first used with
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField()
+    body = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self) -> str:
+        return f"Idempotency key {self.key[:12]} ({self.status_code})"
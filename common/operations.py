@@ -0,0 +1,19 @@
+# airbnb-clone-project/common/operations.py
+
+from django.db import migrations
+
+
+class RunPostgresSQL(migrations.RunSQL):
+    """RunSQL that only executes on PostgreSQL.
+
+    Used for features SQLite has no equivalent for (GIN indexes, triggers,
+    exclusion constraints) so local development on SQLite still migrates.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
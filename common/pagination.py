@@ -0,0 +1,315 @@
+# airbnb-clone-project/common/pagination.py
+
+import base64
+import binascii
+import datetime
+import decimal
+import hashlib
+import json
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.paginator import InvalidPage, PageNotAnInteger
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def _encode_value(value):
+    """Make an ordering value JSON safe without losing precision."""
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    return value
+
+
+class KeysetPagination(BasePagination):
+    """Keyset (seek) pagination over whatever ordering the view applied.
+
+    The cursor stores the ordering values of the boundary row, and the next
+    page is fetched with ``WHERE (a, b, id) > (...)`` style predicates instead
+    of ``OFFSET``, so deep pages cost the same as the first one and no
+    ``COUNT(*)`` is issued. The primary key is appended as a tiebreaker so
+    rows sharing e.g. ``created_at`` are never skipped or repeated.
+
+    Ordering fields must be non-nullable model fields or annotations. Pages
+    of ``values()`` dicts work too, provided the ordering columns are selected.
+    """
+
+    cursor_query_param = "cursor"
+    cursor_query_description = _("The pagination cursor value.")
+    page_size = api_settings.PAGE_SIZE
+    invalid_cursor_message = _("Invalid cursor")
+    tiebreaker = "pk"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = remove_query_param(request.build_absolute_uri(), "page")
+        self.ordering = self.get_ordering(queryset)
+        self.pk_name = queryset.model._meta.pk.attname
+
+        values, reverse = self.decode_cursor(request)
+        if values is not None:
+            queryset = queryset.filter(self.build_seek_filter(values, reverse))
+        ordering = self.ordering
+        if reverse:
+            ordering = [self._invert(field) for field in ordering]
+        results = list(queryset.order_by(*ordering)[: self.page_size + 1])
+
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = values is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, values is not None
+
+        self.page = results
+        return results
+
+    def get_ordering(self, queryset):
+        """Ordering applied by the filter backends, plus the pk tiebreaker."""
+        ordering = list(queryset.query.order_by) or list(queryset.model._meta.ordering)
+        if not ordering or not all(isinstance(field, str) for field in ordering):
+            raise ImproperlyConfigured(
+                f"{self.__class__.__name__} requires a field-name ordering on "
+                f"{queryset.model.__name__}."
+            )
+        if not any(field.lstrip("-") in ("pk", "id") for field in ordering):
+            ordering.append(
+                f"-{self.tiebreaker}"
+                if ordering[-1].startswith("-")
+                else self.tiebreaker
+            )
+        return ordering
+
+    def build_seek_filter(self, values, reverse):
+        """Lexicographic "row after the boundary" predicate for the ordering."""
+        if len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        seek = Q()
+        equal = {}
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip("-")
+            descending = field.startswith("-") != reverse
+            seek |= Q(**equal, **{f"{name}__{'lt' if descending else 'gt'}": value})
+            equal[name] = value
+
+        # Repeat the leading column as a plain range so the index can seek to it
+        leading = self.ordering[0]
+        descending = leading.startswith("-") != reverse
+        bound = Q(
+            **{f"{leading.lstrip('-')}__{'lte' if descending else 'gte'}": values[0]}
+        )
+        return bound & seek
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+            return list(payload["v"]), bool(payload.get("r", False))
+        except (TypeError, ValueError, KeyError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message) from None
+
+    def encode_cursor(self, instance, reverse):
+        values = [
+            _encode_value(self._get_value(instance, field)) for field in self.ordering
+        ]
+        payload = json.dumps({"v": values, "r": reverse}, separators=(",", ":"))
+        encoded = base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": str(self.cursor_query_description),
+                "schema": {"type": "string"},
+            }
+        ]
+
+    @staticmethod
+    def _invert(field):
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    def _get_value(self, instance, field):
+        if isinstance(instance, dict):
+            # values() rows, as served by common.views.ValuesListMixin
+            name = field.lstrip("-")
+            return instance[self.pk_name if name == "pk" else name]
+        value = instance
+        for attr in field.lstrip("-").split("__"):
+            value = getattr(value, attr)
+        return value
+
+
+class HybridPagination(PageNumberPagination):
+    """Page-number pagination with opt-in keyset mode.
+
+    Requests carrying ``?cursor=`` (an empty value starts at the first page)
+    are served by ``KeysetPagination``: no OFFSET scans and no COUNT(*).
+    Everything else keeps the page-number format with ``count`` for clients
+    that need totals.
+    """
+
+    cursor_class = KeysetPagination
+    cursor_paginator = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_class.cursor_query_param in request.query_params:
+            self.cursor_paginator = self.cursor_class()
+            return self.cursor_paginator.paginate_queryset(queryset, request, view)
+        self.cursor_paginator = None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(
+            view
+        ) + self.cursor_class().get_schema_operation_parameters(view)
+
+
+COUNT_KEY = "count:{digest}"
+
+
+def estimated_row_count(model, using="default"):
+    """Planner estimate of ``model``'s table size, or None if unavailable.
+
+    Reads ``pg_class.reltuples`` (kept current by autovacuum/ANALYZE), so it
+    costs one catalog lookup whatever the table size. Always None outside
+    PostgreSQL and for tables that were never analyzed.
+    """
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [connection.ops.quote_name(model._meta.db_table)],
+        )
+        row = cursor.fetchone()
+    if row is None or row[0] < 0:
+        return None
+    return row[0]
+
+
+class EstimatedCountPaginator(DjangoPaginator):
+    """Paginator whose ``count`` avoids exact ``COUNT(*)`` where it can.
+
+    Unfiltered querysets over tables the planner estimates at more than
+    ``PAGINATION_ESTIMATE_THRESHOLD`` rows report that estimate (and set
+    ``count_estimated``). Other counts are exact but cached in Redis for
+    ``PAGINATION_COUNT_CACHE_TIMEOUT`` seconds, keyed by the count SQL, so a
+    client paging through a filtered list pays for one ``COUNT(*)``.
+    """
+
+    count_estimated = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.has_filters():
+            estimate = estimated_row_count(queryset.model, queryset.db)
+            if (
+                estimate is not None
+                and estimate > settings.PAGINATION_ESTIMATE_THRESHOLD
+            ):
+                self.count_estimated = True
+                return estimate
+
+        sql, params = queryset.order_by().query.sql_with_params()
+        raw = repr((queryset.db, sql, params))
+        key = COUNT_KEY.format(digest=hashlib.sha256(raw.encode("utf-8")).hexdigest())
+        count = cache.get(key)
+        if count is None:
+            count = queryset.count()
+            cache.set(key, count, settings.PAGINATION_COUNT_CACHE_TIMEOUT)
+        return count
+
+    def validate_number(self, number):
+        # Evaluating count is what sets count_estimated
+        if not (self.count and self.count_estimated):
+            return super().validate_number(number)
+        # The estimate may be low: let clients page past it (pages beyond
+        # the real end are simply empty)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages["invalid_page"]) from None
+        if number < 1:
+            raise InvalidPage(self.error_messages["min_page"])
+        return number
+
+
+class EstimatedCountPagination(HybridPagination):
+    """``HybridPagination`` for large tables, using ``EstimatedCountPaginator``.
+
+    Page-number responses gain ``count_estimated``, true when ``count`` is
+    the planner's estimate rather than an exact count.
+    """
+
+    django_paginator_class = EstimatedCountPaginator
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        paginator = self.page.paginator
+        return Response(
+            OrderedDict(
+                [
+                    ("count", paginator.count),
+                    ("count_estimated", paginator.count_estimated),
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count_estimated"] = {
+            "type": "boolean",
+            "example": False,
+        }
+        return response_schema
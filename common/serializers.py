@@ -0,0 +1,309 @@
+# airbnb-clone-project/common/serializers.py
+"""Serializer helpers shared by the API apps.
+
+``FieldsetMixin`` adds ``?fields=`` sparse fieldsets and ``?include=``
+embedding of related objects to a ``ModelSerializer``, together with the
+queryset tuning (``only()``, ``select_related()``, ``prefetch_related()``)
+that keeps the query count per page constant.
+
+A ``ModelSerializer`` list builds a model instance per row (plus the related
+objects pulled in by ``select_related``/``prefetch_related``) and then walks
+every field's ``get_attribute``/``to_representation`` for it. On list pages
+that overhead outweighs the SQL. ``ValuesSerializer`` reproduces a
+``ModelSerializer``'s output from plain ``values()`` dicts instead: the field
+plan is derived once from the serializer class, and only fields whose JSON
+form differs from the database value (dates, decimals, ...) are converted.
+"""
+
+import functools
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+from common.fields import BulkManyRelatedField
+
+# Fields whose to_representation returns database values unchanged
+PASSTHROUGH_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.IntegerField,
+    serializers.PrimaryKeyRelatedField,
+)
+
+
+def _passthrough(value):
+    return value
+
+
+def _is_many(field):
+    return field.many_to_many or field.one_to_many
+
+
+def _split(param):
+    return list(dict.fromkeys(name for name in (param or "").split(",") if name))
+
+
+class FieldsetMixin:
+    """``?fields=`` and ``?include=`` for a top-level ``ModelSerializer``.
+
+    ``?fields=id,title`` renders only the named fields. ``?include=host``
+    replaces the ``host`` primary key (or list of keys) with the related
+    object rendered by ``expandable_fields["host"]``, and implies the field
+    is wanted. Both only apply to read requests; writes always see every
+    field.
+
+    ``get_fieldset_queryset`` trims a queryset to match (see
+    common.views.FieldsetQuerysetMixin). Fields that are not model fields,
+    such as method fields, declare the columns they read in
+    ``fieldset_columns``; requesting one that doesn't leaves the columns
+    alone.
+    """
+
+    fields_query_param = "fields"
+    include_query_param = "include"
+    # field name -> serializer class rendering the related object(s)
+    expandable_fields = {}
+    # field name -> model columns it reads, for fields without a source column
+    fieldset_columns = {}
+
+    @classmethod
+    def get_fieldset(cls, request):
+        """``(fields, include)`` asked for by ``request``; ``fields`` None means all.
+
+        Raises ``ValidationError`` for names the serializer can't render.
+        """
+        if request is None or request.method not in SAFE_METHODS:
+            return None, []
+        fields = _split(request.query_params.get(cls.fields_query_param))
+        include = _split(request.query_params.get(cls.include_query_param))
+
+        errors = {}
+        readable = cls._readable_sources()
+        unknown = [name for name in fields if name not in readable]
+        if unknown:
+            errors[cls.fields_query_param] = [
+                f"Unknown field(s): {', '.join(unknown)}."
+            ]
+        unknown = [name for name in include if name not in cls.expandable_fields]
+        if unknown:
+            errors[cls.include_query_param] = [
+                f"Cannot include: {', '.join(unknown)}. Choose from: "
+                f"{', '.join(cls.expandable_fields) or 'nothing'}."
+            ]
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        if fields:
+            fields = list(dict.fromkeys(fields + include))
+        return fields or None, include
+
+    @classmethod
+    def get_fieldset_queryset(cls, queryset, request):
+        """``queryset`` loading just what the requested fieldset renders."""
+        fields, include = cls.get_fieldset(request)
+        model = queryset.model
+        sources = cls._readable_sources()
+        if fields is not None:
+            loads = cls._fieldset_loads(model, fields)
+            if loads is not None:
+                columns, many = loads
+                # Drop the view's own joins; embedded relations are re-added below
+                queryset = (
+                    queryset.select_related(None)
+                    .prefetch_related(None)
+                    .only(*columns)
+                    .prefetch_related(*many)
+                )
+        for name in include:
+            field = model._meta.get_field(sources[name])
+            if _is_many(field):
+                queryset = queryset.prefetch_related(field.name)
+            else:
+                queryset = queryset.select_related(field.name)
+        return queryset
+
+    @classmethod
+    @functools.cache
+    def _readable_sources(cls):
+        """Source attribute of every readable field, by field name."""
+        return {
+            name: field.source
+            for name, field in cls().fields.items()
+            if not field.write_only
+        }
+
+    @classmethod
+    def _fieldset_loads(cls, model, fields):
+        """``(only() columns, prefetch lookups)`` behind ``fields``.
+
+        None when a field reads something other than known model fields.
+        """
+        sources = cls._readable_sources()
+        columns = [model._meta.pk.name]
+        many = []
+        for name in fields:
+            if name in cls.fieldset_columns:
+                columns.extend(cls.fieldset_columns[name])
+                continue
+            try:
+                field = model._meta.get_field(sources[name])
+            except FieldDoesNotExist:
+                return None
+            (many if _is_many(field) else columns).append(field.name)
+        return list(dict.fromkeys(columns)), many
+
+    def get_fields(self):
+        fields = super().get_fields()
+        # Nested serializers render in full
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        if parent is not None:
+            return fields
+
+        wanted, include = self.get_fieldset(self.context.get("request"))
+        opts = self.Meta.model._meta
+        for name in include:
+            source = fields[name].source or name
+            fields[name] = self.expandable_fields[name](
+                source=None if source == name else source,
+                many=_is_many(opts.get_field(source)),
+                read_only=True,
+            )
+        if wanted is not None:
+            fields = {name: field for name, field in fields.items() if name in wanted}
+        return fields
+
+
+class BulkCreateListSerializer(serializers.ListSerializer):
+    """``many=True`` create that validates and inserts the items in bulk.
+
+    Every item's related ids (``BulkManyRelatedField``) are resolved with one
+    query per field before the items are validated, and errors come back as
+    DRF's usual per-item list. ``create`` inserts the rows with one
+    ``bulk_create`` and the many-to-many links with one more per relation.
+    Model ``save()`` and its signals are skipped; callers invalidate caches.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            for name, field in self.child.fields.items():
+                if isinstance(field, BulkManyRelatedField) and not field.read_only:
+                    field.preload(
+                        item.get(name) for item in data if isinstance(item, dict)
+                    )
+        return super().to_internal_value(data)
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        opts = model._meta
+        instances, links = [], []
+        for attrs in validated_data:
+            attrs = dict(attrs)
+            links.append(
+                {
+                    name: attrs.pop(name)
+                    for name in list(attrs)
+                    if opts.get_field(name).many_to_many
+                }
+            )
+            instances.append(model(**attrs))
+        instances = model.objects.bulk_create(instances)
+
+        for field in opts.many_to_many:
+            through = field.remote_field.through
+            source, target = field.m2m_field_name(), field.m2m_reverse_field_name()
+            through.objects.bulk_create(
+                through(**{f"{source}_id": instance.pk, f"{target}_id": pk})
+                for instance, related in zip(instances, links)
+                for pk in dict.fromkeys(obj.pk for obj in related.get(field.name, ()))
+            )
+        return instances
+
+
+class ValuesSerializer:
+    """Render ``values()`` rows exactly like ``serializer_class`` renders instances.
+
+    Subclasses name the ``serializer_class`` to mirror. Readable fields backed
+    by a model column are planned automatically; anything else (many-related
+    fields, ``SerializerMethodField``...) must be listed in ``computed_fields``
+    and filled in by ``fill()``, which sees the whole page at once so related
+    data can be fetched with one query. ``extra_columns`` are fetched for
+    ``fill()`` without being rendered.
+
+    ``fields`` restricts the output to a sparse fieldset (see
+    ``FieldsetMixin``); ``fill()`` should skip work for computed fields not in
+    ``field_names``.
+    """
+
+    serializer_class = None
+    computed_fields = ()
+    extra_columns = ()
+
+    def __init__(self, fields=None):
+        self.plan = [
+            step for step in self.get_plan() if fields is None or step[0] in fields
+        ]
+        self.field_names = {key for key, _, _ in self.plan}
+        self.columns = list(
+            dict.fromkeys(
+                [column for _, column, _ in self.plan if column is not None]
+                + list(self.extra_columns)
+            )
+        )
+
+    @classmethod
+    @functools.cache
+    def get_plan(cls):
+        """``(key, column, converter)`` per rendered field, in serializer order."""
+        model = cls.serializer_class.Meta.model
+        plan = []
+        for name, field in cls.serializer_class().fields.items():
+            if field.write_only:
+                continue
+            if name in cls.computed_fields:
+                plan.append((name, None, None))
+                continue
+            if isinstance(field, serializers.ManyRelatedField) or field.source == "*":
+                raise ImproperlyConfigured(
+                    f"{cls.__name__} cannot read {name!r} from a column; "
+                    "add it to computed_fields."
+                )
+            column = field.source
+            if isinstance(field, serializers.PrimaryKeyRelatedField):
+                column = model._meta.get_field(field.source).attname
+            converter = (
+                _passthrough
+                if isinstance(field, PASSTHROUGH_FIELDS)
+                else field.to_representation
+            )
+            plan.append((name, column, converter))
+        return plan
+
+    def render(self, rows):
+        """Serialized dicts for ``rows``, a list or queryset of ``values()`` dicts."""
+        rows = list(rows)
+        data = []
+        for row in rows:
+            item = {}
+            for key, column, converter in self.plan:
+                if column is None:
+                    item[key] = None
+                else:
+                    value = row[column]
+                    item[key] = None if value is None else converter(value)
+            data.append(item)
+        if rows:
+            self.fill(rows, data)
+        return data
+
+    def fill(self, rows, data):
+        """Set ``computed_fields`` on ``data``, the rendered counterpart of ``rows``."""
+
+
+class RoleQuerySerializer(serializers.Serializer):
+    """Validate the ?role= of lists scoped by ``common.views.UserScopedMixin``."""
+
+    role = serializers.ChoiceField(choices=["guest", "host"], required=False)
@@ -0,0 +1,25 @@
+# airbnb-clone-project/common/tasks.py
+"""Periodic housekeeping scheduled by airbnb_clone.celery's beat schedule."""
+
+import datetime
+import logging
+
+from celery import shared_task
+from django.conf import settings
+from django.utils import timezone
+
+from common.models import IdempotencyRecord
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def purge_idempotency_records():
+    """Delete stored responses older than ``IDEMPOTENCY_KEY_TTL``.
+
+    Returns the number deleted.
+    """
+    cutoff = timezone.now() - datetime.timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL)
+    deleted, _ = IdempotencyRecord.objects.filter(created_at__lt=cutoff).delete()
+    logger.info("Purged %d idempotency records", deleted)
+    return deleted
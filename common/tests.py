@@ -1,3 +1,317 @@
-from django.test import TestCase
+# airbnb-clone-project/common/tests.py
 
-# Create your tests here.
+
+import datetime as dt
+import io
+import threading
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from bookings.models import Booking
+from common.models import IdempotencyRecord
+from common.pagination import KeysetPagination, estimated_row_count
+from common.tasks import purge_idempotency_records
+from payments.models import Payment
+from properties import search_index
+from properties.models import Property
+from reviews.models import Review
+from tests.factories import (
+    AmenityFactory,
+    BookingFactory,
+    PropertyFactory,
+    ReviewFactory,
+    UserFactory,
+)
+
+
+def _walk(paginator_class, queryset, query="?cursor="):
+    """Follow next links from the first page, returning each page's ids."""
+    factory = APIRequestFactory()
+    pages = []
+    url = f"/api/v1/properties/{query}"
+    while url:
+        paginator = paginator_class()
+        request = Request(factory.get(url))
+        page = paginator.paginate_queryset(queryset, request)
+        pages.append([obj.id for obj in page])
+        url = paginator.get_next_link()
+    return pages, paginator
+
+
+@pytest.mark.django_db
+def test_keyset_pagination_breaks_ties_on_id():
+    wifi = AmenityFactory(name="WiFi")
+    props = [PropertyFactory(amenities=[wifi]) for _ in range(5)]
+    # Identical created_at values would break a created_at-only cursor
+    same_time = timezone.now() - dt.timedelta(days=1)
+    Property.objects.filter(id__in=[p.id for p in props[1:4]]).update(
+        created_at=same_time
+    )
+
+    class TwoPerPage(KeysetPagination):
+        page_size = 2
+
+    queryset = Property.objects.order_by("-created_at")
+    pages, last = _walk(TwoPerPage, queryset)
+
+    expected = list(
+        Property.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+    )
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert [pk for page in pages for pk in page] == expected
+    assert last.get_next_link() is None
+
+    # Walking backwards from the last page returns the previous page
+    factory = APIRequestFactory()
+    paginator = TwoPerPage()
+    previous_url = last.get_previous_link()
+    page = paginator.paginate_queryset(queryset, Request(factory.get(previous_url)))
+    assert [obj.id for obj in page] == pages[1]
+
+
+@pytest.mark.django_db
+def test_cursor_param_opts_into_keyset_mode():
+    user = UserFactory(user_type="host")
+    for i in range(3):
+        AmenityFactory(name=f"Amenity {chr(ord('A') + i)}")
+
+    client = APIClient()
+    client.force_authenticate(user)
+
+    resp = client.get("/api/v1/amenities/")
+    assert resp.status_code == 200
+    assert resp.data["count"] == 3
+
+    resp = client.get("/api/v1/amenities/", {"cursor": ""})
+    assert resp.status_code == 200
+    assert "count" not in resp.data
+    assert [a["name"] for a in resp.data["results"]] == [
+        "Amenity A",
+        "Amenity B",
+        "Amenity C",
+    ]
+    assert resp.data["next"] is None and resp.data["previous"] is None
+
+    resp = client.get("/api/v1/amenities/", {"cursor": "not-a-cursor"})
+    assert resp.status_code == 404
+
+
+@pytest.mark.django_db
+def test_cache_stats_report_hits_and_misses():
+    client = APIClient()
+    client.get("/api/v1/properties/")
+    client.get("/api/v1/properties/")
+
+    admin = UserFactory(is_staff=True)
+    client.force_authenticate(admin)
+    resp = client.get("/api/v1/cache/stats/")
+    assert resp.status_code == 200
+    assert resp.data["properties"] == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+
+    client.force_authenticate(UserFactory())
+    assert client.get("/api/v1/cache/stats/").status_code == 403
+
+
+@pytest.mark.django_db
+def test_seed_scale_mode_bulk_inserts_non_overlapping_bookings(settings):
+    settings.PROPERTY_INDEX_ENABLED = True
+    assert len(search_index.get_index()) == 0
+    call_command(
+        "seed",
+        scale=2,
+        amenities=5,
+        hosts=2,
+        guests=3,
+        properties=3,
+        bookings=20,
+        payments=True,
+        reviews=True,
+        batch_size=4,
+        stdout=io.StringIO(),
+    )
+
+    assert Property.objects.count() == 6
+    assert Booking.objects.count() == 40
+    # Confirmed stays were paid; pending ones at most have a declined attempt
+    confirmed = Booking.objects.filter(status="confirmed")
+    assert Payment.objects.filter(status="succeeded").count() == confirmed.count()
+    assert not Payment.objects.exclude(booking__status="confirmed").exclude(
+        booking__status="pending", status="failed"
+    )
+    assert Review.objects.exists()
+    for prop in Property.objects.all():
+        stays = list(
+            prop.bookings.order_by("check_in_date").values_list(
+                "check_in_date", "check_out_date"
+            )
+        )
+        assert all(prev[1] <= nxt[0] for prev, nxt in zip(stays, stays[1:]))
+        assert 2 <= prop.amenities.count() <= 5
+
+    # Sequences were moved past the explicit primary keys
+    assert PropertyFactory(amenities=[AmenityFactory()]).pk > max(
+        Property.objects.exclude(title__startswith="Stylish").values_list(
+            "pk", flat=True
+        )
+    )
+
+    # Bulk inserts skip the signals, reviews or not; built indexes still
+    # pick the new rows up
+    assert len(search_index.get_index()) == 7
+    call_command(
+        "seed", scale=1, amenities=5, properties=2, bookings=0, stdout=io.StringIO()
+    )
+    assert len(search_index.get_index()) == 9
+
+
+@pytest.mark.django_db
+def test_large_unfiltered_lists_report_estimated_counts(settings):
+    wifi = AmenityFactory(name="WiFi")
+    prop = PropertyFactory(amenities=[wifi])
+    guest = UserFactory(user_type="guest")
+    for week in range(3):
+        ReviewFactory(
+            booking=BookingFactory(
+                property=prop,
+                guest=guest,
+                check_in_date=dt.date(2025, 3, 1) + dt.timedelta(weeks=week),
+                check_out_date=dt.date(2025, 3, 3) + dt.timedelta(weeks=week),
+            ),
+            rating=5 if week else 4,
+        )
+    client = APIClient()
+    client.force_authenticate(guest)
+
+    # Filtered counts are exact, and cached briefly
+    resp = client.get("/api/v1/reviews/", {"rating": 5})
+    assert (resp.data["count"], resp.data["count_estimated"]) == (2, False)
+    Review.objects.filter(rating=4).update(rating=5)
+    assert client.get("/api/v1/reviews/", {"rating": 5}).data["count"] == 2
+
+    if connection.vendor != "postgresql":
+        assert estimated_row_count(Review) is None
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE reviews_review")
+    settings.PAGINATION_ESTIMATE_THRESHOLD = 2
+    resp = client.get("/api/v1/reviews/")
+    assert (resp.data["count"], resp.data["count_estimated"]) == (3, True)
+    # Pages past the estimate are empty rather than 404
+    assert client.get("/api/v1/reviews/", {"page": 5}).data["results"] == []
+
+    settings.PAGINATION_ESTIMATE_THRESHOLD = 3
+    assert client.get("/api/v1/reviews/").data["count_estimated"] is False
+
+
+@pytest.mark.django_db
+def test_idempotency_key_replays_the_first_response(settings):
+    prop = PropertyFactory(amenities=[AmenityFactory(name="WiFi")])
+    guest = UserFactory(user_type="guest")
+    client = APIClient()
+    client.force_authenticate(guest)
+    stay = {
+        "property": prop.id,
+        "check_in_date": "2026-04-01",
+        "check_out_date": "2026-04-03",
+    }
+
+    def post(url, payload, key):
+        return client.post(url, payload, format="json", HTTP_IDEMPOTENCY_KEY=key)
+
+    first = post("/api/v1/bookings/", stay, "booking-1")
+    assert first.status_code == 201, first.data
+    retry = post("/api/v1/bookings/", stay, "booking-1")
+    assert (retry.status_code, retry.json()) == (201, first.json())
+    assert retry["Idempotent-Replayed"] == "true"
+    assert Booking.objects.count() == 1
+    # Same key, different request
+    resp = post(
+        "/api/v1/bookings/", {**stay, "check_out_date": "2026-04-04"}, "booking-1"
+    )
+    assert resp.status_code == 422
+
+    payment = {
+        "booking": first.data["id"],
+        "amount": first.data["total_price"],
+        "payment_method": "momo",
+        "transaction_id": "MTN-0042",
+        "status": "succeeded",
+    }
+    # Errors are not stored: a corrected retry runs
+    resp = post("/api/v1/payments/", {**payment, "payment_method": "cash"}, "pay-1")
+    assert resp.status_code == 400
+    paid = post("/api/v1/payments/", payment, "pay-1")
+    assert paid.status_code == 202, paid.data
+
+    # Redis lost the entry: the table still answers, without a second write
+    cache.clear()
+    retry = post("/api/v1/payments/", payment, "pay-1")
+    assert (retry.status_code, retry.json()) == (202, paid.json())
+    assert Payment.objects.count() == 1
+    # Without a key the retry is an ordinary duplicate
+    resp = client.post("/api/v1/payments/", payment, format="json")
+    assert resp.status_code == 400 and "transaction_id" in resp.data
+    assert post("/api/v1/payments/", payment, "").status_code == 400
+
+    # Expired keys start over, even before the purge removes their records
+    settings.IDEMPOTENCY_KEY_TTL = 0
+    cache.clear()
+    later = {**stay, "check_in_date": "2026-05-01", "check_out_date": "2026-05-03"}
+    resp = post("/api/v1/bookings/", later, "booking-1")
+    assert resp.status_code == 201, resp.data
+    assert not resp.has_header("Idempotent-Replayed")
+    assert purge_idempotency_records() == 2
+    assert not IdempotencyRecord.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_duplicates_wait_for_the_first_request():
+    if connection.vendor != "postgresql":
+        pytest.skip("Concurrent writers need PostgreSQL")
+
+    prop = PropertyFactory(amenities=[AmenityFactory(name="WiFi")])
+    guest = UserFactory(user_type="guest")
+    booking = BookingFactory(property=prop, guest=guest, status="pending")
+    payment = {
+        "booking": booking.id,
+        "amount": str(booking.total_price),
+        "payment_method": "momo",
+        "transaction_id": "MTN-0777",
+        "status": "succeeded",
+    }
+    barrier = threading.Barrier(6)
+    responses = []
+
+    def pay():
+        client = APIClient()
+        client.force_authenticate(guest)
+        barrier.wait()
+        try:
+            responses.append(
+                client.post(
+                    "/api/v1/payments/",
+                    payment,
+                    format="json",
+                    HTTP_IDEMPOTENCY_KEY="momo-retry",
+                )
+            )
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=pay) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert [r.status_code for r in responses] == [202] * 6
+    assert len({r.data["id"] for r in responses}) == 1
+    assert sum(r.has_header("Idempotent-Replayed") for r in responses) == 5
+    assert Payment.objects.count() == 1
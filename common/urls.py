@@ -0,0 +1,10 @@
+# airbnb-clone-project/common/urls.py
+
+from django.urls import path
+
+from common.views import CacheStatsView, LockStatsView
+
+urlpatterns = [
+    path("cache/stats/", CacheStatsView.as_view(), name="cache-stats"),
+    path("locks/stats/", LockStatsView.as_view(), name="lock-stats"),
+]
@@ -1,3 +1,109 @@
-from django.shortcuts import render
+# airbnb-clone-project/common/views.py
 
-# Create your views here.
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from common.cache import get_cache_stats, get_lock_stats
+from common.serializers import FieldsetMixin, RoleQuerySerializer
+
+# Namespaces served by CachedResponseMixin viewsets
+CACHED_NAMESPACES = ["properties"]
+# Locks instrumented with common.cache.record_lock_wait (bookings.locks)
+MONITORED_LOCKS = ["booking-property"]
+
+
+class CacheStatsView(APIView):
+    """Response cache hit/miss counters for monitoring (staff only)."""
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(get_cache_stats(*CACHED_NAMESPACES))
+
+
+class LockStatsView(APIView):
+    """Lock acquisition and wait-time counters for monitoring (staff only)."""
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(get_lock_stats(*MONITORED_LOCKS))
+
+
+class FieldsetQuerysetMixin:
+    """Load only what a ``FieldsetMixin`` serializer's fieldset renders.
+
+    See ``FieldsetMixin.get_fieldset_queryset``; other serializers get the
+    queryset unchanged.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        serializer_class = self.get_serializer_class()
+        if issubclass(serializer_class, FieldsetMixin):
+            queryset = serializer_class.get_fieldset_queryset(queryset, self.request)
+        return queryset
+
+
+class UserScopedMixin:
+    """Limit a viewset to the objects the requesting user takes part in.
+
+    The queryset needs ``for_guest(user)``, ``for_host(user)`` and
+    ``visible_to(user)`` methods. Lists show one side at a time, picked by
+    ``?role=guest|host`` and defaulting to the user's ``user_type``, so each
+    is served by its own index; other actions reach either side.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if getattr(self, "swagger_fake_view", False):
+            # Schema generation has no user to scope to
+            return queryset.none()
+        user = self.request.user
+        if self.action != "list":
+            return queryset.visible_to(user)
+        query = RoleQuerySerializer(data=self.request.query_params)
+        query.is_valid(raise_exception=True)
+        role = query.validated_data.get("role", user.user_type)
+        if role == "host":
+            return queryset.for_host(user)
+        return queryset.for_guest(user)
+
+
+class ValuesListMixin:
+    """Serve ``list`` from ``values()`` rows rendered by ``values_serializer_class``.
+
+    Filtering, ordering and pagination are unchanged; the page is fetched as
+    plain dicts (plus whatever the ``ValuesSerializer`` fetches in bulk)
+    instead of model instances, and must render exactly what
+    ``serializer_class`` would. Sparse ``?fields=`` are honoured; requests
+    embedding related objects with ``?include=`` take the serializer path.
+    """
+
+    values_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        fields, include = None, []
+        serializer_class = self.get_serializer_class()
+        if issubclass(serializer_class, FieldsetMixin):
+            fields, include = serializer_class.get_fieldset(request)
+        if include:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        values_serializer = self.values_serializer_class(fields=fields)
+        # Keyset cursors are built from the ordering columns, so fetch them too
+        ordering = [
+            field.lstrip("-")
+            for field in queryset.query.order_by
+            if isinstance(field, str)
+        ]
+        rows = queryset.prefetch_related(None).values(
+            *dict.fromkeys(values_serializer.columns + ordering)
+        )
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(values_serializer.render(page))
+        return Response(values_serializer.render(rows))
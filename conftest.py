@@ -0,0 +1,43 @@
+# airbnb-clone-project/conftest.py
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# Planner settings query_plans turns off for the current transaction
+PLAN_SETTINGS = ("enable_seqscan", "enable_bitmapscan", "enable_sort")
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with an empty cache so throttle counters don't leak."""
+    cache.clear()
+    yield
+
+
+@pytest.fixture
+def query_plans():
+    """``query_plans(func)`` runs ``func`` and returns the PostgreSQL
+    ``EXPLAIN`` output of every SELECT it issued.
+
+    Sequential scans, bitmap scans and sorts are disabled first, so the plans
+    show which index can serve each query even on tiny test tables; a Sort
+    left in a plan means no index provides the order.
+    """
+
+    def plans(func):
+        with connection.cursor() as cursor:
+            for setting in PLAN_SETTINGS:
+                cursor.execute(f"SET LOCAL {setting} = off")
+        with CaptureQueriesContext(connection) as queries:
+            func()
+        explained = []
+        with connection.cursor() as cursor:
+            for query in queries:
+                if query["sql"].startswith("SELECT"):
+                    cursor.execute(f"EXPLAIN {query['sql']}")
+                    explained.append("\n".join(row[0] for row in cursor.fetchall()))
+        return explained
+
+    return plans
@@ -0,0 +1,76 @@
+# airbnb-clone-project/payments/gateway.py
+"""Payment gateway clients used by payments.tasks.
+
+A gateway charges a ``Payment`` and returns a ``ChargeResult``: either the
+provider's reference for a successful charge, or the reason it was declined.
+Problems worth retrying (timeouts, provider outages) raise ``GatewayError``
+instead. Clients pass the payment's ``transaction_id`` as the provider-side
+idempotency key, so a retried charge is never taken twice.
+
+``PAYMENT_GATEWAY`` names the class, built once per process by
+``get_gateway`` with ``PAYMENT_GATEWAY_OPTIONS`` so HTTP clients keep their
+connection pool. ``FakeGateway`` stands in for a provider in development and
+tests; ``payments.http_gateway.HTTPGateway`` talks to a real one.
+"""
+
+import functools
+import random
+import time
+import uuid
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+
+class ChargeResult(NamedTuple):
+    succeeded: bool
+    reference: str = ""
+    failure_reason: str = ""
+
+
+class GatewayError(Exception):
+    """The charge may or may not have happened; try again later."""
+
+
+class PaymentGateway:
+    def charge(self, payment):
+        """Charge ``payment.amount``; returns a ``ChargeResult``."""
+        raise NotImplementedError
+
+
+class FakeGateway(PaymentGateway):
+    """In-process stand-in for a payment provider.
+
+    Each charge takes a random ``latency`` (a ``(low, high)`` range in
+    seconds), then times out with probability ``error_rate`` or is declined
+    with probability ``decline_rate``. A ``seed`` makes the outcomes
+    repeatable. The transaction ids charged are kept in ``charges``.
+    """
+
+    def __init__(
+        self, latency=(0.05, 0.5), decline_rate=0.1, error_rate=0.05, seed=None
+    ):
+        self.latency = latency
+        self.decline_rate = decline_rate
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.charges = []
+
+    def charge(self, payment):
+        time.sleep(self.random.uniform(*self.latency))
+        self.charges.append(payment.transaction_id)
+        if self.random.random() < self.error_rate:
+            raise GatewayError("Simulated gateway timeout")
+        if self.random.random() < self.decline_rate:
+            return ChargeResult(False, failure_reason="Simulated decline")
+        return ChargeResult(True, reference=f"fake_{uuid.uuid4().hex}")
+
+
+@functools.cache
+def get_gateway():
+    """The process-wide client of the configured gateway."""
+    if not settings.PAYMENT_GATEWAY:
+        raise ImproperlyConfigured("Set PAYMENT_GATEWAY to charge payments.")
+    return import_string(settings.PAYMENT_GATEWAY)(**settings.PAYMENT_GATEWAY_OPTIONS)
@@ -0,0 +1,61 @@
+# airbnb-clone-project/payments/http_gateway.py
+"""A JSON-over-HTTP payment provider client (see payments.gateway).
+
+Charges are ``POST {PAYMENT_GATEWAY_URL}/charges`` with the amount, method
+and transaction id, authenticated with a bearer API key. One
+``requests.Session`` per process keeps up to ``PAYMENT_GATEWAY_POOL_SIZE``
+connections alive, so worker charges skip the TCP and TLS handshakes.
+"""
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from payments.gateway import ChargeResult, GatewayError, PaymentGateway
+
+# Worth retrying: rate limiting and provider-side failures
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+class HTTPGateway(PaymentGateway):
+    def __init__(self, url=None, api_key=None, timeout=None, pool_size=None):
+        self.url = (url or settings.PAYMENT_GATEWAY_URL).rstrip("/")
+        self.timeout = timeout or settings.PAYMENT_GATEWAY_TIMEOUT
+        pool_size = pool_size or settings.PAYMENT_GATEWAY_POOL_SIZE
+        self.session = requests.Session()
+        # Retries are the task's job: it backs off and keeps the same key
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers["Authorization"] = (
+            f"Bearer {api_key or settings.PAYMENT_GATEWAY_API_KEY}"
+        )
+
+    def charge(self, payment):
+        try:
+            response = self.session.post(
+                f"{self.url}/charges",
+                json={
+                    "amount": str(payment.amount),
+                    "method": payment.payment_method,
+                    "reference": payment.transaction_id,
+                },
+                headers={"Idempotency-Key": payment.transaction_id},
+                timeout=self.timeout,
+            )
+        except requests.RequestException as e:
+            raise GatewayError(str(e)) from e
+        if response.status_code in RETRYABLE_STATUSES:
+            raise GatewayError(f"Gateway responded {response.status_code}")
+
+        try:
+            data = response.json()
+        except ValueError as e:
+            raise GatewayError("Gateway sent an invalid response") from e
+        if not response.ok or data.get("status") != "succeeded":
+            return ChargeResult(
+                False,
+                failure_reason=data.get("failure_message")
+                or f"Declined ({response.status_code})",
+            )
+        return ChargeResult(True, reference=data.get("id", ""))
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.6 on 2026-10-18 07:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("payments", "0002_payment_gateway_charges"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="payment",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("succeeded", "Succeeded"),
+                    ("failed", "Failed"),
+                    ("refund_due", "Refund due"),
+                ],
+                default="pending",
+                max_length=10,
+            ),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.6 on 2026-10-18 07:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0006_booking_guest_created_idx"),
+        ("payments", "0003_payment_refund_due"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="payment",
+            name="booking",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="payments",
+                to="bookings.booking",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="payment",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("status__in", ("pending", "succeeded"))),
+                fields=("booking",),
+                name="payments_payment_one_live_per_booking",
+            ),
+        ),
+    ]
@@ -3,29 +3,68 @@
 from django.db import models
 
 
+class PaymentQuerySet(models.QuerySet):
+    """Payments scoped like the bookings they pay for."""
+
+    def for_guest(self, user):
+        return self.filter(booking__guest=user)
+
+    def for_host(self, user):
+        return self.filter(booking__property__host=user)
+
+    def visible_to(self, user):
+        return self.filter(
+            models.Q(booking__guest=user) | models.Q(booking__property__host=user)
+        )
+
+
 class Payment(models.Model):
-    """Payment info linked to a booking."""
+    """Payment info linked to a booking.
+
+    Created ``pending``; payments.tasks.charge_payment charges it through
+    the configured gateway and settles it as ``succeeded`` or ``failed``, or
+    ``refund_due`` when the charge went through for a booking cancelled in
+    the meantime. A booking has at most one live (pending or succeeded)
+    payment; after a failed one the guest can pay again.
+    """
 
     METHOD_CHOICES = (
         ("card", "Card"),
         ("momo", "Mobile Money"),
     )
     STATUS_CHOICES = (
+        ("pending", "Pending"),
         ("succeeded", "Succeeded"),
         ("failed", "Failed"),
+        ("refund_due", "Refund due"),
     )
+    # At most one payment per booking in these (see Meta.constraints)
+    LIVE_STATUSES = ("pending", "succeeded")
 
-    booking = models.OneToOneField(
-        "bookings.Booking", on_delete=models.CASCADE, related_name="payment"
+    booking = models.ForeignKey(
+        "bookings.Booking", on_delete=models.CASCADE, related_name="payments"
     )
     amount = models.DecimalField(max_digits=10, decimal_places=2)
     payment_method = models.CharField(max_length=10, choices=METHOD_CHOICES)
     transaction_id = models.CharField(max_length=100, unique=True)
-    status = models.CharField(max_length=10, choices=STATUS_CHOICES)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
+    # The gateway's id for the charge, and why it failed if it did
+    gateway_reference = models.CharField(max_length=100, blank=True, default="")
+    failure_reason = models.CharField(max_length=255, blank=True, default="")
     created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = PaymentQuerySet.as_manager()
 
     class Meta:
         ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["booking"],
+                condition=models.Q(status__in=("pending", "succeeded")),
+                name="payments_payment_one_live_per_booking",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"Payment {self.transaction_id} ({self.get_status_display()})"
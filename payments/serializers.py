@@ -1,11 +1,15 @@
 # airbnb-clone-project/payments/serializers.py
 
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
 
 from payments.models import Payment
 
 
 class PaymentSerializer(serializers.ModelSerializer):
+    PAYABLE_MESSAGE = "Only pending bookings can be paid for."
+    PAID_MESSAGE = "This booking already has a payment in progress."
+
     class Meta:
         model = Payment
         fields = [
@@ -15,6 +19,64 @@ class PaymentSerializer(serializers.ModelSerializer):
             "payment_method",
             "transaction_id",
             "status",
+            "gateway_reference",
+            "failure_reason",
+            "processed_at",
+            "created_at",
+        ]
+        # The amount is the booking's price; the rest is settled by
+        # payments.tasks.charge_payment, never by the client
+        read_only_fields = [
+            "id",
+            "amount",
+            "status",
+            "gateway_reference",
+            "failure_reason",
+            "processed_at",
             "created_at",
         ]
-        read_only_fields = ["id", "created_at"]
+
+    def create(self, validated_data):
+        """Report a concurrently reused ``transaction_id``, or a concurrent
+        payment for the same booking, as a 400."""
+        try:
+            # Savepoint so the violation leaves the transaction usable
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError as e:
+            if self.has_live_payment(validated_data["booking"]):
+                raise serializers.ValidationError(
+                    {"booking": [self.PAID_MESSAGE]}
+                ) from e
+            if Payment.objects.filter(
+                transaction_id=validated_data["transaction_id"]
+            ).exists():
+                raise serializers.ValidationError(
+                    {
+                        "transaction_id": [
+                            "payment with this transaction id already exists."
+                        ]
+                    }
+                ) from e
+            raise
+
+    def validate_booking(self, booking):
+        """Guests pay for their own pending bookings only."""
+        request = self.context.get("request")
+        if request is not None and booking.guest_id != request.user.id:
+            raise serializers.ValidationError("You can only pay for your own bookings.")
+        if booking.status != "pending":
+            raise serializers.ValidationError(self.PAYABLE_MESSAGE)
+        # Failed payments may be retried; pending ones are still charging
+        if self.has_live_payment(booking):
+            raise serializers.ValidationError(self.PAID_MESSAGE)
+        return booking
+
+    @staticmethod
+    def has_live_payment(booking):
+        return booking.payments.filter(status__in=Payment.LIVE_STATUSES).exists()
+
+    def validate(self, attrs):
+        # Charge what the stay costs; a successful charge confirms the booking
+        attrs["amount"] = attrs["booking"].total_price
+        return attrs
@@ -0,0 +1,116 @@
+# airbnb-clone-project/payments/tasks.py
+"""Payment charging on the ``payments`` Celery queue.
+
+``PaymentViewSet.create`` records a ``pending`` payment and enqueues
+``charge_payment`` once it commits, so the request never waits on the
+provider. The task charges the configured gateway (payments.gateway),
+retries transient gateway errors with exponential backoff, then settles
+the payment and confirms its booking on success. A declined payment leaves
+the booking pending, to be released by the expired-booking cleanup; a
+successful charge for a booking cancelled meanwhile is flagged
+``refund_due``.
+"""
+
+import logging
+
+from celery import shared_task
+from django.db import transaction
+from django.utils import timezone
+
+from bookings.locks import lock_properties
+from bookings.models import Booking
+from payments.gateway import ChargeResult, GatewayError, get_gateway
+from payments.models import Payment
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRIES = 5
+RETRY_BACKOFF = 10  # seconds, doubled on every retry
+RETRY_BACKOFF_MAX = 10 * 60
+
+
+@shared_task(bind=True, max_retries=MAX_RETRIES)
+def charge_payment(self, payment_id):
+    """Charge a pending payment and settle it; returns its final status.
+
+    Payments no longer pending (settled by an earlier delivery of this
+    task, or deleted) are left alone and return None.
+    """
+    payment = Payment.objects.filter(pk=payment_id, status="pending").first()
+    if payment is None:
+        return None
+    try:
+        result = get_gateway().charge(payment)
+    except GatewayError as exc:
+        # Eager runs (CELERY_TASK_ALWAYS_EAGER) have no worker to back off
+        # in, and would block the request: give up at once
+        if self.request.is_eager or self.request.retries >= self.max_retries:
+            result = ChargeResult(False, failure_reason=f"Gateway unavailable: {exc}")
+        else:
+            countdown = min(RETRY_BACKOFF * 2**self.request.retries, RETRY_BACKOFF_MAX)
+            logger.warning(
+                "Charging payment %s failed; retrying in %ds: %s",
+                payment_id,
+                countdown,
+                exc,
+            )
+            raise self.retry(exc=exc, countdown=countdown) from exc
+    return settle_payment(payment_id, result)
+
+
+def settle_payment(payment_id, result):
+    """Record a charge outcome, confirming the booking if it succeeded.
+
+    A successful charge for a booking that is no longer active (cancelled
+    by the guest or the expired-booking cleanup while the charge was in
+    flight) must not revive it, nor may a charge confirm a stay repriced
+    since; the payment is flagged ``refund_due`` instead.
+    """
+    with transaction.atomic():
+        payment = (
+            Payment.objects.select_related("booking")
+            .select_for_update(of=("self",))
+            .filter(pk=payment_id, status="pending")
+            .first()
+        )
+        if payment is None:
+            return None
+        payment.status = "succeeded" if result.succeeded else "failed"
+        payment.gateway_reference = result.reference
+        payment.failure_reason = result.failure_reason[:255]
+        payment.processed_at = timezone.now()
+
+        if result.succeeded:
+            # The same lock as booking writes through the API; the cleanup
+            # task doesn't take it, so the booking row is locked as well and
+            # read again under both
+            lock_properties(payment.booking.property_id)
+            booking = Booking.objects.select_for_update().get(pk=payment.booking_id)
+            if booking.status == "pending" and payment.amount == booking.total_price:
+                booking.status = "confirmed"
+                booking.save(update_fields=["status"])
+            elif booking.status == "pending":
+                # Repriced (new dates) while charging: the guest pays again
+                payment.status = "refund_due"
+                payment.failure_reason = "Booking price changed while charging."
+            elif booking.status not in Booking.ACTIVE_STATUSES:
+                payment.status = "refund_due"
+                payment.failure_reason = "Booking was cancelled while charging."
+            if payment.status == "refund_due":
+                logger.warning(
+                    "Payment %s charged for %s booking %s; refund due: %s",
+                    payment_id,
+                    booking.status,
+                    booking.pk,
+                    payment.failure_reason,
+                )
+        payment.save(
+            update_fields=[
+                "status",
+                "gateway_reference",
+                "failure_reason",
+                "processed_at",
+            ]
+        )
+    logger.info("Payment %s %s", payment_id, payment.status)
+    return payment.status
@@ -1,10 +1,27 @@
 # airbnb-clone-project/payments/tests.py
 
 
+import datetime as dt
+
 import pytest
+from celery.exceptions import Retry
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from kombu.exceptions import OperationalError
 from rest_framework.test import APIClient
 
-from tests.factories import AmenityFactory, PropertyFactory, UserFactory
+from bookings.models import Booking
+from payments import tasks
+from payments.gateway import FakeGateway, get_gateway
+from payments.models import Payment
+from payments.serializers import PaymentSerializer
+from tests.factories import (
+    AmenityFactory,
+    BookingFactory,
+    PaymentFactory,
+    PropertyFactory,
+    UserFactory,
+)
 
 
 @pytest.mark.django_db
@@ -27,7 +44,6 @@ def test_payment_momo():
             "check_in_date": "2025-11-01",
             "check_out_date": "2025-11-05",
             "total_price": "1000.00",
-            "status": "confirmed",
         },
         format="json",
     )
@@ -39,12 +55,250 @@ def test_payment_momo():
         "/api/v1/payments/",
         {
             "booking": booking_id,
-            "amount": "1000.00",
+            "amount": "0.01",
             "payment_method": "momo",
             "transaction_id": "MTN-0001",
             "status": "succeeded",
         },
         format="json",
     )
-    assert r2.status_code == 201, r2.data
+    # Accepted and charged in the background; the client can't settle it
+    assert r2.status_code == 202, r2.data
     assert r2.data["payment_method"] == "momo"
+    assert r2.data["status"] == "pending"
+    # The stay's price is charged, whatever the client claims
+    assert r2.data["amount"] == r.data["total_price"]
+
+    # Confirmed or cancelled bookings can't be paid for (again)
+    for status in ("confirmed", "cancelled"):
+        booking = BookingFactory(
+            property=prop,
+            guest=guest,
+            check_in_date=dt.date(2025, 12, 1),
+            check_out_date=dt.date(2025, 12, 3),
+            status=status,
+        )
+        r3 = client.post(
+            "/api/v1/payments/",
+            {
+                "booking": booking.id,
+                "payment_method": "momo",
+                "transaction_id": f"MTN-{status}",
+            },
+            format="json",
+        )
+        assert r3.status_code == 400
+        assert r3.data["booking"] == [PaymentSerializer.PAYABLE_MESSAGE]
+        booking.delete()
+
+
+@pytest.mark.django_db
+def test_payments_follow_their_booking(query_plans):
+    wifi = AmenityFactory(name="WiFi")
+    host = UserFactory(user_type="host")
+    guest, other = UserFactory(user_type="guest"), UserFactory(user_type="guest")
+    trip = BookingFactory(
+        property=PropertyFactory(host=host, amenities=[wifi]), guest=guest
+    )
+    payment = PaymentFactory(booking=trip)
+    PaymentFactory(
+        booking__property=PropertyFactory(amenities=[wifi]), booking__guest=other
+    )
+
+    client = APIClient()
+
+    def ids(user, **query):
+        client.force_authenticate(user)
+        resp = client.get("/api/v1/payments/", query)
+        assert resp.status_code == 200, resp.data
+        return [p["id"] for p in resp.json()["results"]]
+
+    assert ids(guest) == ids(host) == [payment.id]
+    assert ids(host, role="guest") == []
+
+    # Guests can't pay for someone else's booking
+    client.force_authenticate(other)
+    resp = client.post(
+        "/api/v1/payments/",
+        {
+            "booking": BookingFactory(
+                property=PropertyFactory(amenities=[wifi]), guest=guest
+            ).id,
+            "amount": "10.00",
+            "payment_method": "momo",
+            "transaction_id": "MTN-9999",
+            "status": "succeeded",
+        },
+        format="json",
+    )
+    assert resp.status_code == 400 and "booking" in resp.data
+
+    if connection.vendor == "postgresql":
+        client.force_authenticate(guest)
+        plans = query_plans(lambda: client.get("/api/v1/payments/", {"cursor": ""}))
+        [plan] = [plan for plan in plans if "payments_payment" in plan]
+        # Bookings are only joined to scope by guest: the index covers it
+        assert "Index Only Scan using bookings_guest_created_idx" in plan
+        assert "Seq Scan" not in plan
+
+
+@pytest.mark.django_db
+def test_payments_are_charged_in_the_background(
+    monkeypatch, django_capture_on_commit_callbacks
+):
+    gateway = FakeGateway(latency=(0, 0), decline_rate=0, error_rate=0)
+    monkeypatch.setattr(tasks, "get_gateway", lambda: gateway)
+    wifi = AmenityFactory(name="WiFi")
+    guest = UserFactory(user_type="guest")
+    client = APIClient()
+    client.force_authenticate(guest)
+
+    def pay(transaction_id, booking=None):
+        booking = booking or BookingFactory(
+            property=PropertyFactory(amenities=[wifi]), guest=guest, status="pending"
+        )
+        charged = list(gateway.charges)
+        with django_capture_on_commit_callbacks() as callbacks:
+            resp = client.post(
+                "/api/v1/payments/",
+                {
+                    "booking": booking.id,
+                    "amount": "500.00",
+                    "payment_method": "card",
+                    "transaction_id": transaction_id,
+                },
+                format="json",
+            )
+        assert resp.status_code == 202, resp.data
+        # Only enqueued once the payment is committed, never charged inline
+        assert len(callbacks) == 1 and gateway.charges == charged
+        return resp.data["id"]
+
+    def charge(payment_id):
+        return tasks.charge_payment.apply(args=(payment_id,)).get()
+
+    payment_id = pay("CARD-1")
+    assert charge(payment_id) == "succeeded"
+    payment = Payment.objects.select_related("booking").get(pk=payment_id)
+    assert payment.gateway_reference.startswith("fake_")
+    assert payment.processed_at is not None
+    assert payment.booking.status == "confirmed"
+    # Redelivered tasks don't charge twice
+    assert charge(payment_id) is None
+    assert gateway.charges == ["CARD-1"]
+
+    # Charged while the guest (or the cleanup) cancelled: flagged, not revived
+    payment_id = pay("CARD-2")
+    Booking.objects.filter(payments=payment_id).update(status="cancelled")
+    assert charge(payment_id) == "refund_due"
+    payment = Payment.objects.select_related("booking").get(pk=payment_id)
+    assert payment.booking.status == "cancelled"
+
+    # Nor may a charge confirm a stay repriced meanwhile
+    payment_id = pay("CARD-2B")
+    Booking.objects.filter(payments=payment_id).update(total_price="1.00")
+    assert charge(payment_id) == "refund_due"
+    assert Booking.objects.get(payments=payment_id).status == "pending"
+
+    gateway.decline_rate = 1
+    payment_id = pay("CARD-3")
+    assert charge(payment_id) == "failed"
+    payment = Payment.objects.select_related("booking").get(pk=payment_id)
+    assert payment.failure_reason == "Simulated decline"
+    assert payment.booking.status == "pending"
+
+    # Declined payments can be retried, one at a time
+    gateway.decline_rate = 0
+    retry_id = pay("CARD-3-RETRY", booking=payment.booking)
+    resp = client.post(
+        "/api/v1/payments/",
+        {
+            "booking": payment.booking_id,
+            "payment_method": "card",
+            "transaction_id": "CARD-3-AGAIN",
+        },
+        format="json",
+    )
+    assert resp.data == {"booking": [PaymentSerializer.PAID_MESSAGE]}
+    assert charge(retry_id) == "succeeded"
+    payment.booking.refresh_from_db()
+    assert payment.booking.status == "confirmed"
+    assert list(
+        payment.booking.payments.order_by("pk").values_list("status", flat=True)
+    ) == ["failed", "succeeded"]
+
+
+@pytest.mark.django_db
+def test_transient_gateway_errors_are_retried_by_workers(monkeypatch):
+    gateway = FakeGateway(latency=(0, 0), error_rate=1)
+    monkeypatch.setattr(tasks, "get_gateway", lambda: gateway)
+    wifi = AmenityFactory(name="WiFi")
+    payment = PaymentFactory(
+        booking__property=PropertyFactory(amenities=[wifi]), status="pending"
+    )
+
+    def deliver(retries):
+        tasks.charge_payment.push_request(
+            id=f"charge-{retries}",
+            args=(payment.pk,),
+            kwargs={},
+            called_directly=False,
+            retries=retries,
+        )
+        try:
+            return tasks.charge_payment.run(payment.pk)
+        finally:
+            tasks.charge_payment.pop_request()
+
+    with pytest.raises(Retry):
+        deliver(retries=0)
+    payment.refresh_from_db()
+    assert payment.status == "pending"
+    assert deliver(retries=tasks.MAX_RETRIES) == "failed"
+    payment.refresh_from_db()
+    assert payment.failure_reason.startswith("Gateway unavailable")
+
+    # Eager runs have no worker to back off in; they give up at once
+    payment = PaymentFactory(
+        booking__property=PropertyFactory(amenities=[wifi]), status="pending"
+    )
+    gateway.charges = []
+    assert tasks.charge_payment.apply(args=(payment.pk,)).get() == "failed"
+    assert gateway.charges == [payment.transaction_id]
+
+
+@pytest.mark.django_db
+def test_payment_is_accepted_when_it_cannot_be_enqueued(
+    settings, monkeypatch, django_capture_on_commit_callbacks
+):
+    def broker_down(*args, **kwargs):
+        raise OperationalError("Broker unavailable")
+
+    monkeypatch.setattr(tasks.charge_payment, "delay", broker_down)
+    guest = UserFactory(user_type="guest")
+    booking = BookingFactory(
+        property=PropertyFactory(amenities=[AmenityFactory(name="WiFi")]),
+        guest=guest,
+        status="pending",
+    )
+    client = APIClient()
+    client.force_authenticate(guest)
+    with django_capture_on_commit_callbacks(execute=True):
+        resp = client.post(
+            "/api/v1/payments/",
+            {
+                "booking": booking.id,
+                "amount": "500.00",
+                "payment_method": "momo",
+                "transaction_id": "MTN-0500",
+            },
+            format="json",
+        )
+    assert resp.status_code == 202, resp.data
+    assert Payment.objects.get(pk=resp.data["id"]).status == "pending"
+
+    # Outside DEBUG there is no default gateway: nothing gets charged
+    settings.PAYMENT_GATEWAY = ""
+    get_gateway.cache_clear()
+    with pytest.raises(ImproperlyConfigured):
+        get_gateway()
@@ -1,17 +1,45 @@
 # airbnb-clone-project/payments/views.py
 
-from rest_framework import permissions, viewsets
+from django.db import transaction
+from rest_framework import permissions, status, viewsets
+from rest_framework.response import Response
 
+from common.idempotency import idempotent
+from common.pagination import EstimatedCountPagination
+from common.views import UserScopedMixin
 from payments.models import Payment
 from payments.serializers import PaymentSerializer
+from payments.tasks import charge_payment
 
 
-class PaymentViewSet(viewsets.ModelViewSet):
-    queryset = Payment.objects.select_related("booking").all()
+class PaymentViewSet(UserScopedMixin, viewsets.ModelViewSet):
+    # Only the booking id is rendered: joining bookings just to scope by
+    # guest reads the bookings_guest_created_idx index alone
+    queryset = Payment.objects.all()
     serializer_class = PaymentSerializer
+    # Lists are always scoped to one user, so counts are exact; they are
+    # still cached briefly between pages
+    pagination_class = EstimatedCountPagination
+    # Payments follow their booking: the guest's, or the host's with ?role=host
     permission_classes = [permissions.IsAuthenticated]
 
     filterset_fields = ["payment_method", "status", "booking"]
     search_fields = ["transaction_id"]
     ordering_fields = ["created_at", "amount"]
     ordering = ["-created_at"]
+
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        # Mobile-money clients retry on flaky networks (Idempotency-Key).
+        # The payment is charged in the background: 202 with it pending
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+
+    def perform_create(self, serializer):
+        payment = serializer.save()
+        # Robust: the payment is committed by then, so a broker outage (or
+        # an eager charge raising) is logged by Django instead of turning
+        # the 202 into a 500; the payment stays pending
+        transaction.on_commit(lambda: charge_payment.delay(payment.pk), robust=True)
@@ -0,0 +1,120 @@
+# airbnb-clone-project/properties/availability.py
+"""Busy-date calendar for a property, cached in month-sized blocks.
+
+Each block holds the merged busy ranges of one property for one calendar
+month, clipped to that month. Ranges are half-open ``[start, end)`` so
+``end`` is the check-out date, which is free for the next guest. Block keys
+carry the generation of their property, which bookings.signals bumps after
+a booking of the property commits; blocks are never deleted, so a reader
+that loaded the old bookings can only store them under a retired key.
+Checkout holds (bookings.holds) expire on their own, so they are merged in
+on every read instead.
+"""
+
+import datetime
+
+from django.core.cache import cache
+
+from bookings.holds import get_holds
+from bookings.models import Booking
+from common.cache import bump_generation, get_generations
+from properties.models import Property
+
+MONTH_KEY = "availability:{property_id}:{generation}:{month:%Y-%m}"
+AVAILABILITY_CACHE_TIMEOUT = 60 * 60
+
+
+def _next_month(day):
+    return (day.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+
+
+def _months(start, end):
+    """Yield the first day of each month intersecting ``[start, end)``."""
+    month = start.replace(day=1)
+    while month < end:
+        yield month
+        month = _next_month(month)
+
+
+def _namespace(property_id):
+    return f"availability:{property_id}"
+
+
+def _month_key(property_id, generation, month):
+    return MONTH_KEY.format(property_id=property_id, generation=generation, month=month)
+
+
+def merge_ranges(ranges):
+    """Merge overlapping or touching ``(start, end)`` ranges."""
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _load_months(property_id, months):
+    """Build blocks for ``months`` from a single bookings query."""
+    rows = (
+        Booking.objects.filter(property_id=property_id)
+        .active()
+        .overlapping(months[0], _next_month(months[-1]))
+        .values_list("check_in_date", "check_out_date")
+    )
+    blocks = {month: [] for month in months}
+    for check_in, check_out in rows:
+        for month in _months(check_in, check_out):
+            if month in blocks:
+                blocks[month].append(
+                    (max(check_in, month), min(check_out, _next_month(month)))
+                )
+    return {month: merge_ranges(ranges) for month, ranges in blocks.items()}
+
+
+def get_busy_ranges(property_id, start, end):
+    """Merged busy ranges (bookings and holds) of a property within ``[start, end)``.
+
+    Served entirely from cache when every month is warm. Otherwise the
+    missing months are loaded in one query and cached; raises
+    ``Property.DoesNotExist`` if the property is unknown.
+    """
+    months = list(_months(start, end))
+    # Read before the blocks are loaded: a booking committed meanwhile
+    # bumps it, retiring whatever this call caches
+    [generation] = get_generations(_namespace(property_id))
+    keys = {month: _month_key(property_id, generation, month) for month in months}
+    cached = cache.get_many(list(keys.values()))
+
+    blocks = {month: cached[key] for month, key in keys.items() if key in cached}
+    missing = [month for month in months if month not in blocks]
+    if missing:
+        if not Property.objects.filter(pk=property_id).exists():
+            raise Property.DoesNotExist(property_id)
+        loaded = _load_months(property_id, missing)
+        cache.set_many(
+            {keys[month]: ranges for month, ranges in loaded.items()},
+            AVAILABILITY_CACHE_TIMEOUT,
+        )
+        blocks.update(loaded)
+
+    held = [
+        (hold.check_in, hold.check_out) for hold in get_holds(property_id, start, end)
+    ]
+    ranges = merge_ranges([*(r for month in months for r in blocks[month]), *held])
+    return [
+        (max(range_start, start), min(range_end, end))
+        for range_start, range_end in ranges
+        if range_start < end and range_end > start
+    ]
+
+
+def invalidate_stays(stays):
+    """Retire the cached blocks of many ``(property_id, check_in, check_out)`` stays.
+
+    Every block of each property is retired, not only the stay's months:
+    one generation per property keeps reads to a single extra lookup.
+    """
+    bump_generation(*{_namespace(property_id) for property_id, _, _ in stays})
@@ -0,0 +1,149 @@
+# airbnb-clone-project/properties/facets.py
+"""Facet counts and a price histogram for the property search sidebar.
+
+``get_facets`` summarizes every property matching the list filters with a
+fixed number of aggregate queries, however many properties match: one
+``GROUP BY`` per facet, the price range, and one ``width_bucket`` histogram.
+Results are cached per normalized filter for ``FACETS_CACHE_TIMEOUT``
+seconds, under the generations of the namespaces they depend on.
+"""
+
+import hashlib
+from decimal import ROUND_CEILING, ROUND_FLOOR, Decimal
+
+from django.core.cache import cache
+from django.db.models import Count, F, FloatField, Func, IntegerField, Max, Min, Value
+from django.db.models.functions import Cast, Least
+
+from common.cache import get_generations
+from properties.models import Property
+
+FACETS_KEY = "facets:properties:{digest}"
+FACETS_CACHE_TIMEOUT = 60
+# Columns counted per distinct value
+VALUE_FACETS = ("city", "country", "bedrooms")
+CENT = Decimal("0.01")
+
+
+class WidthBucket(Func):
+    """PostgreSQL's ``width_bucket(value, low, high, count)``.
+
+    The 1-based index of ``value`` among ``count`` equal-width buckets
+    spanning ``[low, high)``; ``high`` itself falls in bucket ``count + 1``.
+    Other databases compute the same with arithmetic.
+    """
+
+    function = "WIDTH_BUCKET"
+    output_field = IntegerField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        value, low, high, count = self.get_source_expressions()
+        position = (Cast(value, FloatField()) - Cast(low, FloatField())) / (
+            Cast(high, FloatField()) - Cast(low, FloatField())
+        )
+        # value >= low, so truncating toward zero is floor()
+        bucket = Cast(position * count, IntegerField()) + 1
+        return compiler.compile(bucket)
+
+
+def normalize_filters(query_params, names):
+    """The non-empty ``names`` parameters of a request, in a stable order."""
+    return sorted(
+        (name, sorted(value for value in query_params.getlist(name) if value))
+        for name in names
+        if any(query_params.getlist(name))
+    )
+
+
+def get_facets(get_queryset, filters, buckets, dependencies):
+    """Facets of ``get_queryset()``, cached by ``filters`` and ``buckets``.
+
+    ``filters`` is the normalized request filter (see ``normalize_filters``)
+    the queryset is built from; it is only built, and the filters validated,
+    on a cache miss. ``dependencies`` are the cache generation namespaces
+    that invalidate the entry.
+    """
+    generations = get_generations(*dependencies)
+    raw = repr((filters, buckets, list(zip(dependencies, generations))))
+    key = FACETS_KEY.format(digest=hashlib.sha256(raw.encode("utf-8")).hexdigest())
+    facets = cache.get(key)
+    if facets is None:
+        facets = compute_facets(get_queryset(), buckets)
+        cache.set(key, facets, FACETS_CACHE_TIMEOUT)
+    return facets
+
+
+def compute_facets(queryset, buckets):
+    """Counts per value of each ``VALUE_FACETS`` column and per amenity, plus
+    a ``buckets``-bar price histogram, over the properties in ``queryset``."""
+    # Filtering by primary key keeps joins in the filters (amenities) from
+    # counting a property more than once
+    matches = Property.objects.filter(pk__in=queryset.order_by().values("pk"))
+
+    facets = {"count": 0}
+    for name in VALUE_FACETS:
+        facets[name] = [
+            {"value": value, "count": count}
+            for value, count in matches.order_by()
+            .values_list(name)
+            .annotate(count=Count("pk"))
+            .order_by("-count", name)
+        ]
+    facets["count"] = sum(item["count"] for item in facets["city"])
+
+    links = Property.amenities.through.objects.filter(
+        property__in=queryset.order_by().values("pk")
+    )
+    facets["amenities"] = [
+        {"id": amenity_id, "name": name, "count": count}
+        for amenity_id, name, count in links.values_list("amenity_id", "amenity__name")
+        .annotate(count=Count("property_id"))
+        .order_by("-count", "amenity__name")
+    ]
+    facets["price"] = price_histogram(matches, buckets, facets["count"])
+    return facets
+
+
+def price_histogram(matches, buckets, total):
+    """``buckets`` equal-width price ranges between the cheapest and the
+    dearest of the ``total`` matches, with the number of matches in each."""
+    bounds = matches.aggregate(low=Min("price_per_night"), high=Max("price_per_night"))
+    low, high = bounds["low"], bounds["high"]
+    if low is None:
+        return {"min": None, "max": None, "buckets": []}
+    low = Decimal(low).quantize(CENT, rounding=ROUND_FLOOR)
+    high = Decimal(high).quantize(CENT, rounding=ROUND_CEILING)
+    if low == high:
+        buckets = 1
+        counts = {1: total}
+    else:
+        counts = dict(
+            matches.annotate(
+                # The top price lands in bucket n + 1; fold it into the last
+                bucket=Least(
+                    WidthBucket(
+                        F("price_per_night"), Value(low), Value(high), Value(buckets)
+                    ),
+                    Value(buckets),
+                )
+            )
+            .order_by()
+            .values_list("bucket")
+            .annotate(count=Count("pk"))
+        )
+    width = (high - low) / buckets
+    edges = [
+        (low + width * i).quantize(CENT, rounding=ROUND_FLOOR) for i in range(buckets)
+    ] + [high]
+    return {
+        "min": str(low),
+        "max": str(high),
+        "buckets": [
+            {
+                "min": str(edges[i]),
+                "max": str(edges[i + 1]),
+                "count": counts.get(i + 1, 0),
+            }
+            for i in range(buckets)
+        ],
+    }
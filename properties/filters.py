@@ -0,0 +1,116 @@
+# airbnb-clone-project/properties/filters.py
+
+import django_filters
+from django import forms
+from django.db.models import Exists, OuterRef
+
+from bookings.holds import get_held_property_ids
+from bookings.models import Booking
+from properties.geo import parse_bbox, parse_point
+from properties.models import Property
+
+DEFAULT_RADIUS_KM = 10
+MAX_RADIUS_KM = 500
+
+
+class PropertyFilterForm(forms.Form):
+    """Validate stay dates and parse the location parameters."""
+
+    def clean(self):
+        cleaned_data = super().clean()
+        for name, parse in (("bbox", parse_bbox), ("near", parse_point)):
+            if cleaned_data.get(name):
+                try:
+                    cleaned_data[name] = parse(cleaned_data[name])
+                except ValueError as e:
+                    self.add_error(name, str(e))
+        if cleaned_data.get("radius_km") is not None and not cleaned_data.get("near"):
+            self.add_error("radius_km", "radius_km only applies together with near.")
+
+        check_in = cleaned_data.get("check_in")
+        check_out = cleaned_data.get("check_out")
+        if (check_in is None) != (check_out is None):
+            raise forms.ValidationError(
+                "Both check_in and check_out are required to filter by availability."
+            )
+        if check_in and check_out and check_in >= check_out:
+            raise forms.ValidationError("check_out must be after check_in.")
+        return cleaned_data
+
+
+class PropertyFilter(django_filters.FilterSet):
+    """Filters for the property list, including date availability."""
+
+    check_in = django_filters.DateFilter(method="filter_noop")
+    check_out = django_filters.DateFilter(method="filter_noop")
+    min_rating = django_filters.NumberFilter(
+        field_name="avg_rating", lookup_expr="gte", min_value=0, max_value=5
+    )
+    min_price = django_filters.NumberFilter(
+        field_name="price_per_night", lookup_expr="gte", min_value=0
+    )
+    max_price = django_filters.NumberFilter(
+        field_name="price_per_night", lookup_expr="lte", min_value=0
+    )
+
+    bbox = django_filters.CharFilter(
+        method="filter_noop",
+        help_text="west,south,east,north in decimal degrees; west > east "
+        "crosses the antimeridian.",
+    )
+    near = django_filters.CharFilter(
+        method="filter_noop",
+        help_text="latitude,longitude; keeps properties within radius_km and "
+        "allows ?ordering=distance.",
+    )
+    radius_km = django_filters.NumberFilter(
+        method="filter_noop", min_value=0, max_value=MAX_RADIUS_KM
+    )
+    geohash = django_filters.CharFilter(
+        lookup_expr="startswith", help_text="Geohash prefix, e.g. a map cluster."
+    )
+
+    class Meta:
+        model = Property
+        form = PropertyFilterForm
+        fields = ["city", "country", "bedrooms", "amenities"]
+
+    def filter_noop(self, queryset, name, value):
+        # Dates and locations are applied together in filter_queryset()
+        return queryset
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        cleaned_data = self.form.cleaned_data
+        check_in = cleaned_data.get("check_in")
+        check_out = cleaned_data.get("check_out")
+        if check_in and check_out:
+            queryset = self.filter_available(queryset, check_in, check_out)
+        if cleaned_data.get("bbox"):
+            queryset = queryset.in_bbox(*cleaned_data["bbox"])
+        if cleaned_data.get("near"):
+            radius_km = cleaned_data.get("radius_km")
+            queryset = queryset.within(
+                *cleaned_data["near"],
+                DEFAULT_RADIUS_KM if radius_km is None else float(radius_km),
+            )
+        return queryset
+
+    @staticmethod
+    def filter_available(queryset, check_in, check_out):
+        """Drop properties with an active booking or a hold overlapping the stay.
+
+        Bookings are excluded with a correlated NOT EXISTS so the whole search
+        is one query, served by the (property, status, check_in_date,
+        check_out_date) index; held properties are read from Redis first.
+        """
+        conflicts = (
+            Booking.objects.filter(property=OuterRef("pk"))
+            .active()
+            .overlapping(check_in, check_out)
+        )
+        queryset = queryset.filter(~Exists(conflicts))
+        held = get_held_property_ids(check_in, check_out)
+        if held:
+            queryset = queryset.exclude(pk__in=held)
+        return queryset
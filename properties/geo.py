@@ -0,0 +1,126 @@
+# airbnb-clone-project/properties/geo.py
+"""Plain latitude/longitude geometry for property search, without PostGIS.
+
+Radius searches first narrow to the bounding box of the circle, which the
+(latitude, longitude) index serves, then compute the exact great-circle
+distance (haversine) for just those candidates. Geohashes name grid cells:
+every character splits a cell into 32, so listings sharing a prefix are in
+the same cell, which is how the map clusters them.
+"""
+
+import math
+
+from django.db.models import FloatField, Value
+from django.db.models.functions import ASin, Cos, Least, Power, Radians, Sin, Sqrt
+
+# Mean Earth radius (IUGG)
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LATITUDE = math.pi * EARTH_RADIUS_KM / 180
+# Stored precision: cells of about 5 x 5 metres
+GEOHASH_PRECISION = 9
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def encode_geohash(latitude, longitude, precision=GEOHASH_PRECISION):
+    """The geohash of a point, ``precision`` characters long."""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        # Bits alternate between longitude and latitude, longitude first
+        interval, coordinate = (lng_range, longitude) if even else (lat_range, latitude)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(GEOHASH_ALPHABET[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+
+def geohash_precision(zoom):
+    """Geohash length giving about 4 x 4 cells per map tile at ``zoom``.
+
+    A tile at zoom ``z`` spans ``360 / 2**z`` degrees of longitude, and a
+    geohash of length ``p`` halves the longitude ``ceil(5p / 2)`` times.
+    """
+    return min(GEOHASH_PRECISION, max(1, math.ceil(2 * (zoom + 2) / 5)))
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """``(west, south, east, north)`` around the circle of ``radius_km``.
+
+    ``west > east`` when the box crosses the antimeridian. Near the poles
+    the box spans every longitude.
+    """
+    delta = radius_km / KM_PER_DEGREE_LATITUDE
+    south, north = latitude - delta, latitude + delta
+    if south <= -90 or north >= 90:
+        return -180.0, max(south, -90.0), 180.0, min(north, 90.0)
+    delta = delta / math.cos(math.radians(latitude))
+    if delta >= 180:
+        return -180.0, south, 180.0, north
+    west, east = longitude - delta, longitude + delta
+    return (
+        (west + 360 if west < -180 else west),
+        south,
+        (east - 360 if east > 180 else east),
+        north,
+    )
+
+
+def haversine_km(latitude, longitude):
+    """Expression for the distance in km from a property to a point."""
+    lat1, lat2 = Radians("latitude"), Value(math.radians(latitude))
+    d_lat = (Radians("latitude") - lat2) / 2
+    d_lng = (Radians("longitude") - Value(math.radians(longitude))) / 2
+    a = Power(Sin(d_lat), 2) + Cos(lat1) * Cos(lat2) * Power(Sin(d_lng), 2)
+    # Rounding can push a just above 1 for antipodal points
+    return Value(2 * EARTH_RADIUS_KM) * ASin(
+        Sqrt(Least(a, Value(1.0))), output_field=FloatField()
+    )
+
+
+def parse_point(value):
+    """``(latitude, longitude)`` from ``"lat,lng"``; ValueError if invalid."""
+    latitude, longitude = _floats(value, 2, "latitude,longitude")
+    _check_latitude(latitude)
+    _check_longitude(longitude)
+    return latitude, longitude
+
+
+def parse_bbox(value):
+    """``(west, south, east, north)`` from ``"west,south,east,north"``."""
+    west, south, east, north = _floats(value, 4, "west,south,east,north")
+    for longitude in (west, east):
+        _check_longitude(longitude)
+    for latitude in (south, north):
+        _check_latitude(latitude)
+    if south > north:
+        raise ValueError("South must not be greater than north.")
+    return west, south, east, north
+
+
+def _floats(value, count, shape):
+    try:
+        numbers = [float(part) for part in value.split(",")]
+    except ValueError:
+        numbers = []
+    if len(numbers) != count or not all(map(math.isfinite, numbers)):
+        raise ValueError(f"Expected {shape} in decimal degrees.")
+    return numbers
+
+
+def _check_latitude(latitude):
+    if not -90 <= latitude <= 90:
+        raise ValueError("Latitude must be between -90 and 90.")
+
+
+def _check_longitude(longitude):
+    if not -180 <= longitude <= 180:
+        raise ValueError("Longitude must be between -180 and 180.")
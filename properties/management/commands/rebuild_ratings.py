@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from properties.ratings import rebuild_rating_stats
+
+
+class Command(BaseCommand):
+    """Recompute Property rating aggregates from the reviews table.
+
+    Reviews keep the aggregates current on every write; run this after bulk
+    imports that bypass model signals (e.g. ``seed --scale``) or to repair
+    drift.
+    """
+
+    help = "Rebuild avg_rating, review_count and rating histograms from reviews."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10000,
+            help="Primary-key range covered by each UPDATE.",
+        )
+
+    def handle(self, *args, **options):
+        updated = rebuild_rating_stats(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Ratings rebuilt: {updated} properties"))
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.6 on 2026-10-18 03:09
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+from common.operations import RunPostgresSQL
+
+SEARCH_VECTOR_FUNCTION = """
+CREATE OR REPLACE FUNCTION properties_property_search_vector_update()
+RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.city, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("properties", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="property",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        RunPostgresSQL(
+            sql=[
+                SEARCH_VECTOR_FUNCTION,
+                "CREATE TRIGGER properties_property_search_vector_trigger "
+                "BEFORE INSERT OR UPDATE OF title, city, description "
+                "ON properties_property FOR EACH ROW "
+                "EXECUTE FUNCTION properties_property_search_vector_update();",
+                # Backfill existing rows through the trigger
+                "UPDATE properties_property SET title = title;",
+                "CREATE INDEX properties_property_search_vector_gin "
+                "ON properties_property USING gin (search_vector);",
+            ],
+            reverse_sql=[
+                "DROP INDEX IF EXISTS properties_property_search_vector_gin;",
+                "DROP TRIGGER IF EXISTS properties_property_search_vector_trigger "
+                "ON properties_property;",
+                "DROP FUNCTION IF EXISTS properties_property_search_vector_update();",
+            ],
+        ),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 5.2.6 on 2026-10-18 03:49
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Avg, Count, Exists, FloatField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Round
+
+
+def backfill_rating_stats(apps, schema_editor):
+    """Aggregate existing reviews; later changes are applied incrementally."""
+    Property = apps.get_model("properties", "Property")
+    Review = apps.get_model("reviews", "Review")
+    reviews = (
+        Review.objects.filter(booking__property=OuterRef("pk"))
+        .order_by()
+        .values("booking__property")
+    )
+
+    def aggregate(expression):
+        return Coalesce(Subquery(reviews.annotate(value=expression).values("value")), 0)
+
+    Property.objects.filter(Exists(reviews)).update(
+        review_count=aggregate(Count("pk")),
+        avg_rating=aggregate(Round(Avg("rating", output_field=FloatField()), 2)),
+        **{
+            f"rating_{rating}_count": aggregate(Count("pk", filter=Q(rating=rating)))
+            for rating in range(1, 6)
+        },
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("amenities", "0001_initial"),
+        ("properties", "0002_search_vector"),
+        ("reviews", "0002_search_vector"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="property",
+            name="avg_rating",
+            field=models.DecimalField(
+                decimal_places=2, default=0, editable=False, max_digits=3
+            ),
+        ),
+        migrations.AddField(
+            model_name="property",
+            name="rating_1_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="property",
+            name="rating_2_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="property",
+            name="rating_3_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="property",
+            name="rating_4_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="property",
+            name="rating_5_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="property",
+            name="review_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="property",
+            index=models.Index(
+                fields=["avg_rating", "id"], name="properties__avg_rat_95e3cf_idx"
+            ),
+        ),
+        migrations.RunPython(backfill_rating_stats, migrations.RunPython.noop),
+    ]
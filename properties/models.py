@@ -1,7 +1,45 @@
 # airbnb-clone-project/properties/models.py
 
 from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.db.models import Q
+
+from properties.geo import bounding_box, encode_geohash, haversine_km
+
+
+class PropertyQuerySet(models.QuerySet):
+    """Location lookups, and geohashes for bulk inserts."""
+
+    def bulk_create(self, objs, *args, **kwargs):
+        # save() is skipped, so derive the geohash here
+        objs = list(objs)
+        for obj in objs:
+            obj.geohash = obj.compute_geohash()
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def in_bbox(self, west, south, east, north):
+        """Properties inside a box; ``west > east`` crosses the antimeridian."""
+        if west <= east:
+            longitude = Q(longitude__gte=west, longitude__lte=east)
+        else:
+            longitude = Q(longitude__gte=west) | Q(longitude__lte=east)
+        return self.filter(longitude, latitude__gte=south, latitude__lte=north)
+
+    def within(self, latitude, longitude, radius_km):
+        """Properties within ``radius_km`` of a point, annotated with
+        ``distance`` in km.
+
+        The bounding box of the circle narrows the candidates through the
+        (latitude, longitude) index; the exact distance is only computed
+        for those.
+        """
+        return (
+            self.in_bbox(*bounding_box(latitude, longitude, radius_km))
+            .annotate(distance=haversine_km(latitude, longitude))
+            .filter(distance__lte=radius_km)
+        )
 
 
 class Property(models.Model):
@@ -14,21 +52,70 @@ class Property(models.Model):
     description = models.TextField(blank=True)
     price_per_night = models.DecimalField(max_digits=10, decimal_places=2)
     bedrooms = models.PositiveIntegerField(default=1)
-    # Simple location for now; can be upgraded to PostGIS later
     city = models.CharField(max_length=100, help_text="City e.g., Accra, Kumasi")
     country = models.CharField(max_length=100, default="Ghana")
+    # WGS84 coordinates for the map, searched without PostGIS (see
+    # properties.geo); geohash is derived from them on save
+    latitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-90), MaxValueValidator(90)],
+    )
+    longitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-180), MaxValueValidator(180)],
+    )
+    geohash = models.CharField(max_length=12, blank=True, default="", editable=False)
     amenities = models.ManyToManyField(
         "amenities.Amenity", blank=True, related_name="properties"
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Weighted title/city/description vector; maintained by a PostgreSQL
+    # trigger and GIN-indexed (see migration 0002). Always NULL on SQLite.
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Review aggregates, maintained by properties.ratings; 0.00 means unrated
+    avg_rating = models.DecimalField(
+        max_digits=3, decimal_places=2, default=0, editable=False
+    )
+    review_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_1_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_2_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_3_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_4_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_5_count = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = PropertyQuerySet.as_manager()
 
     class Meta:
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["price_per_night"]),
             models.Index(fields=["city"]),
+            # ?ordering=-avg_rating (with the id tiebreaker) and ?min_rating=
+            models.Index(fields=["avg_rating", "id"]),
+            # Bounding-box prefilter of ?bbox= and ?near= searches
+            models.Index(fields=["latitude", "longitude"]),
+            # ?geohash= prefix lookups
+            models.Index(
+                fields=["geohash"],
+                name="properties_geohash_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
         ]
 
     def __str__(self) -> str:
         return f"{self.title} - {self.city}, {self.country}"
+
+    def compute_geohash(self):
+        if self.latitude is None or self.longitude is None:
+            return ""
+        return encode_geohash(self.latitude, self.longitude)
+
+    def save(self, *args, **kwargs):
+        self.geohash = self.compute_geohash()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"latitude", "longitude"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "geohash"}
+        return super().save(*args, **kwargs)
@@ -0,0 +1,116 @@
+# airbnb-clone-project/properties/ratings.py
+"""Denormalized review aggregates on Property.
+
+``review_count``, ``avg_rating`` and the per-star ``rating_N_count``
+histogram are kept current by reviews.signals, which calls
+``apply_rating_change`` with the ratings a write added or removed. Each
+change is a single ``UPDATE`` computed from the stored histogram, so
+concurrent reviews of the same property cannot lose updates.
+``rebuild_rating_stats`` recomputes everything from the reviews table with
+set-based updates (see the rebuild_ratings management command).
+"""
+
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import (
+    Avg,
+    Count,
+    Exists,
+    F,
+    FloatField,
+    Max,
+    OuterRef,
+    Q,
+    Subquery,
+    Value,
+)
+from django.db.models.functions import Cast, Coalesce, NullIf, Round
+
+from common.cache import bump_generation
+from properties import search_index
+from properties.models import Property
+from reviews.models import Review
+
+RATINGS = range(1, 6)
+
+
+def histogram_field(rating):
+    return f"rating_{rating}_count"
+
+
+HISTOGRAM_FIELDS = [histogram_field(rating) for rating in RATINGS]
+
+
+def apply_rating_change(property_id, added=(), removed=()):
+    """Add and remove individual ratings from a property's aggregates."""
+    deltas = Counter(added)
+    deltas.subtract(removed)
+    updates = {
+        histogram_field(rating): F(histogram_field(rating)) + delta
+        for rating, delta in deltas.items()
+        if delta
+    }
+    if not updates:
+        return
+
+    count = F("review_count") + (len(added) - len(removed))
+    total = sum(
+        (rating * F(histogram_field(rating)) for rating in RATINGS), Value(0)
+    ) + (sum(added) - sum(removed))
+    Property.objects.filter(pk=property_id).update(
+        review_count=count,
+        avg_rating=Coalesce(
+            Round(Cast(total, FloatField()) / NullIf(count, 0), 2), Value(0.0)
+        ),
+        **updates,
+    )
+    _invalidate(f"properties:{property_id}")
+    search_index.mark_changed(property_id)
+
+
+def rating_stats_expressions():
+    """Correlated subqueries computing every aggregate from the reviews table."""
+    reviews = (
+        Review.objects.filter(booking__property=OuterRef("pk"))
+        .order_by()
+        .values("booking__property")
+    )
+
+    def aggregate(expression):
+        return Coalesce(Subquery(reviews.annotate(value=expression).values("value")), 0)
+
+    return {
+        "review_count": aggregate(Count("pk")),
+        "avg_rating": aggregate(Round(Avg("rating", output_field=FloatField()), 2)),
+        **{
+            histogram_field(rating): aggregate(Count("pk", filter=Q(rating=rating)))
+            for rating in RATINGS
+        },
+    }
+
+
+def rebuild_rating_stats(batch_size=10000):
+    """Recompute every property's aggregates from its reviews.
+
+    Runs one set-based ``UPDATE`` per ``batch_size`` range of primary keys,
+    touching only properties that have reviews or claim to. Returns the
+    number of properties updated.
+    """
+    last = Property.objects.aggregate(last=Max("pk"))["last"] or 0
+    has_reviews = Exists(Review.objects.filter(booking__property=OuterRef("pk")))
+    updated = 0
+    for start in range(0, last + 1, batch_size):
+        updated += (
+            Property.objects.filter(pk__gte=start, pk__lt=start + batch_size)
+            .filter(Q(review_count__gt=0) | has_reviews)
+            .update(**rating_stats_expressions())
+        )
+    # Every property may have changed; "ratings" is a dependency of details
+    _invalidate("ratings")
+    search_index.mark_all_changed()
+    return updated
+
+
+def _invalidate(*namespaces):
+    transaction.on_commit(lambda: bump_generation("properties", *namespaces))
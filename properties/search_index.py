@@ -0,0 +1,450 @@
+# airbnb-clone-project/properties/search_index.py
+"""In-memory columnar index of the property list's filter and sort columns.
+
+With ``PROPERTY_INDEX_ENABLED``, each process keeps the columns the list
+endpoint filters and orders by (price, bedrooms, city, country, rating,
+review count, creation time and an amenity bitmap) as NumPy arrays, one
+slot per property in primary key order. A plain filtered, ordered page is
+then a few vectorized comparisons plus a partial sort, and the database
+only serves the page's rows by primary key.
+
+Writers record the primary keys they touch in a Redis change log (see
+``mark_changed``): a version counter and a sorted set of pks scored by the
+version that last changed them, updated together by one Lua script.
+``get_index`` compares the process' index version with the counter on
+every request and reloads just the changed rows. Trimming the log, or
+``mark_all_changed`` for writes that don't know which rows they touched,
+raises a floor version below which readers rebuild from scratch. Without a
+usable Redis there's no index, and the view falls back to the ORM.
+"""
+
+import logging
+import math
+import threading
+
+import numpy as np
+from django.db import transaction
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+
+from properties.models import Property
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "property-index:version"
+CHANGES_KEY = "property-index:changes"
+FLOOR_KEY = "property-index:floor"
+# Changed pks kept in the log; readers further behind rebuild
+CHANGE_LOG_SIZE = 100_000
+# Rows fetched per query when loading changes
+LOAD_BATCH_SIZE = 5000
+
+# Seed a missing counter from the clock, like common.cache.get_generations,
+# so a flushed Redis can't replay versions an index has already seen. The
+# floor moves up with it: the changes before it are lost.
+_SEED_VERSION = """
+local version = tonumber(redis.call('GET', KEYS[1]))
+if not version then
+  local now = redis.call('TIME')
+  version = now[1] * 1000000 + now[2]
+  redis.call('SET', KEYS[1], string.format('%d', version))
+  redis.call('SET', KEYS[3], string.format('%d', version))
+end
+"""
+
+
+def _seeded(body):
+    return _SEED_VERSION + body
+
+
+_CURRENT_VERSION = _seeded("""
+return {version, tonumber(redis.call('GET', KEYS[3]) or 0)}
+""")
+_MARK_CHANGED = _seeded("""
+version = redis.call('INCR', KEYS[1])
+for i = 2, #ARGV do
+  redis.call('ZADD', KEYS[2], version, ARGV[i])
+end
+local excess = redis.call('ZCARD', KEYS[2]) - tonumber(ARGV[1])
+if excess > 0 then
+  local dropped = redis.call('ZRANGE', KEYS[2], excess - 1, excess - 1, 'WITHSCORES')
+  redis.call('ZREMRANGEBYRANK', KEYS[2], 0, excess - 1)
+  redis.call('SET', KEYS[3], dropped[2])
+end
+return version
+""")
+_MARK_ALL_CHANGED = _seeded("""
+version = redis.call('INCR', KEYS[1])
+redis.call('SET', KEYS[3], version)
+redis.call('DEL', KEYS[2])
+return version
+""")
+
+FIELDS = (
+    "id",
+    "price_per_night",
+    "bedrooms",
+    "city",
+    "country",
+    "avg_rating",
+    "review_count",
+    "created_at",
+)
+# Dictionary-encoded string columns
+CODED_FIELDS = ("city", "country")
+
+_index = None
+_lock = threading.Lock()
+
+
+def _redis():
+    try:
+        return get_redis_connection("default")
+    except NotImplementedError:
+        # Not a django-redis cache (e.g. the dummy cache fallback)
+        return None
+
+
+def _run(script, args=()):
+    client = _redis()
+    if client is None:
+        return None
+    return client.register_script(script)(
+        keys=[VERSION_KEY, CHANGES_KEY, FLOOR_KEY], args=args
+    )
+
+
+def _record(script, args=()):
+    def record():
+        try:
+            _run(script, args)
+        except RedisError:
+            logger.warning("Could not record property index changes", exc_info=True)
+
+    record()
+    if transaction.get_connection().in_atomic_block:
+        # Readers may reload the old rows before this commits; marking the
+        # rows again afterwards makes them fetch the committed ones
+        transaction.on_commit(record)
+
+
+def mark_changed(*pks):
+    """Record that the indexed columns of these properties may have changed."""
+    if pks:
+        _record(_MARK_CHANGED, [CHANGE_LOG_SIZE, *pks])
+
+
+def mark_all_changed():
+    """Make every process rebuild its index, for writes of unknown rows."""
+    _record(_MARK_ALL_CHANGED)
+
+
+def get_index():
+    """This process' index, brought up to date; None if it can't be used.
+
+    One Redis round trip when nothing changed. Only one thread loads
+    changes at a time; the others get None meanwhile rather than waiting.
+    """
+    global _index
+    try:
+        version, floor = _run(_CURRENT_VERSION) or (None, None)
+        if version is None:
+            return None
+        index = _index
+        if index is not None and index.version == version:
+            return index
+        if not _lock.acquire(blocking=False):
+            return None
+        try:
+            index = _index
+            if index is None or not floor <= index.version <= version:
+                index = PropertyIndex.build(version)
+            elif index.version < version:
+                pks = _redis().zrangebyscore(CHANGES_KEY, f"({index.version}", version)
+                index = index.apply(version, [int(pk) for pk in pks])
+            _index = index
+            return index
+        finally:
+            _lock.release()
+    except RedisError:
+        logger.warning("Property index unavailable", exc_info=True)
+        return None
+
+
+def _load(pks=None):
+    """``(rows, links)``: ``FIELDS`` tuples and (property, amenity) pairs."""
+    properties = Property.objects.order_by("pk")
+    links = Property.amenities.through.objects.order_by()
+    if pks is None:
+        return (
+            list(properties.values_list(*FIELDS)),
+            list(links.values_list("property_id", "amenity_id")),
+        )
+    rows, pairs = [], []
+    for start in range(0, len(pks), LOAD_BATCH_SIZE):
+        batch = pks[start : start + LOAD_BATCH_SIZE]
+        rows += properties.filter(pk__in=batch).values_list(*FIELDS)
+        pairs += links.filter(property_id__in=batch).values_list(
+            "property_id", "amenity_id"
+        )
+    return rows, pairs
+
+
+def _narrow(values):
+    """Smallest unsigned array holding the non-negative integers ``values``."""
+    values = np.asarray(values, dtype=np.int64)
+    return values.astype(np.min_scalar_type(int(values.max(initial=0))))
+
+
+def _bit(slots):
+    """Each slot's bit within its byte of a packed bitmap."""
+    return np.left_shift(1, slots & 7).astype(np.uint8)
+
+
+class PropertyIndex:
+    """Column arrays for one version of the properties table.
+
+    ``columns`` holds one array per name in ``FIELDS``, ordered by ``id``;
+    city and country are codes into ``vocabulary``, ``avg_rating`` is in
+    hundredths and ``created_at`` in microseconds since the epoch.
+    ``amenities`` holds a bitmap per amenity, in row
+    ``amenity_rows[amenity_id]``, with bit ``i`` (little-endian
+    ``np.packbits`` order) set when property ``i`` has it. Deleted rows stay
+    in place with ``alive`` cleared until the next rebuild.
+
+    Instances are never modified once built; ``apply`` returns a new one, so
+    searches running in other threads keep a consistent view.
+    """
+
+    def __init__(self, version, columns, alive, amenities, amenity_rows, vocabulary):
+        self.version = version
+        self.columns = columns
+        self.alive = alive
+        self.amenities = amenities
+        self.amenity_rows = amenity_rows
+        self.vocabulary = vocabulary
+        # ordering -> every slot in that order, computed on demand
+        self._orders = {}
+
+    def __len__(self):
+        return int(self.alive.sum())
+
+    def search(self, filters, ordering):
+        """Rows matching ``filters``, as ids sorted by ``ordering``.
+
+        ``filters`` is the cleaned data of properties.filters.PropertyFilter,
+        whose stay dates the index can't answer; ``ordering`` is a list like
+        ``["-created_at"]``. The primary key breaks ties, in the direction of
+        the last ordering field like common.pagination.KeysetPagination.
+        """
+        columns = self.columns
+        mask = self.alive.copy()
+        for name in CODED_FIELDS:
+            if filters.get(name):
+                code = self.vocabulary[name].get(filters[name])
+                mask &= False if code is None else columns[name] == code
+        if filters.get("bedrooms") is not None:
+            # Truncated like IntegerField.get_prep_value does for the ORM
+            mask &= columns["bedrooms"] == int(filters["bedrooms"])
+        if filters.get("min_rating") is not None:
+            mask &= columns["avg_rating"] >= math.ceil(filters["min_rating"] * 100)
+        if filters.get("min_price") is not None:
+            mask &= columns["price_per_night"] >= float(filters["min_price"])
+        if filters.get("max_price") is not None:
+            mask &= columns["price_per_night"] <= float(filters["max_price"])
+        if filters.get("amenities"):
+            # Any of the amenities, like the ORM filter
+            rows = [
+                self.amenity_rows[amenity.pk]
+                for amenity in filters["amenities"]
+                if amenity.pk in self.amenity_rows
+            ]
+            packed = np.bitwise_or.reduce(self.amenities[rows], axis=0)
+            mask &= np.unpackbits(packed, count=len(mask), bitorder="little").view(bool)
+        return SearchResult(self, mask, tuple(ordering))
+
+    def top(self, mask, count, ordering, limit):
+        """Slots of the first ``limit`` of the ``count`` matches in ``mask``."""
+        if limit <= 0 or count == 0:
+            return np.empty(0, dtype=np.intp)
+        order = self._orders.get(ordering)
+        # Walking the ordering visits about limit * len(mask) / count slots,
+        # sorting the matches costs about count * log(count)
+        if count * count < limit * len(mask) or (
+            order is None and count * 8 < len(mask)
+        ):
+            slots = np.flatnonzero(mask)
+            return slots[np.lexsort(self._sort_keys(ordering, slots))][:limit]
+
+        if order is None:
+            order = np.lexsort(self._sort_keys(ordering, slice(None)))
+            self._orders[ordering] = order
+        # Walk the full ordering in chunks expected to hold ``limit`` matches
+        chunk = max(4096, 2 * limit * len(mask) // count)
+        found = []
+        for start in range(0, len(order), chunk):
+            slots = order[start : start + chunk]
+            slots = slots[mask[slots]][:limit]
+            found.append(slots)
+            limit -= len(slots)
+            if limit == 0:
+                break
+        return np.concatenate(found)
+
+    def _sort_keys(self, ordering, slots):
+        """``np.lexsort`` keys (least significant first) for ``slots``."""
+        descending = bool(ordering) and ordering[-1].startswith("-")
+        keys = [self.columns["id"][slots]]
+        if descending:
+            keys[0] = -keys[0]
+        for name in reversed(ordering):
+            key = self.columns[name.lstrip("-")][slots]
+            if name.startswith("-"):
+                key = -key.astype(np.float64 if key.dtype.kind == "f" else np.int64)
+            keys.append(key)
+        return keys
+
+    @classmethod
+    def build(cls, version):
+        rows, links = _load()
+        vocabulary = {name: {} for name in CODED_FIELDS}
+        empty = cls(
+            version,
+            columns=cls._encode([], vocabulary),
+            alive=np.empty(0, dtype=bool),
+            amenities=np.empty((0, 0), dtype=np.uint8),
+            amenity_rows={},
+            vocabulary=vocabulary,
+        )
+        return empty._with(version, rows, links, removed=())
+
+    def apply(self, version, pks):
+        """A copy at ``version`` with the rows of ``pks`` reloaded."""
+        rows, links = _load(pks)
+        return self._with(version, rows, links, removed=pks)
+
+    @staticmethod
+    def _encode(rows, vocabulary):
+        """``FIELDS`` tuples as column arrays, growing ``vocabulary``."""
+        values = dict(zip(FIELDS, zip(*rows))) if rows else dict.fromkeys(FIELDS, ())
+        codes = {
+            name: [
+                vocabulary[name].setdefault(value, len(vocabulary[name]))
+                for value in values[name]
+            ]
+            for name in CODED_FIELDS
+        }
+        return {
+            "id": np.array(values["id"], dtype=np.int64),
+            "price_per_night": np.array(values["price_per_night"], dtype=np.float64),
+            "bedrooms": _narrow(values["bedrooms"]),
+            "city": _narrow(codes["city"]),
+            "country": _narrow(codes["country"]),
+            "avg_rating": np.rint(
+                np.array(values["avg_rating"], dtype=np.float64) * 100
+            ).astype(np.int16),
+            "review_count": _narrow(values["review_count"]),
+            "created_at": np.array(
+                [value.replace(tzinfo=None) for value in values["created_at"]],
+                dtype="datetime64[us]",
+            ).view(np.int64),
+        }
+
+    def _with(self, version, rows, links, removed):
+        """A copy at ``version``: ``rows`` upserted, other ``removed`` pks dead."""
+        vocabulary = {name: dict(codes) for name, codes in self.vocabulary.items()}
+        new = self._encode(rows, vocabulary)
+        ids = self.columns["id"]
+
+        # Upsert: overwrite rows that exist, append the others
+        slots = np.searchsorted(ids, new["id"])
+        exists = slots < len(ids)
+        exists[exists] = ids[slots[exists]] == new["id"][exists]
+        added = ~exists
+        columns = {}
+        for name, column in self.columns.items():
+            column = column.astype(np.promote_types(column.dtype, new[name].dtype))
+            column[slots[exists]] = new[name][exists]
+            columns[name] = np.concatenate([column, new[name][added]])
+        alive = np.concatenate([self.alive, np.ones(added.sum(), dtype=bool)])
+        slots[added] = len(ids) + np.arange(added.sum())
+
+        if len(ids):
+            removed = np.setdiff1d(np.asarray(removed, dtype=np.int64), new["id"])
+            dead = np.searchsorted(ids, removed).clip(max=len(ids) - 1)
+            alive[dead[ids[dead] == removed]] = False
+
+        # Amenity bitmaps: clear the reloaded slots, then set their links
+        width = (len(alive) + 7) // 8
+        amenities = np.zeros((len(self.amenities), width), dtype=np.uint8)
+        amenities[:, : self.amenities.shape[1]] = self.amenities
+        keep = np.full(width, 0xFF, dtype=np.uint8)
+        np.bitwise_and.at(keep, slots >> 3, ~_bit(slots))
+        amenities &= keep
+        amenity_rows = dict(self.amenity_rows)
+        if links and rows:
+            pairs = np.array(links, dtype=np.int64)
+            by_id = np.argsort(new["id"])
+            found = by_id[
+                np.searchsorted(new["id"], pairs[:, 0], sorter=by_id).clip(
+                    max=len(by_id) - 1
+                )
+            ]
+            # Links of rows inserted after the rows were read are skipped
+            known = new["id"][found] == pairs[:, 0]
+            targets = slots[found[known]]
+            positions = [
+                amenity_rows.setdefault(amenity_id, len(amenity_rows))
+                for amenity_id in pairs[known, 1].tolist()
+            ]
+            if len(amenity_rows) > len(amenities):
+                amenities = np.vstack(
+                    [
+                        amenities,
+                        np.zeros(
+                            (len(amenity_rows) - len(amenities), width),
+                            dtype=np.uint8,
+                        ),
+                    ]
+                )
+            np.bitwise_or.at(amenities, (positions, targets >> 3), _bit(targets))
+
+        if np.any(np.diff(columns["id"]) < 0):
+            # Keep the columns sorted by id for searchsorted
+            order = np.argsort(columns["id"], kind="stable")
+            columns = {name: column[order] for name, column in columns.items()}
+            alive = alive[order]
+            amenities = np.packbits(
+                np.unpackbits(amenities, axis=1, count=len(order), bitorder="little")[
+                    :, order
+                ],
+                axis=1,
+                bitorder="little",
+            )
+        return PropertyIndex(
+            version, columns, alive, amenities, amenity_rows, vocabulary
+        )
+
+
+class SearchResult:
+    """Ids of a search's matches, ordered lazily.
+
+    Supports ``len()`` and slicing, which is all a paginator needs: a slice
+    only orders the matches up to its end.
+    """
+
+    def __init__(self, index, mask, ordering):
+        self.index = index
+        self.mask = mask
+        self.ordering = ordering
+        self.count = int(np.count_nonzero(mask))
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            raise TypeError("SearchResult only supports slicing")
+        start, stop, step = key.indices(self.count)
+        slots = self.index.top(self.mask, self.count, self.ordering, stop)
+        return self.index.columns["id"][slots[start:stop:step]].tolist()
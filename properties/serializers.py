@@ -1,14 +1,35 @@
 # airbnb-clone-project/properties/serializers.py
 
+import datetime
+from collections import defaultdict
+
 from rest_framework import serializers
 
+from amenities.serializers import AmenitySerializer
+from common.fields import BulkPrimaryKeyRelatedField
+from common.serializers import (
+    BulkCreateListSerializer,
+    FieldsetMixin,
+    ValuesSerializer,
+)
 from properties.models import Property
+from properties.ratings import HISTOGRAM_FIELDS, RATINGS, histogram_field
+from users.serializers import UserSummarySerializer
+
 
+class PropertySerializer(FieldsetMixin, serializers.ModelSerializer):
+    """Serialize property fields, exposing amenity IDs list.
 
-class PropertySerializer(serializers.ModelSerializer):
-    """Serialize property fields, exposing amenity IDs list."""
+    Supports ``?fields=`` and ``?include=host,amenities`` (see FieldsetMixin).
+    """
 
-    amenity_ids = serializers.PrimaryKeyRelatedField(
+    expandable_fields = {"host": UserSummarySerializer, "amenities": AmenitySerializer}
+    fieldset_columns = {"rating_histogram": HISTOGRAM_FIELDS}
+    # Submitted amenity ids are looked up with one query, not one each
+    serializer_related_field = BulkPrimaryKeyRelatedField
+
+    rating_histogram = serializers.SerializerMethodField()
+    amenity_ids = BulkPrimaryKeyRelatedField(
         many=True,
         write_only=True,
         source="amenities",
@@ -26,14 +47,113 @@ class PropertySerializer(serializers.ModelSerializer):
             "bedrooms",
             "city",
             "country",
+            "latitude",
+            "longitude",
+            "geohash",
             "amenities",
             "amenity_ids",
+            "avg_rating",
+            "review_count",
+            "rating_histogram",
             "created_at",
             "updated_at",
         ]
         read_only_fields = ["id", "created_at", "updated_at", "host"]
+        # POST /properties/bulk/
+        list_serializer_class = BulkCreateListSerializer
+
+    def validate(self, attrs):
+        latitude = attrs.get("latitude", getattr(self.instance, "latitude", None))
+        longitude = attrs.get("longitude", getattr(self.instance, "longitude", None))
+        if (latitude is None) != (longitude is None):
+            raise serializers.ValidationError(
+                "latitude and longitude must be set together."
+            )
+        return attrs
+
+    def get_rating_histogram(self, instance):
+        """Review counts per star, e.g. {"1": 0, ..., "5": 12}."""
+        return {
+            str(rating): getattr(instance, histogram_field(rating))
+            for rating in RATINGS
+        }
+
+
+class PropertyValuesSerializer(ValuesSerializer):
+    """``PropertySerializer`` output for list pages, built from ``values()`` rows."""
+
+    serializer_class = PropertySerializer
+    computed_fields = ("amenities", "rating_histogram")
+    # fill() matches amenity links to rows by id, even under ?fields=
+    extra_columns = ["id", *HISTOGRAM_FIELDS]
+
+    def fill(self, rows, data):
+        if "amenities" in self.field_names:
+            # One query for the whole page, in Amenity's default (name)
+            # ordering like the prefetch PropertySerializer reads
+            links = (
+                Property.amenities.through.objects.filter(
+                    property_id__in=[row["id"] for row in rows]
+                )
+                .order_by("amenity__name")
+                .values_list("property_id", "amenity_id")
+            )
+            amenities = defaultdict(list)
+            for property_id, amenity_id in links:
+                amenities[property_id].append(amenity_id)
+            for row, item in zip(rows, data):
+                item["amenities"] = amenities[row["id"]]
+
+        if "rating_histogram" in self.field_names:
+            for row, item in zip(rows, data):
+                item["rating_histogram"] = {
+                    str(rating): row[histogram_field(rating)] for rating in RATINGS
+                }
+
+
+class PropertySummarySerializer(serializers.ModelSerializer):
+    """A listing's headline fields, for embedding in other resources."""
+
+    class Meta:
+        model = Property
+        fields = ["id", "title", "city", "country", "price_per_night"]
+        read_only_fields = fields
+
+
+class AvailabilityQuerySerializer(serializers.Serializer):
+    """Validate the ?from=&to= window of the availability calendar."""
+
+    MAX_DAYS = 366
+    DEFAULT_DAYS = 90
+
+    def get_fields(self):
+        # "from" is a Python keyword, so the fields can't be declared as attributes
+        return {
+            "from": serializers.DateField(required=False),
+            "to": serializers.DateField(required=False),
+        }
+
+    def validate(self, attrs):
+        start = attrs.get("from") or datetime.date.today()
+        end = attrs.get("to") or start + datetime.timedelta(days=self.DEFAULT_DAYS)
+        if end <= start:
+            raise serializers.ValidationError({"to": "Must be after 'from'."})
+        if (end - start).days > self.MAX_DAYS:
+            raise serializers.ValidationError(
+                {"to": f"Window may span at most {self.MAX_DAYS} days."}
+            )
+        return {"from": start, "to": end}
+
+
+class FacetQuerySerializer(serializers.Serializer):
+    """Validate the ?price_buckets= of the facets endpoint."""
+
+    price_buckets = serializers.IntegerField(
+        required=False, default=10, min_value=1, max_value=50
+    )
+
+
+class ClusterQuerySerializer(serializers.Serializer):
+    """Validate the ?zoom= of the map clusters endpoint."""
 
-    def to_representation(self, instance):
-        data = super().to_representation(instance)
-        data["amenities"] = [a.id for a in instance.amenities.all()]
-        return data
+    zoom = serializers.IntegerField(min_value=0, max_value=20)
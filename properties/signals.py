@@ -0,0 +1,52 @@
+# airbnb-clone-project/properties/signals.py
+
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from amenities.models import Amenity
+from common.cache import bump_generation
+from properties import search_index
+from properties.models import Property
+
+
+@receiver(post_save, sender=Property, dispatch_uid="properties.property_saved")
+@receiver(post_delete, sender=Property, dispatch_uid="properties.property_deleted")
+def invalidate_property_cache(sender, instance, **kwargs):
+    """Drop cached listings and this property's cached detail."""
+    bump_generation("properties", f"properties:{instance.pk}")
+    search_index.mark_changed(instance.pk)
+
+
+@receiver(
+    m2m_changed,
+    sender=Property.amenities.through,
+    dispatch_uid="properties.property_amenities_changed",
+)
+def invalidate_property_amenities_cache(sender, instance, action, pk_set, **kwargs):
+    """Amenity links changed from either side of the relation."""
+    if not action.startswith("post_"):
+        return
+    if isinstance(instance, Property):
+        bump_generation("properties", f"properties:{instance.pk}")
+        search_index.mark_changed(instance.pk)
+    elif pk_set:
+        # Reverse side, e.g. amenity.properties.add(...)
+        bump_generation("properties", *(f"properties:{pk}" for pk in pk_set))
+        search_index.mark_changed(*pk_set)
+    else:
+        # amenity.properties.clear() does not say which properties changed
+        bump_generation("properties", "amenities")
+        search_index.mark_all_changed()
+
+
+@receiver(post_save, sender=Amenity, dispatch_uid="properties.amenity_saved")
+@receiver(post_delete, sender=Amenity, dispatch_uid="properties.amenity_deleted")
+def invalidate_amenity_cache(sender, instance, **kwargs):
+    """Deleting an amenity silently removes it from every property."""
+    bump_generation("properties", "amenities")
+
+
+@receiver(post_delete, sender=Amenity, dispatch_uid="properties.amenity_unlinked")
+def invalidate_amenity_index(sender, instance, **kwargs):
+    """The deleted amenity's links are gone without an m2m_changed signal."""
+    search_index.mark_all_changed()
@@ -1,10 +1,30 @@
 # airbnb-clone-project/properties/tests.py
 
 
+import datetime as dt
+import io
+import json
+import time
+
 import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import http_date
 from rest_framework.test import APIClient
 
-from tests.factories import AmenityFactory, UserFactory
+from properties import availability, search_index
+from properties.geo import bounding_box, encode_geohash
+from properties.models import Property
+from properties.ratings import HISTOGRAM_FIELDS
+from properties.serializers import PropertySerializer
+from tests.factories import (
+    AmenityFactory,
+    BookingFactory,
+    PropertyFactory,
+    ReviewFactory,
+    UserFactory,
+)
 
 
 @pytest.mark.django_db
@@ -29,3 +49,722 @@ def test_create_property_with_amenities():
     assert resp.status_code == 201, resp.data
     assert resp.data["city"] == "Accra"
     assert len(resp.data["amenities"]) == 2
+
+
+@pytest.mark.django_db
+def test_list_properties_filtered_by_availability():
+    wifi = AmenityFactory(name="WiFi")
+    booked = PropertyFactory(title="Booked", amenities=[wifi])
+    cancelled = PropertyFactory(title="Cancelled stay", amenities=[wifi])
+    free = PropertyFactory(title="Free", amenities=[wifi])
+    BookingFactory(
+        property=booked,
+        check_in_date=dt.date(2025, 10, 10),
+        check_out_date=dt.date(2025, 10, 15),
+        status="confirmed",
+    )
+    BookingFactory(
+        property=cancelled,
+        check_in_date=dt.date(2025, 10, 10),
+        check_out_date=dt.date(2025, 10, 15),
+        status="cancelled",
+    )
+    # Back-to-back stay: checking out on the 12th leaves the 12th free
+    BookingFactory(
+        property=free,
+        check_in_date=dt.date(2025, 10, 8),
+        check_out_date=dt.date(2025, 10, 12),
+        status="pending",
+    )
+
+    client = APIClient()
+    resp = client.get(
+        "/api/v1/properties/", {"check_in": "2025-10-12", "check_out": "2025-10-14"}
+    )
+    assert resp.status_code == 200, resp.data
+    ids = {p["id"] for p in resp.data["results"]}
+    assert ids == {cancelled.id, free.id}
+
+
+@pytest.mark.django_db
+def test_availability_filter_requires_ordered_date_pair():
+    client = APIClient()
+    resp = client.get("/api/v1/properties/", {"check_in": "2025-10-12"})
+    assert resp.status_code == 400
+
+    resp = client.get(
+        "/api/v1/properties/", {"check_in": "2025-10-14", "check_out": "2025-10-12"}
+    )
+    assert resp.status_code == 400
+
+
+@pytest.mark.django_db
+def test_search_properties_by_text():
+    wifi = AmenityFactory(name="WiFi")
+    garden = PropertyFactory(
+        title="Garden view in Kumasi",
+        description="Quiet compound",
+        city="Kumasi",
+        amenities=[wifi],
+    )
+    PropertyFactory(
+        title="Beach house", description="Ocean front", city="Accra", amenities=[wifi]
+    )
+
+    client = APIClient()
+    resp = client.get("/api/v1/properties/", {"search": "garden"})
+    assert resp.status_code == 200, resp.data
+    assert [p["id"] for p in resp.data["results"]] == [garden.id]
+
+
+@pytest.mark.django_db
+def test_search_orders_postgres_matches_by_rank():
+    from django.db import connection
+
+    if connection.vendor != "postgresql":
+        pytest.skip("Full-text ranking requires PostgreSQL")
+
+    wifi = AmenityFactory(name="WiFi")
+    in_title = PropertyFactory(
+        title="Pool villa", description="Spacious", city="Tema", amenities=[wifi]
+    )
+    in_description = PropertyFactory(
+        title="Family home",
+        description="Shared pool nearby",
+        city="Tema",
+        amenities=[wifi],
+    )
+    # in_description is newer, so relevance must override -created_at
+
+    client = APIClient()
+    resp = client.get("/api/v1/properties/", {"search": "pools"})
+    assert resp.status_code == 200, resp.data
+    assert [p["id"] for p in resp.data["results"]] == [in_title.id, in_description.id]
+
+
+@pytest.mark.django_db
+def test_anonymous_listing_cache_is_invalidated_on_edit(django_assert_num_queries):
+    wifi = AmenityFactory(name="WiFi")
+    prop = PropertyFactory(title="Old title", amenities=[wifi])
+    client = APIClient()
+
+    resp = client.get("/api/v1/properties/")
+    assert resp["X-Cache"] == "MISS"
+    with django_assert_num_queries(0):
+        resp = client.get("/api/v1/properties/")
+    assert resp["X-Cache"] == "HIT"
+    assert resp.data["results"][0]["title"] == "Old title"
+
+    prop.title = "New title"
+    prop.save()
+    resp = client.get("/api/v1/properties/")
+    assert resp["X-Cache"] == "MISS"
+    assert resp.data["results"][0]["title"] == "New title"
+
+    detail_url = f"/api/v1/properties/{prop.id}/"
+    client.get(detail_url)
+    assert client.get(detail_url)["X-Cache"] == "HIT"
+    pool = AmenityFactory(name="Pool")
+    prop.amenities.add(pool)
+    resp = client.get(detail_url)
+    assert resp["X-Cache"] == "MISS"
+    assert set(resp.data["amenities"]) == {wifi.id, pool.id}
+
+    # Authenticated requests bypass the cache entirely
+    client.force_authenticate(UserFactory())
+    assert "X-Cache" not in client.get(detail_url)
+
+
+@pytest.mark.django_db
+def test_availability_calendar_merges_and_caches_busy_ranges(
+    django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    prop = PropertyFactory(amenities=[AmenityFactory(name="WiFi")])
+    # Back-to-back stays across a month boundary merge into one range
+    BookingFactory(
+        property=prop,
+        check_in_date=dt.date(2025, 10, 28),
+        check_out_date=dt.date(2025, 11, 2),
+        status="confirmed",
+    )
+    BookingFactory(
+        property=prop,
+        check_in_date=dt.date(2025, 11, 2),
+        check_out_date=dt.date(2025, 11, 5),
+        status="pending",
+    )
+    BookingFactory(
+        property=prop,
+        check_in_date=dt.date(2025, 11, 20),
+        check_out_date=dt.date(2025, 11, 22),
+        status="cancelled",
+    )
+
+    client = APIClient()
+    url = f"/api/v1/properties/{prop.id}/availability/"
+    params = {"from": "2025-10-01", "to": "2025-12-01"}
+    resp = client.get(url, params)
+    assert resp.status_code == 200, resp.data
+    assert resp.json()["busy"] == [{"start": "2025-10-28", "end": "2025-11-05"}]
+    # No guest details leak through the calendar
+    assert set(resp.json()) == {"property", "from", "to", "busy"}
+
+    with django_assert_num_queries(0):
+        assert client.get(url, params).json()["busy"] == resp.json()["busy"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        BookingFactory(
+            property=prop,
+            check_in_date=dt.date(2025, 11, 10),
+            check_out_date=dt.date(2025, 11, 12),
+            status="confirmed",
+        )
+    assert client.get(url, params).json()["busy"] == [
+        {"start": "2025-10-28", "end": "2025-11-05"},
+        {"start": "2025-11-10", "end": "2025-11-12"},
+    ]
+
+    assert (
+        client.get(url, {"from": "2025-12-01", "to": "2025-11-01"}).status_code == 400
+    )
+    assert client.get("/api/v1/properties/999999/availability/").status_code == 404
+
+
+@pytest.mark.django_db
+def test_availability_reader_cannot_recache_blocks_a_booking_retired(
+    monkeypatch, django_capture_on_commit_callbacks
+):
+    prop = PropertyFactory(amenities=[AmenityFactory(name="WiFi")])
+    start, end = dt.date(2025, 11, 1), dt.date(2025, 12, 1)
+    load_months = availability._load_months
+
+    def load_then_book(property_id, months):
+        blocks = load_months(property_id, months)
+        # A booking commits between the reader's query and its cache write
+        with django_capture_on_commit_callbacks(execute=True):
+            BookingFactory(
+                property=prop,
+                check_in_date=dt.date(2025, 11, 10),
+                check_out_date=dt.date(2025, 11, 12),
+                status="confirmed",
+            )
+        return blocks
+
+    monkeypatch.setattr(availability, "_load_months", load_then_book)
+    assert availability.get_busy_ranges(prop.id, start, end) == []
+    monkeypatch.setattr(availability, "_load_months", load_months)
+    assert availability.get_busy_ranges(prop.id, start, end) == [
+        (dt.date(2025, 11, 10), dt.date(2025, 11, 12))
+    ]
+
+
+def _review(prop, rating, week):
+    booking = BookingFactory(
+        property=prop,
+        status="confirmed",
+        check_in_date=dt.date(2025, 1, 1) + dt.timedelta(weeks=week),
+    )
+    return ReviewFactory(booking=booking, rating=rating)
+
+
+def _rating_stats(prop):
+    return Property.objects.filter(pk=prop.pk).values(
+        "avg_rating", "review_count", *HISTOGRAM_FIELDS
+    )[0]
+
+
+@pytest.mark.django_db
+def test_rating_aggregates_follow_review_writes():
+    wifi = AmenityFactory(name="WiFi")
+    prop = PropertyFactory(amenities=[wifi])
+    other = PropertyFactory(amenities=[wifi])
+
+    reviews = [_review(prop, rating, week) for week, rating in enumerate([5, 4, 4])]
+    stats = _rating_stats(prop)
+    assert stats["review_count"] == 3
+    assert str(stats["avg_rating"]) == "4.33"
+    assert [stats[f] for f in HISTOGRAM_FIELDS] == [0, 0, 0, 2, 1]
+
+    reviews[0].rating = 1
+    reviews[0].save()
+    reviews[1].delete()
+    # Moving a review to another stay moves its rating too
+    reviews[2].booking = BookingFactory(
+        property=other, guest=reviews[2].author, check_in_date=dt.date(2025, 6, 1)
+    )
+    reviews[2].save()
+    _review(prop, 2, week=10)
+
+    stats = _rating_stats(prop)
+    assert stats["review_count"] == 2
+    assert str(stats["avg_rating"]) == "1.50"
+    assert [stats[f] for f in HISTOGRAM_FIELDS] == [1, 1, 0, 0, 0]
+    assert _rating_stats(other)["review_count"] == 1
+
+    # A full rebuild agrees with the incremental bookkeeping
+    before = [_rating_stats(p) for p in (prop, other)]
+    Property.objects.update(avg_rating=0, review_count=0, rating_1_count=7)
+    call_command("rebuild_ratings", stdout=io.StringIO())
+    assert [_rating_stats(p) for p in (prop, other)] == before
+
+
+@pytest.mark.django_db
+def test_filter_and_order_properties_by_rating():
+    wifi = AmenityFactory(name="WiFi")
+    top, mid, unrated = (PropertyFactory(amenities=[wifi]) for _ in range(3))
+    _review(top, 5, week=0)
+    _review(mid, 3, week=0)
+    _review(mid, 4, week=1)
+
+    client = APIClient()
+    resp = client.get("/api/v1/properties/", {"ordering": "-avg_rating"})
+    assert [p["id"] for p in resp.data["results"]] == [top.id, mid.id, unrated.id]
+    assert resp.data["results"][1]["rating_histogram"] == {
+        "1": 0,
+        "2": 0,
+        "3": 1,
+        "4": 1,
+        "5": 0,
+    }
+
+    resp = client.get("/api/v1/properties/", {"min_rating": "3.5"})
+    assert {p["id"] for p in resp.data["results"]} == {top.id, mid.id}
+    assert client.get("/api/v1/properties/", {"min_rating": "6"}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_list_values_path_matches_property_serializer(django_assert_max_num_queries):
+    pool = AmenityFactory(name="Pool"), AmenityFactory(name="Air Conditioning")
+    wifi = AmenityFactory(name="WiFi")
+    # More than one page (PAGE_SIZE is 20)
+    props = [PropertyFactory(amenities=[wifi, *pool[: i % 3]]) for i in range(22)]
+    Property.objects.filter(pk=props[1].pk).update(description="")
+    Property.objects.filter(pk=props[2].pk).update(price_per_night="99.50")
+    _review(props[0], 5, week=0)
+    _review(props[0], 2, week=1)
+
+    expected = PropertySerializer(
+        Property.objects.prefetch_related("amenities").order_by("-created_at", "-id"),
+        many=True,
+    ).data
+    client = APIClient()
+    # count, page and the page's amenity ids
+    with django_assert_max_num_queries(3):
+        resp = client.get("/api/v1/properties/")
+    assert resp.status_code == 200
+    pages = resp.json()["results"] + client.get(resp.json()["next"]).json()["results"]
+    assert json.dumps(pages) == json.dumps(expected)
+
+    # Keyset pages are built from values() rows too
+    pages, url = [], "/api/v1/properties/?cursor="
+    while url:
+        body = client.get(url).json()
+        pages.extend(body["results"])
+        url = body["next"]
+    assert json.dumps(pages) == json.dumps(expected)
+
+
+@pytest.mark.django_db
+def test_sparse_fieldsets_and_included_relations():
+    wifi, pool = AmenityFactory(name="WiFi"), AmenityFactory(name="Pool")
+    prop = PropertyFactory(amenities=[wifi, pool])
+    client = APIClient()
+
+    with CaptureQueriesContext(connection) as queries:
+        resp = client.get("/api/v1/properties/", {"fields": "id,title,city"})
+    assert resp.json()["results"] == [
+        {"id": prop.id, "title": prop.title, "city": prop.city}
+    ]
+    assert not any("description" in q["sql"] for q in queries.captured_queries)
+
+    with CaptureQueriesContext(connection) as queries:
+        resp = client.get(f"/api/v1/properties/{prop.id}/", {"fields": "title"})
+    assert resp.json() == {"title": prop.title}
+    assert not any("description" in q["sql"] for q in queries.captured_queries)
+
+    def include_queries():
+        with CaptureQueriesContext(connection) as queries:
+            resp = client.get(
+                "/api/v1/properties/",
+                {"include": "host,amenities", "fields": "id,rating_histogram"},
+            )
+        assert resp.status_code == 200
+        return resp.json()["results"], len(queries)
+
+    results, count = include_queries()
+    assert results[0]["host"]["id"] == prop.host_id
+    assert [a["name"] for a in results[0]["amenities"]] == ["Pool", "WiFi"]
+    assert results[0]["rating_histogram"]["5"] == 0
+    assert set(results[0]) == {"id", "host", "amenities", "rating_histogram"}
+
+    # Host joined, amenities prefetched: more listings, same queries
+    for _ in range(3):
+        PropertyFactory(amenities=[wifi])
+    results, more = include_queries()
+    assert len(results) == 4 and more == count
+
+    resp = client.get("/api/v1/properties/", {"fields": "id,secret", "include": "x"})
+    assert resp.status_code == 400
+    assert set(resp.json()) == {"fields", "include"}
+
+
+@pytest.mark.django_db
+def test_property_detail_conditional_get(django_capture_on_commit_callbacks):
+    prop = PropertyFactory(amenities=[AmenityFactory(name="WiFi")])
+    client = APIClient()
+    url = f"/api/v1/properties/{prop.id}/"
+
+    resp = client.get(url)
+    etag = resp["ETag"]
+    assert resp.status_code == 200 and etag.startswith('W/"')
+    # Rating and amenity changes leave no timestamp to validate against
+    assert not resp.has_header("Last-Modified")
+
+    with CaptureQueriesContext(connection) as queries:
+        resp = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == 304 and resp["ETag"] == etag
+    assert len(queries) == 1
+    since = http_date(time.time() + 60)
+    assert client.get(url, HTTP_IF_MODIFIED_SINCE=since).status_code == 200
+    # Another representation of the same listing has its own ETag
+    assert client.get(url, {"fields": "id"}, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    # Ratings don't touch updated_at, but still change the body
+    with django_capture_on_commit_callbacks(execute=True):
+        _review(prop, 4, week=0)
+    resp = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == 200 and resp["ETag"] != etag
+
+    prop.title = "Renamed"
+    prop.save()
+    assert client.get(url, HTTP_IF_NONE_MATCH=resp["ETag"]).status_code == 200
+    assert (
+        client.get("/api/v1/properties/0/", HTTP_IF_NONE_MATCH=etag).status_code == 404
+    )
+
+
+@pytest.mark.django_db
+def test_amenity_ids_are_resolved_with_one_query():
+    host = UserFactory(user_type="host")
+    amenities = [AmenityFactory(name=f"Amenity {i:02}") for i in range(30)]
+    client = APIClient()
+    client.force_authenticate(host)
+    payload = {
+        "title": "Beach house",
+        "price_per_night": "500.00",
+        "bedrooms": 3,
+        "city": "Ada",
+        "country": "Ghana",
+        "amenity_ids": [a.id for a in reversed(amenities)],
+    }
+
+    with CaptureQueriesContext(connection) as queries:
+        resp = client.post("/api/v1/properties/", payload, format="json")
+    assert resp.status_code == 201, resp.data
+    assert resp.data["amenities"] == [a.id for a in amenities]
+    sql = [q["sql"] for q in queries.captured_queries]
+    insert = next(i for i, q in enumerate(sql) if q.startswith("INSERT"))
+    # Validation resolves all 30 ids with a single lookup
+    assert [q for q in sql[:insert] if '"amenities_amenity"' in q] == sql[:1]
+
+    missing = max(a.id for a in amenities) + 1
+    payload["amenity_ids"] = [amenities[0].id, missing, missing + 1]
+    resp = client.post("/api/v1/properties/", payload, format="json")
+    assert resp.status_code == 400
+    assert resp.data["amenity_ids"] == [
+        f'Invalid pk "{missing}" - object does not exist.',
+        f'Invalid pk "{missing + 1}" - object does not exist.',
+    ]
+    payload["amenity_ids"] = ["wifi"]
+    resp = client.post("/api/v1/properties/", payload, format="json")
+    assert resp.data["amenity_ids"] == [
+        "Incorrect type. Expected pk value, received str."
+    ]
+
+
+@pytest.mark.django_db
+def test_bulk_create_properties(django_capture_on_commit_callbacks):
+    host = UserFactory(user_type="host")
+    wifi, pool = AmenityFactory(name="WiFi"), AmenityFactory(name="Pool")
+    client = APIClient()
+    client.force_authenticate(host)
+
+    def listing(i, amenity_ids):
+        return {
+            "title": f"Imported listing {i}",
+            "price_per_night": "250.00",
+            "bedrooms": 2,
+            "city": "Accra",
+            "country": "Ghana",
+            "amenity_ids": amenity_ids,
+        }
+
+    def post(payload):
+        with CaptureQueriesContext(connection) as queries:
+            with django_capture_on_commit_callbacks(execute=True):
+                resp = client.post("/api/v1/properties/bulk/", payload, format="json")
+        return resp, len(queries)
+
+    resp, few = post([listing(i, [wifi.id, pool.id][: i % 3]) for i in range(3)])
+    assert resp.status_code == 201, resp.data
+    assert [p["amenities"] for p in resp.data] == [[], [wifi.id], [pool.id, wifi.id]]
+    assert {p["host"] for p in resp.data} == {host.id}
+    created = Property.objects.get(pk=resp.data[2]["id"])
+    assert set(created.amenities.values_list("name", flat=True)) == {"WiFi", "Pool"}
+
+    # Batched lookups and inserts: more items, same number of queries
+    resp, many = post([listing(i, [pool.id, wifi.id]) for i in range(10)])
+    assert resp.status_code == 201 and many == few
+    assert Property.objects.count() == 13
+
+    missing = pool.id + wifi.id + 100
+    payload = [listing(0, [wifi.id]), {"title": ""}, listing(2, [missing])]
+    resp, _ = post(payload)
+    assert resp.status_code == 400
+    assert resp.data[0] == {}
+    assert "title" in resp.data[1] and "city" in resp.data[1]
+    assert resp.data[2] == {
+        "amenity_ids": [f'Invalid pk "{missing}" - object does not exist.']
+    }
+    assert Property.objects.count() == 13
+
+    assert post([])[0].status_code == 400
+    assert post({"title": "not a list"})[0].status_code == 400
+
+
+@pytest.mark.django_db
+def test_list_served_from_search_index_matches_queryset_path(
+    settings, monkeypatch, django_assert_num_queries
+):
+    wifi, pool, gym = (AmenityFactory(name=n) for n in ("WiFi", "Pool", "Gym"))
+    props = [
+        PropertyFactory(
+            price_per_night=f"{100 + 7 * i}.50",
+            bedrooms=1 + i % 3,
+            city=["Accra", "Kumasi"][i % 2],
+            amenities=[wifi, pool][: 1 + i % 2],
+        )
+        for i in range(25)
+    ]
+    _review(props[3], 5, week=0)
+    _review(props[4], 3, week=0)
+
+    client = APIClient()
+    client.force_authenticate(UserFactory())
+    queries = [
+        {},
+        {"page": 2},
+        {"ordering": "price_per_night"},
+        {"ordering": "-avg_rating,-price_per_night", "city": "Kumasi"},
+        {"ordering": "bedrooms,-created_at", "bedrooms": "2"},
+        {"amenities": [pool.id, gym.id], "min_price": "130", "max_price": "220.5"},
+        {"min_rating": "4", "fields": "title,amenities"},
+        {"city": "Tema"},
+        {"bedrooms": "1.5"},
+        {"amenities": [gym.id]},
+    ]
+
+    def pages():
+        return [client.get("/api/v1/properties/", query).json() for query in queries]
+
+    settings.PROPERTY_INDEX_ENABLED = False
+    expected = pages()
+    settings.PROPERTY_INDEX_ENABLED = True
+    assert pages() == expected
+    # No COUNT(*): just the page's rows and their amenity links
+    with django_assert_num_queries(2):
+        client.get("/api/v1/properties/", {"ordering": "price_per_night"})
+
+    # Writes are picked up incrementally, without rebuilding
+    def no_rebuild(cls, version):
+        raise AssertionError("index rebuilt")
+
+    monkeypatch.setattr(search_index.PropertyIndex, "build", classmethod(no_rebuild))
+    props[0].price_per_night = "1000.00"
+    props[0].save()
+    props[1].delete()
+    gym.properties.add(props[2], props[5])
+    props[6].amenities.remove(wifi)
+    PropertyFactory(price_per_night="90.00", city="Tema", amenities=[gym])
+    _review(props[7], 4, week=0)
+    settings.PROPERTY_INDEX_ENABLED = False
+    expected = pages()
+    settings.PROPERTY_INDEX_ENABLED = True
+    assert pages() == expected
+
+    # Text search, stay dates and cursors take the queryset path
+    resp = client.get("/api/v1/properties/", {"cursor": "", "city": "Tema"})
+    assert [p["city"] for p in resp.json()["results"]] == ["Tema"]
+
+
+@pytest.mark.django_db
+def test_facets_count_filtered_properties(django_assert_num_queries):
+    wifi, pool = AmenityFactory(name="WiFi"), AmenityFactory(name="Pool")
+    for i, (city, price, bedrooms) in enumerate(
+        [
+            ("Accra", "100.00", 1),
+            ("Accra", "150.00", 2),
+            ("Accra", "200.00", 2),
+            ("Kumasi", "300.00", 3),
+            ("Kumasi", "500.00", 2),
+        ]
+    ):
+        PropertyFactory(
+            city=city,
+            price_per_night=price,
+            bedrooms=bedrooms,
+            amenities=[wifi, pool] if i % 2 else [wifi],
+        )
+
+    client = APIClient()
+    # ?amenities= validation, then the value facets, amenities, price range
+    # and histogram; the amenity join in the filter must not count a
+    # property twice
+    with django_assert_num_queries(7):
+        resp = client.get(
+            "/api/v1/properties/facets/",
+            {"amenities": [wifi.id, pool.id], "price_buckets": 4},
+        )
+    assert resp.status_code == 200
+    assert resp.data["count"] == 5
+    assert resp.data["city"] == [
+        {"value": "Accra", "count": 3},
+        {"value": "Kumasi", "count": 2},
+    ]
+    assert resp.data["bedrooms"] == [
+        {"value": 2, "count": 3},
+        {"value": 1, "count": 1},
+        {"value": 3, "count": 1},
+    ]
+    assert resp.data["amenities"] == [
+        {"id": wifi.id, "name": "WiFi", "count": 5},
+        {"id": pool.id, "name": "Pool", "count": 2},
+    ]
+    assert resp.data["price"] == {
+        "min": "100.00",
+        "max": "500.00",
+        "buckets": [
+            {"min": "100.00", "max": "200.00", "count": 2},
+            {"min": "200.00", "max": "300.00", "count": 1},
+            {"min": "300.00", "max": "400.00", "count": 1},
+            {"min": "400.00", "max": "500.00", "count": 1},
+        ],
+    }
+
+    # Cached per normalized filter, until a property changes
+    with django_assert_num_queries(0):
+        again = client.get(
+            "/api/v1/properties/facets/?price_buckets=4"
+            f"&amenities={pool.id}&amenities={wifi.id}&city="
+        )
+    assert again.data == resp.data
+    PropertyFactory(city="Tamale", price_per_night="120.00", amenities=[pool])
+    resp = client.get("/api/v1/properties/facets/", {"city": "Accra"})
+    assert resp.data["count"] == 3
+    assert resp.data["country"] == [{"value": "Ghana", "count": 3}]
+    assert len(resp.data["price"]["buckets"]) == 10
+    resp = client.get("/api/v1/properties/facets/", {"city": "Tema"})
+    assert resp.data["count"] == 0
+    assert resp.data["price"] == {"min": None, "max": None, "buckets": []}
+    assert (
+        client.get("/api/v1/properties/facets/", {"min_rating": "9"}).status_code == 400
+    )
+    assert (
+        client.get("/api/v1/properties/facets/", {"price_buckets": "0"}).status_code
+        == 400
+    )
+
+
+def test_geohash_and_bounding_box():
+    assert encode_geohash(57.64911, 10.40744) == "u4pruydqq"
+    assert encode_geohash(57.64911, 10.40744, precision=5) == "u4pru"
+    west, south, east, north = bounding_box(5.6, 179.99, 10)
+    assert west > east and south < 5.6 < north
+    assert bounding_box(89.99, 0, 10)[::2] == (-180.0, 180.0)
+
+
+@pytest.mark.django_db
+def test_location_search_and_map_clusters(django_assert_num_queries):
+    places = {
+        "accra": (5.6037, -0.1870),
+        "tema": (5.6698, -0.0166),
+        "kumasi": (6.6885, -1.6244),
+        "fiji_east": (-17.8, 179.9),
+        "fiji_west": (-17.8, -179.9),
+    }
+    wifi = AmenityFactory(name="WiFi")
+    props = {
+        name: PropertyFactory(latitude=lat, longitude=lng, amenities=[wifi])
+        for name, (lat, lng) in places.items()
+    }
+    PropertyFactory(amenities=[wifi])  # no location
+
+    assert props["accra"].geohash == encode_geohash(5.6037, -0.1870)
+    Property.objects.bulk_create(
+        [
+            Property(
+                host=props["accra"].host,
+                title="Bulk",
+                price_per_night=1,
+                city="Accra",
+                latitude=5.6,
+                longitude=-0.18,
+            )
+        ]
+    )
+    assert Property.objects.get(title="Bulk").geohash == encode_geohash(5.6, -0.18)
+
+    client = APIClient()
+    client.force_authenticate(UserFactory())
+
+    def ids(**query):
+        resp = client.get("/api/v1/properties/", query)
+        assert resp.status_code == 200, resp.data
+        return [p["id"] for p in resp.json()["results"]]
+
+    # Tema is ~19 km from Accra, Kumasi ~200 km
+    bulk = Property.objects.get(title="Bulk")
+    accra = [props["accra"].id, bulk.id, props["tema"].id]
+    assert ids(near="5.6037,-0.1870", radius_km=25, ordering="distance") == accra
+    assert ids(near="5.6037,-0.1870", radius_km=25, ordering="-distance") == accra[::-1]
+    nearest = ids(near="5.66,-0.02", radius_km=300, ordering="distance")
+    assert nearest[0] == props["tema"].id and nearest[-1] == props["kumasi"].id
+    assert set(ids(bbox="-2,5,-0.1,7")) == {
+        props["accra"].id,
+        props["kumasi"].id,
+        bulk.id,
+    }
+    # Boxes may cross the antimeridian
+    assert set(ids(bbox="179,-18,-179,-17")) == {
+        props["fiji_east"].id,
+        props["fiji_west"].id,
+    }
+    assert set(ids(near="-17.8,179.95", radius_km=20)) == {
+        props["fiji_east"].id,
+        props["fiji_west"].id,
+    }
+    # Without ?near= there is no distance to order by
+    assert ids(ordering="distance", bbox="-2,5,0,7")
+    for bad in ({"near": "5.6"}, {"bbox": "1,2,3"}, {"near": "91,0"}, {"radius_km": 5}):
+        assert client.get("/api/v1/properties/", bad).status_code == 400
+
+    # One query per zoom level
+    with django_assert_num_queries(1):
+        resp = client.get(
+            "/api/v1/properties/clusters/", {"zoom": 3, "bbox": "-5,0,5,10"}
+        )
+    assert resp.status_code == 200
+    assert resp.data["precision"] == 2
+    assert [(c["geohash"], c["count"]) for c in resp.data["clusters"]] == [
+        ("eb", 2),
+        ("ec", 2),
+    ]
+    resp = client.get(
+        "/api/v1/properties/clusters/", {"zoom": 12, "near": "5.6037,-0.1870"}
+    )
+    assert [c["count"] for c in resp.data["clusters"]] == [1, 1]
+    cell = resp.data["clusters"][0]["geohash"]
+    assert ids(geohash=cell) and all(
+        Property.objects.get(pk=pk).geohash.startswith(cell) for pk in ids(geohash=cell)
+    )
+    assert client.get("/api/v1/properties/clusters/").status_code == 400
@@ -1,9 +1,36 @@
 # airbnb-clone-project/properties/views.py
 
-from rest_framework import permissions, viewsets
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Avg, Count, Min, prefetch_related_objects
+from django.db.models.functions import Substr
+from rest_framework import permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
 
+from common.cache import (
+    CachedResponseMixin,
+    ConditionalGetMixin,
+    bump_generation,
+    get_generations,
+)
+from common.filters import OrderingFilter
+from common.views import FieldsetQuerysetMixin, ValuesListMixin
+from properties import search_index
+from properties.availability import get_busy_ranges
+from properties.facets import get_facets, normalize_filters
+from properties.filters import PropertyFilter
+from properties.geo import geohash_precision
 from properties.models import Property
-from properties.serializers import PropertySerializer
+from properties.serializers import (
+    AvailabilityQuerySerializer,
+    ClusterQuerySerializer,
+    FacetQuerySerializer,
+    PropertySerializer,
+    PropertyValuesSerializer,
+)
 
 
 class IsHostOrReadOnly(permissions.BasePermission):
@@ -15,18 +42,234 @@ class IsHostOrReadOnly(permissions.BasePermission):
         return obj.host_id == getattr(request.user, "id", None)
 
 
-class PropertyViewSet(viewsets.ModelViewSet):
+class SearchIndexListMixin:
+    """Serve plain list pages from properties.search_index.
+
+    The index filters, orders and counts; the database only returns the
+    page's rows, rendered by ``values_serializer_class``. Requests it can't
+    answer (text search, stay dates, keyset cursors, ``?include=``, invalid
+    filters) and processes without a current index take the queryset path.
+    """
+
+    # Query parameters only the queryset path understands
+    index_unsupported_params = (
+        "search",
+        "check_in",
+        "check_out",
+        "bbox",
+        "near",
+        "geohash",
+        "cursor",
+    )
+
+    def list(self, request, *args, **kwargs):
+        fields, include = self.get_serializer_class().get_fieldset(request)
+        result = None if include else self.search_index(request)
+        if result is None:
+            return super().list(request, *args, **kwargs)
+
+        page = self.paginate_queryset(result)
+        values_serializer = self.values_serializer_class(fields=fields)
+        rows = {
+            row["id"]: row
+            for row in Property.objects.filter(pk__in=page).values(
+                *values_serializer.columns
+            )
+        }
+        # Rows deleted since the index was refreshed are left out
+        rows = [rows[pk] for pk in page if pk in rows]
+        return self.get_paginated_response(values_serializer.render(rows))
+
+    def search_index(self, request):
+        """The index's ``SearchResult`` for this request, or None."""
+        params = request.query_params
+        if (
+            not settings.PROPERTY_INDEX_ENABLED
+            or self.paginator is None
+            or any(name in params for name in self.index_unsupported_params)
+        ):
+            return None
+        filterset = self.filterset_class(
+            params, queryset=Property.objects.all(), request=request
+        )
+        if not filterset.is_valid():
+            # The queryset path reports the errors
+            return None
+        ordering = OrderingFilter().get_ordering(request, Property.objects.all(), self)
+        index = search_index.get_index()
+        if index is None:
+            return None
+        return index.search(filterset.form.cleaned_data, ordering)
+
+
+class PropertyViewSet(
+    ConditionalGetMixin,
+    CachedResponseMixin,
+    SearchIndexListMixin,
+    ValuesListMixin,
+    FieldsetQuerysetMixin,
+    viewsets.ModelViewSet,
+):
     queryset = (
         Property.objects.select_related("host").prefetch_related("amenities").all()
     )
     serializer_class = PropertySerializer
+    # list pages skip model instances and DRF field machinery
+    values_serializer_class = PropertyValuesSerializer
     # Public read access; write restricted to authenticated owner
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsHostOrReadOnly]
 
-    filterset_fields = ["city", "country", "bedrooms", "amenities"]
+    # city, country, bedrooms, amenities, min_rating, min_price/max_price,
+    # check_in/check_out availability, and bbox/near/radius_km/geohash location
+    filterset_class = PropertyFilter
+    # Full-text search over search_vector on PostgreSQL, icontains elsewhere
     search_fields = ["title", "description", "city"]
-    ordering_fields = ["price_per_night", "created_at", "bedrooms"]
+    search_vector_field = "search_vector"
+    ordering_fields = [
+        "price_per_night",
+        "created_at",
+        "bedrooms",
+        "avg_rating",
+        "review_count",
+        # Only with ?near=
+        "distance",
+    ]
     ordering = ["-created_at"]
 
+    # Anonymous list/detail responses are cached in Redis; see properties.signals
+    cache_namespace = "properties"
+    # ETag/Last-Modified on detail responses
+    conditional_actions = ("retrieve",)
+    bulk_create_max_items = 500
+
+    def get_cache_dependencies(self, request):
+        dependencies = super().get_cache_dependencies(request)
+        if self.action == "retrieve":
+            # Namespace-wide writes: amenity deletes and rating rebuilds
+            dependencies += ["amenities", "ratings"]
+        elif "check_in" in request.query_params:
+            dependencies.append("bookings")
+        return dependencies
+
+    def get_conditional_validators(self, request):
+        """The listing's and its host's ``updated_at`` (one primary key lookup).
+
+        The ETag also carries the response cache generations, which move on
+        writes that leave ``updated_at`` alone: amenity changes and ratings.
+        Those have no timestamp, so no ``Last-Modified`` is sent; a date-only
+        ``If-Modified-Since`` check would miss them.
+        """
+        try:
+            row = (
+                Property.objects.filter(pk=self.kwargs["pk"])
+                .values_list("updated_at", "host__updated_at")
+                .first()
+            )
+        except ValueError:
+            return None
+        if row is None:
+            return None
+        generations = get_generations(*self.get_cache_dependencies(request))
+        return (row, generations), None
+
     def perform_create(self, serializer):
         serializer.save(host=self.request.user)
+
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        """Create up to ``bulk_create_max_items`` listings in one transaction.
+
+        Nothing is created unless every item is valid; errors come back as a
+        list with one entry per submitted item.
+        """
+        serializer = self.get_serializer(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=self.bulk_create_max_items,
+        )
+        with transaction.atomic():
+            serializer.is_valid(raise_exception=True)
+            instances = serializer.save(host=request.user)
+            # bulk_create sends no post_save for properties.signals
+            transaction.on_commit(lambda: bump_generation("properties"))
+            search_index.mark_changed(*(instance.pk for instance in instances))
+        prefetch_related_objects(instances, "amenities")
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=["get"])
+    def facets(self, request):
+        """Counts per city, country, bedroom count and amenity, and a price
+        histogram (?price_buckets=, default 10), for the list filters."""
+        query = FacetQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        filters = normalize_filters(
+            request.query_params,
+            [*self.filterset_class.base_filters, api_settings.SEARCH_PARAM],
+        )
+        return Response(
+            get_facets(
+                lambda: self.filter_queryset(Property.objects.all()),
+                filters,
+                query.validated_data["price_buckets"],
+                self.get_cache_dependencies(request),
+            )
+        )
+
+    @action(detail=False, methods=["get"])
+    def clusters(self, request):
+        """Map clusters at ?zoom= (0-20) for the list filters, e.g. ?bbox=.
+
+        Listings are grouped by geohash prefix, about 4 x 4 cells per map
+        tile, in one query; ?geohash=<cell> lists a cluster's properties.
+        """
+        query = ClusterQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        precision = geohash_precision(query.validated_data["zoom"])
+        cells = (
+            self.filter_queryset(Property.objects.all())
+            .exclude(geohash="")
+            .order_by()
+            .values_list(Substr("geohash", 1, precision))
+            .annotate(
+                Count("pk"),
+                Avg("latitude"),
+                Avg("longitude"),
+                Min("price_per_night"),
+            )
+            .order_by(Substr("geohash", 1, precision))
+        )
+        return Response(
+            {
+                "precision": precision,
+                "clusters": [
+                    {
+                        "geohash": cell,
+                        "count": count,
+                        "latitude": latitude,
+                        "longitude": longitude,
+                        "min_price": str(min_price),
+                    }
+                    for cell, count, latitude, longitude, min_price in cells
+                ],
+            }
+        )
+
+    @action(detail=True, methods=["get"])
+    def availability(self, request, pk=None):
+        """Merged busy date ranges (check-out exclusive) within ?from=&to=."""
+        query = AvailabilityQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        start, end = query.validated_data["from"], query.validated_data["to"]
+        try:
+            busy = get_busy_ranges(int(pk), start, end)
+        except (ValueError, Property.DoesNotExist) as e:
+            raise NotFound() from e
+        return Response(
+            {
+                "property": int(pk),
+                "from": start,
+                "to": end,
+                "busy": [{"start": s, "end": e} for s, e in busy],
+            }
+        )
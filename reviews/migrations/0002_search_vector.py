@@ -0,0 +1,52 @@
+# Generated by Django 5.2.6 on 2026-10-18 03:09
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+from common.operations import RunPostgresSQL
+
+SEARCH_VECTOR_FUNCTION = """
+CREATE OR REPLACE FUNCTION reviews_review_search_vector_update()
+RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := to_tsvector('english', coalesce(NEW.comment, ''));
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reviews", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="review",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        RunPostgresSQL(
+            sql=[
+                SEARCH_VECTOR_FUNCTION,
+                "CREATE TRIGGER reviews_review_search_vector_trigger "
+                "BEFORE INSERT OR UPDATE OF comment "
+                "ON reviews_review FOR EACH ROW "
+                "EXECUTE FUNCTION reviews_review_search_vector_update();",
+                # Backfill existing rows through the trigger
+                "UPDATE reviews_review SET comment = comment;",
+                "CREATE INDEX reviews_review_search_vector_gin "
+                "ON reviews_review USING gin (search_vector);",
+            ],
+            reverse_sql=[
+                "DROP INDEX IF EXISTS reviews_review_search_vector_gin;",
+                "DROP TRIGGER IF EXISTS reviews_review_search_vector_trigger "
+                "ON reviews_review;",
+                "DROP FUNCTION IF EXISTS reviews_review_search_vector_update();",
+            ],
+        ),
+    ]
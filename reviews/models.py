@@ -1,5 +1,6 @@
 # airbnb-clone-project/reviews/models.py
 
+from django.contrib.postgres.search import SearchVectorField
 from django.core.exceptions import ValidationError
 from django.db import models
 
@@ -16,6 +17,9 @@ class Review(models.Model):
     rating = models.PositiveSmallIntegerField()
     comment = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Comment vector; maintained by a PostgreSQL trigger and GIN-indexed
+    # (see migration 0002). Always NULL on SQLite.
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         ordering = ["-created_at"]
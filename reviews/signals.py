@@ -0,0 +1,39 @@
+# airbnb-clone-project/reviews/signals.py
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from properties.ratings import apply_rating_change
+from reviews.models import Review
+
+
+@receiver(pre_save, sender=Review, dispatch_uid="reviews.review_pre_save")
+def remember_previous_rating(sender, instance, **kwargs):
+    """Keep the stored (property, rating) so an edit can move it."""
+    instance._previous_rating = None
+    if instance.pk:
+        instance._previous_rating = (
+            Review.objects.filter(pk=instance.pk)
+            .values_list("booking__property_id", "rating")
+            .first()
+        )
+
+
+@receiver(post_save, sender=Review, dispatch_uid="reviews.review_saved")
+def update_property_rating(sender, instance, created, **kwargs):
+    current = (instance.booking.property_id, instance.rating)
+    previous = getattr(instance, "_previous_rating", None)
+    if previous == current:
+        return
+    if previous is None:
+        apply_rating_change(current[0], added=[current[1]])
+    elif previous[0] == current[0]:
+        apply_rating_change(current[0], added=[current[1]], removed=[previous[1]])
+    else:
+        apply_rating_change(previous[0], removed=[previous[1]])
+        apply_rating_change(current[0], added=[current[1]])
+
+
+@receiver(post_delete, sender=Review, dispatch_uid="reviews.review_deleted")
+def remove_property_rating(sender, instance, **kwargs):
+    apply_rating_change(instance.booking.property_id, removed=[instance.rating])
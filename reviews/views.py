@@ -2,6 +2,7 @@
 
 from rest_framework import permissions, viewsets
 
+from common.pagination import EstimatedCountPagination
 from reviews.models import Review
 from reviews.serializers import ReviewSerializer
 
@@ -16,10 +17,14 @@ class IsAuthorOrReadOnly(permissions.BasePermission):
 class ReviewViewSet(viewsets.ModelViewSet):
     queryset = Review.objects.select_related("booking", "author").all()
     serializer_class = ReviewSerializer
+    # COUNT(*) over the whole table is too slow once it grows
+    pagination_class = EstimatedCountPagination
     permission_classes = [permissions.IsAuthenticated, IsAuthorOrReadOnly]
 
     filterset_fields = ["rating", "booking", "author"]
+    # Full-text search over search_vector on PostgreSQL, icontains elsewhere
     search_fields = ["comment"]
+    search_vector_field = "search_vector"
     ordering_fields = ["created_at", "rating"]
     ordering = ["-created_at"]
 
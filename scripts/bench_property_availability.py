@@ -0,0 +1,148 @@
+# airbnb-clone-project/scripts/bench_property_availability.py
+"""Benchmark date-availability search on the property list endpoint.
+
+Seeds a throwaway test database with properties and ~100k bookings, then
+compares:
+
+* ``sql``  - one request to /properties/?check_in=&check_out= (NOT EXISTS
+  anti-join served by the (property, status, check_in, check_out) index)
+* ``n+1``  - the old client flow: one property page plus one bookings
+  lookup per listing (measured in-process, so it excludes the HTTP round
+  trip real clients pay for every lookup)
+
+Usage:
+    python scripts/bench_property_availability.py --bookings 100000
+"""
+
+import argparse
+import random
+from datetime import date, timedelta
+
+from bench_utils import report, setup_django, test_database, time_calls
+
+setup_django()
+
+from django.db import connection  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from accounts.models import User  # noqa: E402
+from bookings.models import Booking  # noqa: E402
+from properties.models import Property  # noqa: E402
+from properties.views import PropertyViewSet  # noqa: E402
+
+BATCH_SIZE = 5000
+WINDOW_START = date(2026, 1, 1)
+
+
+def seed(num_properties, num_bookings):
+    """Bulk insert hosts, guests, properties and non-overlapping bookings."""
+    hosts = User.objects.bulk_create(
+        User(email=f"bench-host{i}@example.com", user_type="host")
+        for i in range(max(1, num_properties // 25))
+    )
+    guests = User.objects.bulk_create(
+        User(email=f"bench-guest{i}@example.com", user_type="guest") for i in range(500)
+    )
+    properties = Property.objects.bulk_create(
+        (
+            Property(
+                host=random.choice(hosts),
+                title=f"Bench listing {i}",
+                price_per_night=random.randint(150, 1500),
+                bedrooms=random.randint(1, 5),
+                city=random.choice(["Accra", "Kumasi", "Takoradi", "Tamale"]),
+            )
+            for i in range(num_properties)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+
+    # Lay stays end to end per property so they never overlap by construction
+    per_property = max(1, num_bookings // num_properties)
+    bookings = []
+    for prop in properties:
+        cursor = WINDOW_START + timedelta(days=random.randint(0, 5))
+        for _ in range(per_property):
+            length = random.randint(1, 7)
+            bookings.append(
+                Booking(
+                    property=prop,
+                    guest=random.choice(guests),
+                    check_in_date=cursor,
+                    check_out_date=cursor + timedelta(days=length),
+                    total_price=prop.price_per_night * length,
+                    status=random.choices(
+                        ["pending", "confirmed", "cancelled"], weights=[2, 7, 1]
+                    )[0],
+                )
+            )
+            cursor += timedelta(days=length + random.randint(0, 10))
+        if len(bookings) >= BATCH_SIZE:
+            Booking.objects.bulk_create(bookings)
+            bookings = []
+    Booking.objects.bulk_create(bookings)
+
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+
+def random_stay():
+    check_in = WINDOW_START + timedelta(days=random.randint(0, 365))
+    return check_in, check_in + timedelta(days=random.randint(1, 7))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--properties", type=int, default=5000)
+    parser.add_argument("--bookings", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    random.seed(42)
+    factory = APIRequestFactory()
+    # Throttling would reject repeated requests from the same client
+    list_view = PropertyViewSet.as_view({"get": "list"}, throttle_classes=[])
+
+    with test_database():
+        seed(args.properties, args.bookings)
+        print(
+            f"Seeded {Property.objects.count()} properties and "
+            f"{Booking.objects.count()} bookings on {connection.vendor}"
+        )
+
+        def sql_search():
+            check_in, check_out = random_stay()
+            request = factory.get(
+                "/api/v1/properties/",
+                {"check_in": check_in, "check_out": check_out},
+            )
+            response = list_view(request)
+            assert response.status_code == 200, response.data
+
+        def n_plus_one_search():
+            check_in, check_out = random_stay()
+            response = list_view(factory.get("/api/v1/properties/"))
+            for item in response.data["results"]:
+                Booking.objects.filter(property_id=item["id"]).active().overlapping(
+                    check_in, check_out
+                ).exists()
+
+        report(
+            "availability filter (single query)", time_calls(sql_search, args.repeat)
+        )
+        report(
+            "page + per-listing lookups (n+1)",
+            time_calls(n_plus_one_search, args.repeat),
+        )
+
+        if connection.vendor == "postgresql":
+            check_in, check_out = random_stay()
+            queryset = PropertyViewSet.filterset_class.filter_available(
+                Property.objects.all(), check_in, check_out
+            )[:20]
+            print(queryset.explain(analyze=True))
+
+
+if __name__ == "__main__":
+    main()
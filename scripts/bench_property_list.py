@@ -0,0 +1,150 @@
+# airbnb-clone-project/scripts/bench_property_list.py
+"""Benchmark the property list endpoint's values() read path.
+
+Seeds a throwaway test database with properties (each with a few amenities
+and ratings), then serves 100-item list pages through:
+
+* ``values``     - PropertyViewSet.list as shipped (ValuesListMixin rendering
+  values() rows with PropertyValuesSerializer)
+* ``serializer`` - the plain ModelViewSet.list: model instances with the host
+  joined and amenities prefetched, rendered by PropertySerializer
+
+Requests are authenticated so the anonymous response cache stays out of the
+way.
+
+Usage:
+    python scripts/bench_property_list.py --properties 5000 --page-size 100
+"""
+
+import argparse
+import random
+
+from bench_utils import report, setup_django, test_database, time_calls
+
+setup_django()
+
+from django.db import connection  # noqa: E402
+from rest_framework import viewsets  # noqa: E402
+from rest_framework.test import APIRequestFactory, force_authenticate  # noqa: E402
+
+from accounts.models import User  # noqa: E402
+from amenities.models import Amenity  # noqa: E402
+from common.pagination import HybridPagination  # noqa: E402
+from properties.models import Property  # noqa: E402
+from properties.ratings import RATINGS, histogram_field  # noqa: E402
+from properties.views import PropertyViewSet  # noqa: E402
+
+BATCH_SIZE = 5000
+
+
+class SerializerListViewSet(PropertyViewSet):
+    """PropertyViewSet with the pre-values() list implementation."""
+
+    def list(self, request, *args, **kwargs):
+        return viewsets.ModelViewSet.list(self, request, *args, **kwargs)
+
+
+def seed(num_properties):
+    """Bulk insert hosts, amenities and properties with amenity links."""
+    hosts = User.objects.bulk_create(
+        User(email=f"bench-host{i}@example.com", user_type="host")
+        for i in range(max(1, num_properties // 25))
+    )
+    amenities = Amenity.objects.bulk_create(
+        Amenity(name=f"Bench amenity {i}") for i in range(20)
+    )
+    properties = []
+    for i in range(num_properties):
+        histogram = {histogram_field(r): random.randint(0, 20) for r in RATINGS}
+        count = sum(histogram.values())
+        total = sum(r * histogram[histogram_field(r)] for r in RATINGS)
+        properties.append(
+            Property(
+                host=random.choice(hosts),
+                title=f"Bench listing {i}",
+                description="A quiet place near the market. " * 4,
+                price_per_night=random.randint(150, 1500),
+                bedrooms=random.randint(1, 5),
+                city=random.choice(["Accra", "Kumasi", "Takoradi", "Tamale"]),
+                review_count=count,
+                avg_rating=round(total / count, 2) if count else 0,
+                **histogram,
+            )
+        )
+    properties = Property.objects.bulk_create(properties, batch_size=BATCH_SIZE)
+
+    Link = Property.amenities.through
+    Link.objects.bulk_create(
+        (
+            Link(property_id=prop.pk, amenity_id=amenity.pk)
+            for prop in properties
+            for amenity in random.sample(amenities, random.randint(2, 8))
+        ),
+        batch_size=BATCH_SIZE,
+    )
+
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--properties", type=int, default=5000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    random.seed(42)
+    factory = APIRequestFactory()
+
+    class Pagination(HybridPagination):
+        page_size = args.page_size
+
+    # Throttling would reject repeated requests from the same client
+    view_options = {"throttle_classes": [], "pagination_class": Pagination}
+    values_view = PropertyViewSet.as_view({"get": "list"}, **view_options)
+    serializer_view = SerializerListViewSet.as_view({"get": "list"}, **view_options)
+
+    with test_database():
+        seed(args.properties)
+        user = User.objects.create(email="bench-reader@example.com")
+        pages = args.properties // args.page_size
+        print(
+            f"Seeded {Property.objects.count()} properties on {connection.vendor}; "
+            f"{args.page_size} per page"
+        )
+
+        def fetch(view):
+            def call():
+                request = factory.get(
+                    "/api/v1/properties/", {"page": random.randint(1, pages)}
+                )
+                force_authenticate(request, user)
+                response = view(request)
+                assert response.status_code == 200, response.data
+                response.render()
+
+            return call
+
+        # Same page through both paths, so any difference would show up here
+        for page in (1, pages):
+            bodies = []
+            for view in (values_view, serializer_view):
+                request = factory.get("/api/v1/properties/", {"page": page})
+                force_authenticate(request, user)
+                bodies.append(view(request).render().content)
+            assert bodies[0] == bodies[1], f"page {page} differs"
+
+        report(
+            "values() rows + ValuesSerializer",
+            time_calls(fetch(values_view), args.repeat),
+        )
+        report(
+            "model instances + PropertySerializer",
+            time_calls(fetch(serializer_view), args.repeat),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# airbnb-clone-project/scripts/bench_property_search.py
+"""Benchmark filtered property searches: in-memory index vs. the database.
+
+Seeds a throwaway test database (see bench_property_list.seed), builds
+properties.search_index, then runs random filter/order combinations
+(city, price range, bedrooms, amenities, min_rating, one of the list
+orderings) three ways:
+
+* ``index search``  - PropertyIndex.search plus the first page of ids,
+  with the filters already validated
+* ``index list``    - the list endpoint with PROPERTY_INDEX_ENABLED
+* ``queryset list`` - the list endpoint as it runs without the index
+
+Needs the Redis configured for the cache (the index's change log lives
+there). Seeding a million listings takes a few minutes.
+
+Usage:
+    python scripts/bench_property_search.py --properties 1000000
+"""
+
+import argparse
+import random
+import time
+
+from bench_property_list import seed
+from bench_utils import report, setup_django, test_database, time_calls
+
+setup_django()
+
+from django.db import connection  # noqa: E402
+from django.test import override_settings  # noqa: E402
+from rest_framework.test import APIRequestFactory, force_authenticate  # noqa: E402
+
+from accounts.models import User  # noqa: E402
+from amenities.models import Amenity  # noqa: E402
+from properties import search_index  # noqa: E402
+from properties.filters import PropertyFilter  # noqa: E402
+from properties.models import Property  # noqa: E402
+from properties.views import PropertyViewSet  # noqa: E402
+
+ORDERINGS = ["-created_at", "price_per_night", "-avg_rating", "-review_count"]
+CITIES = ["Accra", "Kumasi", "Takoradi", "Tamale"]
+
+
+def random_query(amenity_ids):
+    """A random combination of the list filters and an ordering."""
+    query = {"ordering": random.choice(ORDERINGS)}
+    if random.random() < 0.7:
+        query["city"] = random.choice(CITIES)
+    if random.random() < 0.5:
+        low = random.randint(150, 1200)
+        query["min_price"] = low
+        query["max_price"] = low + random.randint(50, 500)
+    if random.random() < 0.3:
+        query["bedrooms"] = random.randint(1, 5)
+    if random.random() < 0.4:
+        query["amenities"] = random.sample(amenity_ids, 2)
+    if random.random() < 0.3:
+        query["min_rating"] = random.choice([3, 3.5, 4, 4.5])
+    return query
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--properties", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    random.seed(42)
+    factory = APIRequestFactory()
+    view = PropertyViewSet.as_view({"get": "list"}, throttle_classes=[])
+
+    with test_database():
+        seed(args.properties)
+        user = User.objects.create(email="bench-reader@example.com")
+        amenity_ids = list(Amenity.objects.values_list("pk", flat=True))
+        print(f"Seeded {Property.objects.count()} properties on {connection.vendor}")
+
+        search_index.mark_all_changed()
+        start = time.perf_counter()
+        index = search_index.get_index()
+        print(
+            f"Built index of {len(index)} rows in "
+            f"{time.perf_counter() - start:.2f}s; every ordering ranked once below"
+        )
+        for ordering in ORDERINGS:
+            index.search({}, [ordering])[:20]
+
+        # Filters are validated up front: the timing covers the index alone
+        searches = []
+        for _ in range(args.repeat + 3):
+            query = random_query(amenity_ids)
+            filterset = PropertyFilter(query, queryset=Property.objects.all())
+            assert filterset.is_valid(), filterset.errors
+            searches.append((filterset.form.cleaned_data, [query["ordering"]]))
+        searches = iter(searches)
+
+        def search():
+            index.search(*next(searches))[:20]
+
+        def fetch():
+            request = factory.get("/api/v1/properties/", random_query(amenity_ids))
+            force_authenticate(request, user)
+            response = view(request)
+            assert response.status_code == 200, response.data
+            response.render()
+
+        # The same queries through both list paths
+        state = random.getstate()
+        with override_settings(PROPERTY_INDEX_ENABLED=True):
+            report("index search (filter + top 20)", time_calls(search, args.repeat))
+            random.setstate(state)
+            report("index list endpoint", time_calls(fetch, args.repeat))
+        random.setstate(state)
+        report("queryset list endpoint", time_calls(fetch, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
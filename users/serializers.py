@@ -25,6 +25,15 @@ class UserProfileSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "email", "date_joined", "last_login"]
 
 
+class UserSummarySerializer(serializers.ModelSerializer):
+    """Public name card for a user embedded in another resource."""
+
+    class Meta:
+        model = User
+        fields = ["id", "first_name", "last_name", "user_type"]
+        read_only_fields = fields
+
+
 class ChangePasswordSerializer(serializers.Serializer):
     """
     Serializer for password change endpoint.
@@ -22,3 +22,19 @@ def test_users_me_get_and_update():
     r2 = client.patch("/api/v1/users/me/", {"first_name": "Naa Dede"}, format="json")
     assert r2.status_code == 200
     assert r2.data["first_name"] == "Naa Dede"
+
+
+@pytest.mark.django_db
+def test_me_conditional_get():
+    user = User.objects.create_user(email="kofi@example.com", password="pass1234")
+    client = APIClient()
+    client.force_authenticate(user)
+
+    resp = client.get("/api/v1/me/")
+    assert resp.status_code == 200
+    etag = resp["ETag"]
+    assert client.get("/api/v1/me/", HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    client.patch("/api/v1/me/", {"first_name": "Kofi"}, format="json")
+    resp = client.get("/api/v1/me/", HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == 200 and resp.data["first_name"] == "Kofi"
@@ -7,16 +7,22 @@ from rest_framework import mixins, permissions, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from common.cache import ConditionalGetMixin
 from users.serializers import ChangePasswordSerializer, UserProfileSerializer
 
 
 class MeViewSet(
-    viewsets.GenericViewSet, mixins.RetrieveModelMixin, mixins.UpdateModelMixin
+    ConditionalGetMixin,
+    viewsets.GenericViewSet,
+    mixins.RetrieveModelMixin,
+    mixins.UpdateModelMixin,
 ):
     """
     Endpoints to get/update the authenticated user's profile.
     """
 
+    conditional_actions = ("retrieve", "me")
+
     serializer_class = UserProfileSerializer
     permission_classes = [permissions.IsAuthenticated]
     lookup_field = "id"
@@ -34,6 +40,15 @@ class MeViewSet(
         """
         return self.request.user
 
+    def get_conditional_validators(self, request):
+        """
+        Validate from the already-authenticated user; no extra query.
+        last_login is saved without touching updated_at.
+        """
+        user = request.user
+        timestamps = [t for t in (user.updated_at, user.last_login) if t]
+        return (user.pk, *timestamps), max(timestamps, default=None)
+
     @extend_schema(
         operation_id="retrieve_me",
         description="Retrieve the authenticated user's profile.",
@@ -53,9 +68,8 @@ class MeViewSet(
         """
         Get the current user's profile.
         """
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+        # Through ConditionalGetMixin, which may answer 304 Not Modified
+        return super().retrieve(request, *args, **kwargs)
 
     @extend_schema(
         operation_id="update_me",